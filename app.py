@@ -1,7 +1,32 @@
-from flask import Flask, render_template, request, send_file, send_from_directory, flash, redirect, url_for, session
+from flask import Flask, render_template, request, send_file, flash, redirect, url_for, session, g, abort
+from flask_socketio import SocketIO, emit
+from werkzeug.utils import secure_filename
 from resume_generator import ResumeGenerator
+from job_matcher import analyze_resume_data
+import resume_store
+import profile_store
+from fonts import preload_fonts, available_fonts
+from template_engine import RENDERER_VERSION, USER_FIELDS, available_templates, spec_hash
+from layout_cache import content_key
+from exporters import EXPORTERS, export
+from http_cache import send_immutable
+from live_preview import LivePreview
+from draft_diff import MalformedPatch, PatchError, apply_patch
+from resume_schema import DraftInvalid, validate_draft, validate_patched
+from resume_import import ImportFailed, form_fields, import_bytes
+from rate_limiter import LLM_LIMITER
+from render_service import RENDER_PROCESSES, SHARED_MEMORY, RenderService, render_job, write_once
+from warmup import Warmup
+import profiling
+import scheduler
+from scheduler import RENDER_SCHEDULER, LLM_SCHEDULER, PRIORITIES
+import hmac
+import reportlab
+import secrets
+import io
+import json
 import os
-from datetime import datetime
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -17,11 +42,186 @@ if not os.path.exists(UPLOAD_FOLDER):
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# WebSocket channel for the editor's live preview
+socketio = SocketIO(app)
+
+# Smaller PDFs (binary streams, shared page art, no info metadata); set RESUME_PDF_OPTIMIZE=0 to disable
+app.config['PDF_OPTIMIZE'] = os.getenv('RESUME_PDF_OPTIMIZE', '1') == '1'
+
+# Byte-identical PDFs for identical inputs (fixed dates and document ID); RESUME_PDF_DETERMINISTIC=0 to disable
+app.config['PDF_DETERMINISTIC'] = os.getenv('RESUME_PDF_DETERMINISTIC', '1') == '1'
+
+# Also send /preview and /download gzipped to clients that accept it (RESUME_PDF_GZIP=1)
+app.config['PDF_GZIP'] = os.getenv('RESUME_PDF_GZIP', '0') == '1'
+
+# Register TrueType fonts once, before any worker processes are forked
+preload_fonts()
+
+# Render PDFs in worker processes; RESUME_RENDER_PROCESSES=0 renders in the web worker instead.
+# Nothing is started at import: under gunicorn --preload this runs in the master, and its
+# threads wouldn't survive the fork. The pool starts with each process's first render.
+render_service = RenderService() if RENDER_PROCESSES > 0 else None
+
+# Render every template once and set up the LLM client in the background; /readyz waits for it
+warmup = Warmup()
+
+
+@app.before_request
+def start_warmup():
+    """Warm up each web process on its first request (usually the /readyz health check)."""
+    warmup.start(render_service, optimize=app.config['PDF_OPTIMIZE'])
+
+# Form template names -> create_unique_resume template types (one per spec in template_specs/)
+TEMPLATE_CHOICES = available_templates()
+TEMPLATE_TYPES = {t['form_value']: t['name'] for t in TEMPLATE_CHOICES}
+
+# Admins can profile a request by sending this token as an X-Profile header or ?profile= (unset: disabled)
+app.config['PROFILE_TOKEN'] = os.getenv('RESUME_PROFILE_TOKEN')
+PROFILED_ENDPOINTS = {'generate_resume', 'regenerate_resume'}
+
+
+def profile_token_ok(token):
+    expected = app.config['PROFILE_TOKEN']
+    return bool(expected and token) and hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8'))
+
+
+@app.before_request
+def start_request_profile():
+    """Sample this request's stack when an admin asks for a profile (see profiling.py)."""
+    if request.endpoint not in PROFILED_ENDPOINTS:
+        return
+    if profile_token_ok(request.headers.get('X-Profile') or request.args.get('profile')):
+        g.profile = profiling.start_profile(f"{request.method} {request.path}")
+
+
+@app.after_request
+def finish_request_profile(response):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        summary = profiling.finish_profile(profile)
+        response.headers['X-Profile-Id'] = profile.id
+        response.headers['X-Profile-Url'] = url_for('download_profile', profile_id=profile.id, fmt='speedscope')
+        response.headers['X-Profile-Phases'] = ', '.join(
+            f"{name};dur={ms}" for name, ms in summary['phase_ms'].items())
+        print(f"Profiled {profile.name}: {summary['duration_ms']:.0f} ms, {summary['samples']} samples, "
+              f"sampler overhead {summary['overhead_ms']:.1f} ms")
+    return response
+
+
+@app.teardown_request
+def abandon_request_profile(error=None):
+    # Unhandled errors skip after_request; still stop the sampler and free its slot
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiling.finish_profile(profile)
+
+
+# Scheduler priority class per endpoint (see scheduler.py); anything else runs as 'single'
+ENDPOINT_PRIORITIES = {'regenerate_resume': 'interactive', 'generate_resume': 'single'}
+
+
+@app.before_request
+def set_request_priority():
+    """
+    Schedule this request's renders and LLM calls by endpoint.
+    
+    Bulk clients send X-Resume-Priority: batch (or ?priority=batch); a request
+    can lower its priority this way but never raise it.
+    """
+    name = ENDPOINT_PRIORITIES.get(request.endpoint, 'single')
+    requested = request.headers.get('X-Resume-Priority') or request.args.get('priority')
+    if requested in PRIORITIES and PRIORITIES.index(requested) > PRIORITIES.index(name):
+        name = requested
+    g.priority_token = scheduler.set_priority(name)
+
+
+@app.teardown_request
+def reset_request_priority(error=None):
+    token = g.pop('priority_token', None)
+    if token is not None:
+        scheduler.reset_priority(token)
+
+
+@app.route('/profiles/<profile_id>/<fmt>')
+def download_profile(profile_id, fmt):
+    """Download a saved request profile (fmt: speedscope or folded); needs the profile token."""
+    if not profile_token_ok(request.headers.get('X-Profile') or request.args.get('profile')):
+        abort(404)
+    found = profiling.profile_path(profile_id, fmt)
+    if found is None:
+        abort(404)
+    path, mimetype = found
+    return send_file(os.path.abspath(path), mimetype=mimetype, as_attachment=True,
+                     download_name=os.path.basename(path))
+
+
+def render_pdf(resume_data, user_info, **options):
+    """
+    Render a resume PDF into UPLOAD_FOLDER (create_unique_resume options).
+    
+    The filename is a hash of everything that affects the output - the inputs,
+    the template spec's content and the renderer version - so identical renders
+    share one file and are only rendered once, and files are written atomically
+    and never overwritten, so their URLs can be cached forever.
+    
+    Returns:
+        tuple: (filename, fit report or None)
+    """
+    contact = {field: user_info.get(field) for field in USER_FIELDS}
+    job = dict(options, resume_data=resume_data, user_info=contact, optimize=app.config['PDF_OPTIMIZE'],
+               deterministic=app.config['PDF_DETERMINISTIC'])
+    name = (user_info.get('name') or 'resume').replace(' ', '_')
+    renderer = (RENDERER_VERSION, reportlab.Version, spec_hash(options.get('template', 'sidebar')))
+    filename = secure_filename(f"resume_{name}_{content_key(job, renderer)[:20]}.pdf")
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    fit_path = filepath + '.fit.json'
+    
+    if os.path.exists(filepath):
+        fit = None
+        if os.path.exists(fit_path):
+            with open(fit_path, encoding='utf-8') as f:
+                fit = json.load(f)
+        return filename, fit
+    
+    def save(data, fit):
+        # Fit report first: once the PDF exists, so does its report
+        if fit:
+            write_once(fit_path, json.dumps(fit).encode('utf-8'))
+        write_once(filepath, data)
+    
+    # Editor re-renders go ahead of generations; batch work only gets part of the workers
+    with RENDER_SCHEDULER.slot():
+        if profiling.active():
+            # Profiled requests render here, so the sampler sees the layout instead of a wait on the pool
+            data, fit = render_job(job)
+        elif render_service and SHARED_MEMORY:
+            # Written straight from the worker's shared memory block, no copy through the pipe
+            with render_service.render(job, shared=True) as pdf:
+                save(pdf.view, pdf.fit)
+            return filename, pdf.fit
+        else:
+            data, fit = render_service.render(job) if render_service else render_job(job)
+        save(data, fit)
+    return filename, fit
+
 
 @app.route('/')
 def index():
     """Home page with the form."""
-    return render_template('index.html')
+    return render_template('index.html', custom_fonts=available_fonts(), templates=TEMPLATE_CHOICES)
+
+
+@app.route('/import', methods=['POST'])
+def import_resume():
+    """Pre-fill the form from an uploaded resume (PDF, DOCX or text) - parsed locally, no LLM call."""
+    upload = request.files.get('resume_file')
+    if upload is None or not upload.filename:
+        return {'error': 'No file uploaded'}, 400
+    try:
+        result = import_bytes(upload.filename, upload.read())
+    except ImportFailed as e:
+        return {'error': str(e)}, 400
+    return {'fields': form_fields(result), 'ambiguous': len(result['ambiguous'])}
 
 
 @app.route('/generate', methods=['POST'])
@@ -63,36 +263,37 @@ def generate_resume():
         # Initialize generator
         generator = ResumeGenerator(api_key=api_key)
         
-        # Generate resume content
-        resume_data = generator.generate_resume_content(job_description, user_info)
+        # Parsed once per background; each job only retrieves its top achievements
+        profile = profile_store.get_profile(user_info)
         
-        # Create PDF with timestamp in filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"resume_{name.replace(' ', '_')}_{timestamp}.pdf"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        # Generate resume content
+        resume_data = generator.generate_resume_content(
+            job_description, user_info, profile=profile, user=session_owner(),
+            usage_tags={'endpoint': 'generate', 'user': resume_store.user_key_for(user_info), 'template': template},
+        )
         
-        # Generate with unique design templates
-        from resume_templates_unique import create_unique_resume
+        # Create PDF, named by a hash of its content
         color = color_scheme if color_scheme else 'blue'
         
-        # Map template names to types
-        if template == 'sidebar_accent':
-            template_type = 'sidebar'
-        elif template == 'diagonal_header':
-            template_type = 'diagonal'
-        elif template == 'circle_accent':
-            template_type = 'circle'
-        else:
-            template_type = 'sidebar'  # Default
+        template_type = TEMPLATE_TYPES.get(template, 'sidebar')
         
-        create_unique_resume(resume_data, user_info, filepath, template=template_type, color=color, font=font_family)
+        filename, _ = render_pdf(resume_data, user_info, template=template_type, color=color, font=font_family)
+        
+        # Persist so the resume can be listed and reopened later
+        resume_id, version = resume_store.save_resume(
+            resume_data, user_info, filename,
+            template=template, color_scheme=color_scheme, font_family=font_family,
+            job_description=job_description, owner_key=session_owner(),
+        )
         
         # Store data in session for editor
+        session['resume_id'] = resume_id
         session['resume_data'] = resume_data
         session['user_info'] = user_info
         session['template'] = template
         session['color_scheme'] = color_scheme
         session['font_family'] = font_family
+        session['fit_pages'] = None
         session['api_key'] = api_key
         session['filename'] = filename
         
@@ -108,12 +309,42 @@ def generate_resume():
 def download_file(filename):
     """Download the generated resume."""
     try:
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
+        return send_immutable(app.config['UPLOAD_FOLDER'], filename, as_attachment=True,
+                              allow_gzip=app.config['PDF_GZIP'])
     except:
         flash('File not found', 'error')
         return redirect(url_for('index'))
 
 
+@app.route('/export/<fmt>')
+def export_resume(fmt):
+    """Download the current draft as PDF, DOCX, HTML or ATS-friendly text."""
+    resume_data = session.get('resume_data')
+    if fmt not in EXPORTERS or not resume_data:
+        flash('Nothing to export' if fmt in EXPORTERS else f'Unknown export format: {fmt}', 'error')
+        return redirect(url_for('index'))
+    
+    user_info = session.get('user_info', {})
+    template = TEMPLATE_TYPES.get(session.get('template'), 'sidebar')
+    color = session.get('color_scheme') or 'blue'
+    font = session.get('font_family') or 'helvetica'
+    name = (user_info.get('name') or 'resume').replace(' ', '_')
+    
+    if fmt == 'pdf':
+        # The draft's PDF is already rendered (same file as the preview); re-render
+        # through the render pool and scheduler only if it has been cleaned up
+        filename = session.get('filename')
+        if not filename or not os.path.isfile(os.path.join(app.config['UPLOAD_FOLDER'], filename)):
+            filename, _ = render_pdf(resume_data, user_info, template=template, color=color, font=font,
+                                     fit_pages=session.get('fit_pages'))
+        return send_immutable(app.config['UPLOAD_FOLDER'], filename, as_attachment=True,
+                              download_name=f"resume_{name}.pdf")
+    
+    data, mimetype, extension = export(fmt, resume_data, user_info, template=template, color=color, font=font)
+    return send_file(io.BytesIO(data), mimetype=mimetype, as_attachment=True,
+                     download_name=f"resume_{name}.{extension}")
+
+
 @app.route('/edit/<filename>')
 def edit_resume(filename):
     """Show editor page with current resume data."""
@@ -122,7 +353,15 @@ def edit_resume(filename):
     template = session.get('template', 'sidebar_accent')
     color_scheme = session.get('color_scheme', 'blue')
     font_family = session.get('font_family', 'helvetica')
+    fit_pages = session.get('fit_pages')
     api_key = session.get('api_key', '')
+    # The posting stays in the database - it's too big for the session cookie
+    resume_id = session.get('resume_id')
+    job_description = resume_store.job_description_for(resume_id, owner_key=session_owner()) if resume_id else ''
+    
+    # Local keyword match - no LLM call needed
+    match = analyze_resume_data(job_description, resume_data) if job_description else None
+    history = resume_store.history_state(resume_id) if resume_id else None
     
     return render_template('edit.html', 
                          filename=filename,
@@ -131,95 +370,344 @@ def edit_resume(filename):
                          template=template,
                          color_scheme=color_scheme,
                          font_family=font_family,
-                         api_key=api_key)
+                         fit_pages=fit_pages,
+                         api_key=api_key,
+                         match=match,
+                         history=history,
+                         custom_fonts=available_fonts(),
+                         templates=TEMPLATE_CHOICES)
+
+
+def session_owner():
+    """
+    Random id for this browser, kept in its (signed, 31-day) session cookie.
+    
+    Stored resumes carry the id of the session that created them and are only
+    listed and opened for that session.
+    """
+    if not session.get('owner'):
+        session['owner'] = secrets.token_hex(16)
+        session.permanent = True
+    return session['owner']
+
+
+def session_draft():
+    """The editor's current document ({'resume_data', 'user_info', 'options'}) from the session."""
+    return {
+        'resume_data': session.get('resume_data', {}),
+        'user_info': session.get('user_info', {}),
+        'options': {
+            'template': session.get('template'),
+            'color_scheme': session.get('color_scheme'),
+            'font_family': session.get('font_family'),
+            'fit_pages': session.get('fit_pages'),
+        },
+    }
+
+
+def draft_from_form(form):
+    """Rebuild a whole draft from the editor's flat form fields (the no-JavaScript path)."""
+    # User info
+    user_info = {
+        'name': form.get('name'),
+        'email': form.get('email'),
+        'phone': form.get('phone'),
+        'location': form.get('location')
+    }
+    
+    # Resume data
+    resume_data = {
+        'summary': form.get('summary'),
+        'skills': [s.strip() for s in form.get('skills', '').split(',') if s.strip()],
+        'experience': [],
+        'education': []
+    }
+    
+    # Parse experience
+    exp_index = 0
+    while f'exp_title_{exp_index}' in form:
+        achievements_text = form.get(f'exp_achievements_{exp_index}', '')
+        achievements = [a.strip() for a in achievements_text.split('\n') if a.strip()]
+        
+        resume_data['experience'].append({
+            'title': form.get(f'exp_title_{exp_index}'),
+            'company': form.get(f'exp_company_{exp_index}'),
+            'period': form.get(f'exp_period_{exp_index}'),
+            'achievements': achievements
+        })
+        exp_index += 1
+    
+    # Parse education
+    edu_index = 0
+    while f'edu_degree_{edu_index}' in form:
+        resume_data['education'].append({
+            'degree': form.get(f'edu_degree_{edu_index}'),
+            'institution': form.get(f'edu_institution_{edu_index}'),
+            'year': form.get(f'edu_year_{edu_index}')
+        })
+        edu_index += 1
+    
+    options = {
+        'template': form.get('template'),
+        'color_scheme': form.get('color_scheme'),
+        'font_family': form.get('font_family'),
+        'fit_pages': form.get('fit_pages', type=int),  # None = template's own sizes
+    }
+    return {'resume_data': resume_data, 'user_info': user_info, 'options': options}
 
 
 @app.route('/regenerate', methods=['POST'])
 def regenerate_resume():
-    """Regenerate resume with manual edits."""
+    """
+    Regenerate resume with manual edits.
+    
+    Accepts the editor form, or JSON: {"patch": [...]} with JSON Patch operations
+    against the session's draft (only the changed fields are sent and re-validated),
+    or {"document": {...}} with a whole draft. JSON requests get a JSON reply:
+    400 for invalid JSON, malformed patches or drafts that fail the schema, 409
+    for a patch whose paths don't exist in the draft.
+    """
+    wants_json = request.is_json
     try:
-        # Get form data
-        template = request.form.get('template')
-        color_scheme = request.form.get('color_scheme')
-        font_family = request.form.get('font_family')
-        api_key = request.form.get('api_key')
-        
-        # User info
-        user_info = {
-            'name': request.form.get('name'),
-            'email': request.form.get('email'),
-            'phone': request.form.get('phone'),
-            'location': request.form.get('location')
-        }
-        
-        # Resume data
-        resume_data = {
-            'summary': request.form.get('summary'),
-            'skills': [s.strip() for s in request.form.get('skills', '').split(',') if s.strip()],
-            'experience': [],
-            'education': []
-        }
+        # Parse + validate, timed separately from rendering
+        start = time.perf_counter()
+        if wants_json:
+            payload = request.get_json(silent=True)
+            if payload is None:
+                raise DraftInvalid('Request body is not valid JSON')
+            if not isinstance(payload, dict):
+                raise DraftInvalid('Expected a JSON object with "patch" or "document"')
+            if 'patch' in payload:
+                patch = payload['patch']
+                if not isinstance(patch, list):
+                    raise DraftInvalid('"patch" must be a list of JSON Patch operations')
+                draft = apply_patch(session_draft(), patch)
+                parsed = time.perf_counter()
+                validate_patched(draft, patch)
+            else:
+                draft = payload.get('document')
+                parsed = time.perf_counter()
+                validate_draft(draft)
+        else:
+            draft = draft_from_form(request.form)
+            parsed = time.perf_counter()
+            validate_draft(draft)
+        validated = time.perf_counter()
         
-        # Parse experience
-        exp_index = 0
-        while f'exp_title_{exp_index}' in request.form:
-            achievements_text = request.form.get(f'exp_achievements_{exp_index}', '')
-            achievements = [a.strip() for a in achievements_text.split('\n') if a.strip()]
-            
-            resume_data['experience'].append({
-                'title': request.form.get(f'exp_title_{exp_index}'),
-                'company': request.form.get(f'exp_company_{exp_index}'),
-                'period': request.form.get(f'exp_period_{exp_index}'),
-                'achievements': achievements
-            })
-            exp_index += 1
-        
-        # Parse education
-        edu_index = 0
-        while f'edu_degree_{edu_index}' in request.form:
-            resume_data['education'].append({
-                'degree': request.form.get(f'edu_degree_{edu_index}'),
-                'institution': request.form.get(f'edu_institution_{edu_index}'),
-                'year': request.form.get(f'edu_year_{edu_index}')
-            })
-            edu_index += 1
+        resume_data = draft['resume_data']
+        user_info = draft['user_info']
+        options = draft['options']
+        template = options.get('template')
+        color_scheme = options.get('color_scheme')
+        font_family = options.get('font_family')
+        fit_pages = int(options.get('fit_pages') or 0) or None
         
         # Generate new PDF
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"resume_{user_info['name'].replace(' ', '_')}_{timestamp}.pdf"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        from resume_templates_unique import create_unique_resume
-        
-        # Map template names
-        if template == 'sidebar_accent':
-            template_type = 'sidebar'
-        elif template == 'diagonal_header':
-            template_type = 'diagonal'
-        elif template == 'circle_accent':
-            template_type = 'circle'
-        else:
-            template_type = 'sidebar'
+        template_type = TEMPLATE_TYPES.get(template, 'sidebar')
         
-        create_unique_resume(resume_data, user_info, filepath, template=template_type, color=color_scheme, font=font_family)
+        filename, fit = render_pdf(resume_data, user_info, template=template_type, color=color_scheme,
+                                   font=font_family, fit_pages=fit_pages)
+        rendered = time.perf_counter()
+        
+        # Save as a new version of the same resume
+        resume_id, version = resume_store.save_resume(
+            resume_data, user_info, filename,
+            template=template, color_scheme=color_scheme, font_family=font_family,
+            resume_id=session.get('resume_id'), owner_key=session_owner(), fit_pages=fit_pages,
+        )
         
         # Update session
+        session['resume_id'] = resume_id
         session['resume_data'] = resume_data
         session['user_info'] = user_info
+        session['template'] = template
+        session['color_scheme'] = color_scheme
+        session['font_family'] = font_family
+        session['fit_pages'] = fit_pages
         session['filename'] = filename
         
-        flash('Resume regenerated successfully!', 'success')
-        return redirect(url_for('edit_resume', filename=filename))
+        if fit and not fit['fits']:
+            flash(f"Still {fit['pages']} pages at the tightest layout - trim some content to fit {fit_pages}.", 'error')
+        elif fit and fit['natural_pages'] > fit['pages']:
+            flash(f"Fit to {fit['pages']} page(s): text at {fit['font_scale']:.0%} and spacing at "
+                  f"{fit['spacing_scale']:.0%} of the template's sizes.", 'success')
+        else:
+            flash('Resume regenerated successfully!', 'success')
+        
+        timing = {
+            'parse_ms': round((parsed - start) * 1000, 2),
+            'validate_ms': round((validated - parsed) * 1000, 2),
+            'render_ms': round((rendered - validated) * 1000, 2),
+        }
+        server_timing = ', '.join(f"{name[:-3]};dur={value}" for name, value in timing.items())
+        edit_url = url_for('edit_resume', filename=filename)
+        if wants_json:
+            body = {'filename': filename, 'edit_url': edit_url, 'version': version, 'fit': fit, 'timing': timing}
+            return body, 200, {'Server-Timing': server_timing}
+        response = redirect(edit_url)
+        response.headers['Server-Timing'] = server_timing
+        return response
         
+    except (PatchError, DraftInvalid) as e:
+        if wants_json:
+            # 409: the patch is well-formed but doesn't fit the current draft
+            conflict = isinstance(e, PatchError) and not isinstance(e, MalformedPatch)
+            return {'error': str(e)}, 409 if conflict else 400
+        flash(f'Invalid edit: {str(e)}', 'error')
+        if session.get('filename'):
+            return redirect(url_for('edit_resume', filename=session['filename']))
+        return redirect(url_for('index'))
     except Exception as e:
+        if wants_json:
+            return {'error': str(e)}, 500
         flash(f'Error regenerating resume: {str(e)}', 'error')
         return redirect(url_for('index'))
 
 
+@app.route('/resumes')
+def list_resumes():
+    """List and search the resumes this browser generated."""
+    query = request.args.get('q', '').strip()
+    user = request.args.get('user', '').strip()
+    resumes = resume_store.list_resumes(owner_key=session_owner(), user_key=user or None, query=query or None)
+    return render_template('resumes.html', resumes=resumes, query=query, user=user)
+
+
+@app.route('/resumes/<int:resume_id>')
+def open_resume(resume_id):
+    """Load a stored resume (optionally a specific version) into the editor."""
+    stored = resume_store.get_resume(resume_id, version=request.args.get('version', type=int),
+                                     owner_key=session_owner())
+    if stored is None:
+        # Also for other people's resumes, so ids can't be probed
+        abort(404)
+    
+    filename = load_stored_resume(stored)
+    return redirect(url_for('edit_resume', filename=filename))
+
+
+@app.route('/undo', methods=['POST'])
+def undo_edit():
+    """Go back to the previous version of the resume being edited."""
+    return _step_history(resume_store.undo, 'Nothing to undo')
+
+
+@app.route('/redo', methods=['POST'])
+def redo_edit():
+    """Re-apply the version that was undone."""
+    return _step_history(resume_store.redo, 'Nothing to redo')
+
+
+def _step_history(step, empty_message):
+    resume_id = session.get('resume_id')
+    stored = step(resume_id) if resume_id else None
+    if stored is None:
+        flash(empty_message, 'error')
+        return redirect(url_for('edit_resume', filename=session.get('filename', '')))
+    
+    filename = load_stored_resume(stored)
+    return redirect(url_for('edit_resume', filename=filename))
+
+
+def load_stored_resume(stored):
+    """Put a stored revision into the session, re-rendering only if its PDF is gone."""
+    filename = stored['filename']
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if not os.path.exists(filepath):
+        # PDF was cleaned up - rebuild it from stored content, no LLM call needed
+        template_type = TEMPLATE_TYPES.get(stored['template'], 'sidebar')
+        filename, _ = render_pdf(stored['resume_data'], stored['user_info'], template=template_type,
+                                 color=stored['color_scheme'], font=stored['font_family'],
+                                 fit_pages=stored['fit_pages'])
+    
+    session['resume_id'] = stored['id']
+    session['resume_data'] = stored['resume_data']
+    session['user_info'] = stored['user_info']
+    session['template'] = stored['template']
+    session['color_scheme'] = stored['color_scheme']
+    session['font_family'] = stored['font_family']
+    session['fit_pages'] = stored['fit_pages']
+    session['filename'] = filename
+    return filename
+
+
+@app.route('/readyz')
+def readyz():
+    """Readiness probe: 200 once the boot warm-up has rendered every template, 503 until then."""
+    return warmup.status(), 200 if warmup.ready else 503
+
+
+@app.route('/metrics')
+def metrics():
+    """LLM rate limiter queue, warm-up and scheduler lane metrics in Prometheus text format."""
+    stats = LLM_LIMITER.metrics()
+    lines = [
+        '# TYPE resume_llm_queue_depth gauge',
+        f"resume_llm_queue_depth {stats['queue_depth']}",
+        '# TYPE resume_llm_queue_wait_seconds summary',
+        f"resume_llm_queue_wait_seconds{{quantile=\"0.5\"}} {stats['wait_seconds_p50']:.6f}",
+        f"resume_llm_queue_wait_seconds{{quantile=\"0.95\"}} {stats['wait_seconds_p95']:.6f}",
+        f"resume_llm_queue_wait_seconds{{quantile=\"1\"}} {stats['wait_seconds_max']:.6f}",
+        f"resume_llm_queue_wait_seconds_sum {stats['wait_seconds_sum']:.6f}",
+        f"resume_llm_queue_wait_seconds_count {stats['wait_count']}",
+        '# TYPE resume_warmup_ready gauge',
+        f"resume_warmup_ready {int(warmup.ready)}",
+    ]
+    if warmup.seconds is not None:
+        lines += ['# TYPE resume_warmup_seconds gauge', f"resume_warmup_seconds {warmup.seconds:.3f}"]
+    lanes = [(resource.name, name, lane) for resource in (RENDER_SCHEDULER, LLM_SCHEDULER)
+             for name, lane in resource.metrics().items()]
+    for metric, fmt in (('running', 'd'), ('waiting', 'd'), ('wait_seconds_p95', '.6f')):
+        lines.append(f"# TYPE resume_scheduler_{metric} gauge")
+        lines += [f"resume_scheduler_{metric}{{resource=\"{resource}\",priority=\"{name}\"}} {lane[metric]:{fmt}}"
+                  for resource, name, lane in lanes]
+    return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+
 @app.route('/preview/<filename>')
 def preview_resume(filename):
-    """Serve PDF for preview in iframe."""
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    """Serve PDF for preview in iframe (cached by the browser; supports Range for progressive loading)."""
+    return send_immutable(app.config['UPLOAD_FOLDER'], filename, allow_gzip=app.config['PDF_GZIP'])
+
+
+def render_live_preview(draft):
+    """Render a live preview draft ({'resume_data', 'user_info', 'options'}) and point the iframe at it."""
+    options = draft['options']
+    with scheduler.priority('interactive'):
+        filename, fit = render_pdf(
+            draft['resume_data'], draft['user_info'],
+            template=TEMPLATE_TYPES.get(options.get('template'), 'sidebar'),
+            color=options.get('color_scheme') or 'blue',
+            font=options.get('font_family') or 'helvetica',
+            fit_pages=int(options.get('fit_pages') or 0) or None,
+        )
+    return {'url': f"/preview/{filename}", 'pages': fit['pages'] if fit else None}
+
+
+# Edits are schema-checked like /regenerate's, so a bad one never reaches the renderer
+live_preview = LivePreview(socketio, render_live_preview, validate=validate_patched)
+
+
+@socketio.on('connect', namespace='/preview')
+def live_preview_connect():
+    """Start a live preview draft from the resume currently in the editor."""
+    if not session.get('resume_data'):
+        return False
+    live_preview.open(request.sid, session_draft())
+
+
+@socketio.on('disconnect', namespace='/preview')
+def live_preview_disconnect():
+    live_preview.close(request.sid)
+
+
+@socketio.on('edit', namespace='/preview')
+def live_preview_edit(patch):
+    """Field edits as JSON Patch operations; the re-rendered preview arrives as a 'preview' event."""
+    try:
+        live_preview.edit(request.sid, patch)
+    except (PatchError, DraftInvalid) as e:
+        emit('preview_error', {'error': str(e)})
 
 
 if __name__ == '__main__':
@@ -227,8 +715,14 @@ if __name__ == '__main__':
     print("\n" + "="*50)
     print("🚀 AI Resume Generator Web App")
     print("="*50)
-    print("📍 Open your browser and go to: http://localhost:5000")
+    port = int(os.getenv('PORT', 5000))
+    print(f"📍 Open your browser and go to: http://localhost:{port}")
     print("🛑 Press Ctrl+C to stop the server")
     print("="*50 + "\n")
     
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Werkzeug in threading mode on purpose: the render pool, rate limiter and scheduler
+    # rely on real threads, which eventlet/gevent monkey-patching would replace.
+    # simple-websocket gives it WebSocket support for the live preview.
+    # A single process that never forks, so warm up while the server starts
+    warmup.start(render_service, optimize=app.config['PDF_OPTIMIZE'])
+    socketio.run(app, host=os.getenv('HOST', '0.0.0.0'), port=port, allow_unsafe_werkzeug=True)
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Font benchmark: first-render vs warm-render cost for embedded TrueType fonts.
+
+Usage:
+    python benchmarks/bench_fonts.py [--font-dir DIR] [--runs N]
+
+Compares three ways of rendering with a custom font:
+  per-request  parse + register the TTF on every render (what we'd do without a registry)
+  first        first render after preload_fonts() (subset tables not cached yet)
+  warm         later renders sharing the parsed font and cached subsets
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+import fonts
+from layout_cache import SECTION_CACHE
+from resume_templates_unique import create_unique_resume
+
+
+SAMPLE_RESUME = {
+    'summary': 'Engineer with ten years of experience building distributed systems and developer tooling. ' * 3,
+    'skills': ['Python', 'Go', 'Kubernetes', 'AWS', 'PostgreSQL', 'React', 'Terraform', 'Kafka', 'Redis'],
+    'experience': [
+        {
+            'title': f'Senior Engineer {i}',
+            'company': 'TechCorp',
+            'period': '2019 - Present',
+            'achievements': [f'Delivered project {i}.{j}, cutting latency by {10 + j}% for 2M users' for j in range(5)],
+        }
+        for i in range(4)
+    ],
+    'education': [{'degree': 'BS Computer Science', 'institution': 'MIT', 'year': '2012'}],
+}
+
+SAMPLE_USER = {'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '(555) 123-4567', 'location': 'Austin, TX'}
+
+
+def render(font_family):
+    # Clear section cache so only font handling differs between runs
+    SECTION_CACHE.clear()
+    buffer = io.BytesIO()
+    create_unique_resume(SAMPLE_RESUME, SAMPLE_USER, buffer, template='sidebar', font=font_family)
+    return len(buffer.getvalue())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--font-dir', action='append', help='Folder with Family-Style.ttf files (default: FONT_DIRS)')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    families = fonts.discover_font_files(args.font_dir)
+    if not families:
+        print(f"No .ttf/.otf families found in {args.font_dir or fonts.FONT_DIRS}")
+        return 1
+    family, styles = next(iter(families.items()))
+    print(f"Font family: {family} ({', '.join(sorted(styles))})\n")
+
+    # Baseline: parse and register the font for every request, no shared subsets
+    per_request = []
+    for i in range(args.runs):
+        def register_and_render():
+            regular = TTFont(f"Bench{i}", styles['regular'])
+            bold = TTFont(f"Bench{i}-Bold", styles.get('bold', styles['regular']))
+            pdfmetrics.registerFont(regular)
+            pdfmetrics.registerFont(bold)
+            fonts._families['bench'] = {'label': 'bench', 'regular': regular.fontName, 'bold': bold.fontName}
+            return render('bench')
+        per_request.append(timed(register_and_render)[0])
+    del fonts._families['bench']
+
+    preload_ms, _ = timed(fonts.preload_fonts, args.font_dir)
+    slug = fonts._slug(family)
+    first_ms, size = timed(render, slug)
+    warm = [timed(render, slug)[0] for _ in range(args.runs)]
+    builtin = [timed(render, 'helvetica')[0] for _ in range(args.runs)]
+
+    print(f"{'preload (once per process)':<32}{preload_ms:>9.1f} ms")
+    print(f"{'per-request register + render':<32}{sum(per_request) / len(per_request):>9.1f} ms")
+    print(f"{'first render (preloaded)':<32}{first_ms:>9.1f} ms")
+    print(f"{'warm render (preloaded)':<32}{sum(warm) / len(warm):>9.1f} ms")
+    print(f"{'warm render (Helvetica)':<32}{sum(builtin) / len(builtin):>9.1f} ms")
+    print(f"\nPDF size with embedded subset: {size / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
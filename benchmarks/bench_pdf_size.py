@@ -0,0 +1,75 @@
+"""
+PDF size benchmark: default output vs optimize=True for every template.
+
+Usage:
+    python benchmarks/bench_pdf_size.py [--experience N] [--font FONT]
+
+optimize=True writes binary (not ASCII85) compressed streams and drops the
+document info metadata. Page decorations are a shared Form XObject either way.
+"""
+
+import argparse
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+
+from resume_templates_unique import TEMPLATES, create_unique_resume
+
+
+def sample_resume(experience):
+    return {
+        'summary': 'Engineer with ten years of experience building distributed systems and developer tooling. ' * 3,
+        'skills': ['Python', 'Go', 'Kubernetes', 'AWS', 'PostgreSQL', 'React', 'Terraform', 'Kafka', 'Redis'],
+        'experience': [
+            {
+                'title': f'Senior Engineer {i}',
+                'company': 'TechCorp',
+                'period': '2019 - Present',
+                'achievements': [f'Delivered project {i}.{j}, cutting latency by {10 + j}% for 2M users' for j in range(4)],
+            }
+            for i in range(experience)
+        ],
+        'education': [{'degree': 'BS Computer Science', 'institution': 'MIT', 'year': '2012'}],
+    }
+
+
+SAMPLE_USER = {'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '(555) 123-4567', 'location': 'Austin, TX'}
+
+
+def render_size(resume_data, template, font, optimize):
+    buffer = io.BytesIO()
+    create_unique_resume(resume_data, SAMPLE_USER, buffer, template=template, font=font, optimize=optimize)
+    return len(buffer.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--experience', type=int, action='append',
+                        help='Experience entries per resume (repeatable, default: 3 and 8)')
+    parser.add_argument('--font', default='helvetica')
+    args = parser.parse_args()
+
+    # Stable byte counts between runs
+    rl_config.invariant = 1
+
+    for experience in args.experience or [3, 8]:
+        resume_data = sample_resume(experience)
+        print(f"\n{experience} experience entries")
+        print(f"{'template':<12}{'default':>10}{'optimized':>12}{'saved':>9}")
+        total_before = total_after = 0
+        for template in TEMPLATES:
+            before = render_size(resume_data, template, args.font, optimize=False)
+            after = render_size(resume_data, template, args.font, optimize=True)
+            total_before += before
+            total_after += after
+            print(f"{template:<12}{before:>10,}{after:>12,}{1 - after / before:>9.0%}")
+        print(f"{'total':<12}{total_before:>10,}{total_after:>12,}{1 - total_after / total_before:>9.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Render handoff benchmark: PDF bytes pickled back through the pool's pipe vs
+a shared memory block the web process reads in place.
+
+Usage:
+    python benchmarks/bench_render_handoff.py [--requests N] [--concurrency C] [--experience E]
+
+Each mode runs in its own process so peak RSS isn't shared between them.
+"Pipe bytes" is the pickled result each worker sends back; "copied" adds
+the PDF bytes materialized in the web process (zero for shared memory,
+which is written to the output file straight from its memoryview).
+"""
+
+import argparse
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render_service import SHARED_MEMORY, RenderService
+from benchmarks.bench_pdf_size import SAMPLE_USER, sample_resume
+
+
+def run_mode(mode, requests, concurrency, experience):
+    service = RenderService(processes=min(concurrency, os.cpu_count() or 1), queue_size=concurrency)
+    service.start()
+    job = {'resume_data': sample_resume(experience), 'user_info': SAMPLE_USER, 'template': 'circle'}
+    service.render(job)     # workers warm, pool fully started
+
+    def one(_):
+        if mode == 'shared':
+            with service.render(job, shared=True) as pdf, open(os.devnull, 'wb') as f:
+                f.write(pdf.view)
+                payload = pickle.dumps((pdf.name, pdf.size, pdf.fit))
+                return pdf.size, len(payload), 0
+        data, fit = service.render(job)
+        with open(os.devnull, 'wb') as f:
+            f.write(data)
+        return len(data), len(pickle.dumps((data, fit))), len(data)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    web_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    service.close()
+    worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    size, pipe, copied = results[0]
+    print(f"{mode:<8}{size:>10,}{pipe:>14,}{pipe + copied:>14,}{requests / elapsed:>10.1f}"
+          f"{web_rss / 1024:>12.1f}{worker_rss / 1024:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--experience', type=int, default=150, help='Experience entries (PDF size)')
+    parser.add_argument('--mode', choices=['bytes', 'shared'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.requests, args.concurrency, args.experience)
+        return 0
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent")
+    print(f"{'mode':<8}{'pdf bytes':>10}{'pipe B/req':>14}{'copied B/req':>14}{'req/s':>10}"
+          f"{'web MB':>12}{'worker MB':>12}")
+    for mode in ['bytes', 'shared'] if SHARED_MEMORY else ['bytes']:
+        subprocess.run([sys.executable, __file__, '--mode', mode, '--requests', str(args.requests),
+                        '--concurrency', str(args.concurrency), '--experience', str(args.experience)],
+                       check=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
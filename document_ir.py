@@ -0,0 +1,103 @@
+"""
+Document IR
+Format-neutral representation of a resume that every export backend consumes.
+
+The IR is plain JSON-compatible data, built once per distinct resume content
+and cached, so exporting the same draft as PDF, DOCX, HTML and text only pays
+for the format-specific step.
+"""
+
+import copy
+from collections import OrderedDict
+from threading import Lock
+
+from layout_cache import content_key
+
+
+CONTACT_FIELDS = ('email', 'phone', 'location')
+
+SECTION_TITLES = {
+    'summary': 'Professional Summary',
+    'skills': 'Skills',
+    'experience': 'Experience',
+    'education': 'Education',
+}
+
+IR_CACHE_SIZE = 128
+
+_ir_cache = OrderedDict()
+_lock = Lock()
+
+
+def _entry(heading, subheading, dates, bullets=()):
+    return {
+        'heading': heading or '',
+        'subheading': subheading or '',
+        'dates': dates or '',
+        'bullets': [b for b in bullets if b],
+    }
+
+
+def _build(resume_data, user_info):
+    sections = []
+
+    if resume_data.get('summary'):
+        sections.append({'id': 'summary', 'kind': 'paragraphs', 'paragraphs': [resume_data['summary']]})
+
+    if resume_data.get('skills'):
+        sections.append({'id': 'skills', 'kind': 'items', 'items': [s for s in resume_data['skills'] if s]})
+
+    if resume_data.get('experience'):
+        sections.append({'id': 'experience', 'kind': 'entries', 'entries': [
+            _entry(exp.get('title'), exp.get('company'), exp.get('period'), exp.get('achievements', []))
+            for exp in resume_data['experience']
+        ]})
+
+    if resume_data.get('education'):
+        sections.append({'id': 'education', 'kind': 'entries', 'entries': [
+            _entry(edu.get('degree'), edu.get('institution'), edu.get('year'))
+            for edu in resume_data['education']
+        ]})
+
+    for section in sections:
+        section['title'] = SECTION_TITLES[section['id']]
+
+    return {
+        'name': user_info.get('name') or 'Your Name',
+        'contact': [user_info[field] for field in CONTACT_FIELDS if user_info.get(field)],
+        'sections': sections,
+        # Untouched content for backends that lay out from the original fields (PDF templates)
+        'source': {
+            'resume_data': copy.deepcopy(resume_data),
+            'user_info': {field: user_info.get(field) for field in ('name',) + CONTACT_FIELDS},
+        },
+    }
+
+
+def build_ir(resume_data, user_info):
+    """
+    Build (or fetch from cache) the document IR for a resume.
+
+    Args:
+        resume_data (dict): Structured resume content
+        user_info (dict): User's contact information
+
+    Returns:
+        dict: {'name', 'contact', 'sections', 'source'}. Shared between callers,
+            so backends must treat it as read-only.
+    """
+    contact = {field: user_info.get(field) for field in ('name',) + CONTACT_FIELDS}
+    key = content_key(resume_data, contact)
+
+    with _lock:
+        ir = _ir_cache.get(key)
+        if ir is not None:
+            _ir_cache.move_to_end(key)
+            return ir
+
+    ir = _build(resume_data, user_info)
+    with _lock:
+        _ir_cache[key] = ir
+        while len(_ir_cache) > IR_CACHE_SIZE:
+            _ir_cache.popitem(last=False)
+    return ir
@@ -0,0 +1,206 @@
+"""
+Draft Diffs
+Structural JSON diffs (RFC 6902 JSON Patch) between resume revisions
+"""
+
+import copy
+
+
+# Members each operation needs besides 'op' and 'path' (RFC 6902)
+REQUIRED_MEMBERS = {
+    'add': ('value',),
+    'replace': ('value',),
+    'test': ('value',),
+    'move': ('from',),
+    'copy': ('from',),
+}
+
+
+class PatchError(ValueError):
+    """Raised when a patch cannot be applied to a document"""
+
+
+class MalformedPatch(PatchError):
+    """Raised when a patch isn't valid JSON Patch at all (as opposed to not fitting the document)"""
+
+
+def _escape(token):
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def make_patch(old, new, path=''):
+    """
+    Compute a JSON Patch that turns `old` into `new`.
+
+    Lists are diffed after trimming their common prefix and suffix, so
+    inserting or removing one achievement produces a single operation
+    instead of shifting every element after it.
+
+    Args:
+        old: Previous JSON-compatible value
+        new: New JSON-compatible value
+        path (str): JSON pointer of the values being compared
+
+    Returns:
+        list: JSON Patch operations (empty if the values are equal)
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        prefix = 0
+        while prefix < len(old) and prefix < len(new) and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < len(old) - prefix and suffix < len(new) - prefix
+               and old[-1 - suffix] == new[-1 - suffix]):
+            suffix += 1
+
+        old_mid = old[prefix:len(old) - suffix]
+        new_mid = new[prefix:len(new) - suffix]
+        ops = []
+        for i in range(min(len(old_mid), len(new_mid))):
+            ops.extend(make_patch(old_mid[i], new_mid[i], f"{path}/{prefix + i}"))
+        # Remove from the back so earlier indices stay valid
+        for i in reversed(range(len(new_mid), len(old_mid))):
+            ops.append({'op': 'remove', 'path': f"{path}/{prefix + i}"})
+        for i in range(len(old_mid), len(new_mid)):
+            ops.append({'op': 'add', 'path': f"{path}/{prefix + i}", 'value': new_mid[i]})
+        return ops
+
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def _split_pointer(pointer):
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise MalformedPatch(f"Invalid JSON pointer: {pointer!r}")
+    return [_unescape(token) for token in pointer[1:].split('/')]
+
+
+def _resolve(doc, tokens, pointer):
+    """Walk to the container holding the last token of a pointer."""
+    target = doc
+    for token in tokens:
+        try:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise PatchError(f"Path not found: {pointer!r}")
+    return target
+
+
+def _list_index(container, token, pointer, allow_end=False):
+    if allow_end and token == '-':
+        return len(container)
+    try:
+        index = int(token)
+    except ValueError:
+        raise PatchError(f"Invalid list index in {pointer!r}")
+    upper = len(container) if allow_end else len(container) - 1
+    if index < 0 or index > upper:
+        raise PatchError(f"List index out of range in {pointer!r}")
+    return index
+
+
+def _get(doc, pointer):
+    tokens = _split_pointer(pointer)
+    return _resolve(doc, tokens, pointer)
+
+
+def _add(doc, pointer, value):
+    tokens = _split_pointer(pointer)
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1], pointer)
+    if isinstance(parent, list):
+        parent.insert(_list_index(parent, tokens[-1], pointer, allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise PatchError(f"Cannot add to non-container at {pointer!r}")
+    return doc
+
+
+def _remove(doc, pointer):
+    tokens = _split_pointer(pointer)
+    if not tokens:
+        raise PatchError("Cannot remove the document root")
+    parent = _resolve(doc, tokens[:-1], pointer)
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, tokens[-1], pointer))
+    if isinstance(parent, dict) and tokens[-1] in parent:
+        return parent.pop(tokens[-1])
+    raise PatchError(f"Path not found: {pointer!r}")
+
+
+def apply_patch(doc, patch, in_place=False):
+    """
+    Apply a JSON Patch to a document.
+
+    Args:
+        doc: JSON-compatible document
+        patch (list): JSON Patch operations
+        in_place (bool): Mutate `doc` instead of working on a deep copy
+
+    Returns:
+        The patched document
+
+    Raises:
+        MalformedPatch: If an operation is malformed or missing a member it needs
+        PatchError: If a path does not exist
+    """
+    if not in_place:
+        doc = copy.deepcopy(doc)
+
+    if not isinstance(patch, list):
+        raise MalformedPatch('A patch must be a list of operations')
+    for op in patch:
+        if not isinstance(op, dict) or not isinstance(op.get('op'), str) or not isinstance(op.get('path'), str):
+            raise MalformedPatch(f"Malformed patch operation: {op!r}")
+        kind, pointer = op['op'], op['path']
+        missing = [member for member in REQUIRED_MEMBERS.get(kind, ()) if member not in op]
+        if missing:
+            raise MalformedPatch(f"{kind!r} operation at {pointer!r} is missing {', '.join(map(repr, missing))}")
+        if 'from' in REQUIRED_MEMBERS.get(kind, ()) and not isinstance(op['from'], str):
+            raise MalformedPatch(f"Malformed patch operation: {op!r}")
+
+        if kind == 'add':
+            doc = _add(doc, pointer, copy.deepcopy(op['value']))
+        elif kind == 'remove':
+            _remove(doc, pointer)
+        elif kind == 'replace':
+            if not _split_pointer(pointer):
+                doc = copy.deepcopy(op['value'])
+                continue
+            _remove(doc, pointer)
+            doc = _add(doc, pointer, copy.deepcopy(op['value']))
+        elif kind == 'move':
+            value = _remove(doc, op['from'])
+            doc = _add(doc, pointer, value)
+        elif kind == 'copy':
+            doc = _add(doc, pointer, copy.deepcopy(_get(doc, op['from'])))
+        elif kind == 'test':
+            if _get(doc, pointer) != op['value']:
+                raise PatchError(f"Test failed at {pointer!r}")
+        else:
+            raise MalformedPatch(f"Unknown patch operation: {kind!r}")
+
+    return doc
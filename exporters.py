@@ -0,0 +1,256 @@
+"""
+Resume Exporters
+Pluggable backends that turn the document IR into PDF, DOCX, HTML or
+ATS-friendly plain text.
+
+Register a new format with the @exporter decorator; export() builds (or reuses)
+the IR and hands it to the backend, so no format needs another LLM call.
+"""
+
+import io
+import html
+import zipfile
+import unicodedata
+from xml.sax.saxutils import escape
+
+from document_ir import build_ir
+
+
+EXPORTERS = {}
+
+
+def exporter(fmt, mimetype, extension):
+    """Register a backend function `fn(ir, **options) -> bytes` for a format."""
+    def register(fn):
+        EXPORTERS[fmt] = {'render': fn, 'mimetype': mimetype, 'extension': extension}
+        return fn
+    return register
+
+
+def export(fmt, resume_data, user_info, **options):
+    """
+    Export a resume in one of the registered formats.
+
+    Args:
+        fmt (str): Key in EXPORTERS ('pdf', 'docx', 'html', 'txt')
+        resume_data (dict): Structured resume content
+        user_info (dict): User's contact information
+        **options: Backend options - template (spec name), color (ACCENT_COLORS key), font,
+            optimize (smaller PDF output), deterministic (byte-identical PDF output)
+
+    Returns:
+        tuple: (bytes, mimetype, extension)
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    backend = EXPORTERS[fmt]
+    data = backend['render'](build_ir(resume_data, user_info), **options)
+    return data, backend['mimetype'], backend['extension']
+
+
+def _accent(color):
+    from resume_templates_unique import ACCENT_COLORS
+    return ACCENT_COLORS.get(color, ACCENT_COLORS['blue'])
+
+
+# ---------------------------------------------------------------------------
+# PDF - the existing ReportLab templates
+# ---------------------------------------------------------------------------
+
+@exporter('pdf', 'application/pdf', 'pdf')
+def export_pdf(ir, template='sidebar', color='blue', font='helvetica', optimize=False, deterministic=False,
+               **options):
+    from resume_templates_unique import create_unique_resume
+    buffer = io.BytesIO()
+    source = ir['source']
+    create_unique_resume(source['resume_data'], source['user_info'], buffer, template=template, color=color, font=font,
+                         optimize=optimize, deterministic=deterministic)
+    return buffer.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Plain text for ATS portals
+# ---------------------------------------------------------------------------
+
+# Typographic characters that some ATS parsers mangle
+ATS_REPLACEMENTS = {
+    '•': '-', '▸': '-', '◆': '-', '●': '-', '→': '-',
+    '–': '-', '—': '-', '‘': "'", '’': "'",
+    '“': '"', '”': '"', '…': '...', ' ': ' ',
+}
+
+
+def ats_clean(text):
+    """Plain-text version of a field: ASCII punctuation, no icons or markup."""
+    text = ''.join(ATS_REPLACEMENTS.get(ch, ch) for ch in str(text))
+    # Drop emoji and pictographs (category So), keep accented letters
+    text = ''.join(ch for ch in text if unicodedata.category(ch) != 'So')
+    return ' '.join(text.replace('<br/>', ' ').split())
+
+
+@exporter('txt', 'text/plain; charset=utf-8', 'txt')
+def export_text(ir, **options):
+    lines = [ats_clean(ir['name']).upper()]
+    if ir['contact']:
+        lines.append(' | '.join(ats_clean(c) for c in ir['contact']))
+
+    for section in ir['sections']:
+        lines += ['', section['title'].upper()]
+        if section['kind'] == 'paragraphs':
+            lines += [ats_clean(p) for p in section['paragraphs']]
+        elif section['kind'] == 'items':
+            lines.append(', '.join(ats_clean(s) for s in section['items']))
+        else:
+            for i, entry in enumerate(section['entries']):
+                if i and entry['bullets']:
+                    lines.append('')
+                lines.append(' | '.join(ats_clean(part) for part in (entry['heading'], entry['subheading'], entry['dates']) if part))
+                lines += [f"- {ats_clean(b)}" for b in entry['bullets']]
+
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+# ---------------------------------------------------------------------------
+# HTML
+# ---------------------------------------------------------------------------
+
+HTML_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; color: #333; max-width: 760px; margin: 40px auto; padding: 0 20px; line-height: 1.45; }
+h1 { margin: 0; font-size: 32px; letter-spacing: 1px; color: #1a1a1a; }
+.contact { color: #555; margin: 6px 0 24px; }
+h2 { font-size: 15px; text-transform: uppercase; color: %(accent)s; border-bottom: 2px solid %(accent)s; padding-bottom: 4px; margin-top: 24px; }
+.entry { margin-bottom: 12px; }
+.entry h3 { font-size: 15px; margin: 0; }
+.meta { color: #666; font-size: 13px; }
+ul.skills { list-style: none; padding: 0; display: flex; flex-wrap: wrap; gap: 6px; }
+ul.skills li { border: 1px solid %(accent)s; border-radius: 4px; padding: 2px 8px; font-size: 13px; }
+"""
+
+
+@exporter('html', 'text/html; charset=utf-8', 'html')
+def export_html(ir, color='blue', **options):
+    e = html.escape
+    parts = [
+        '<!DOCTYPE html>',
+        '<html lang="en">',
+        '<head>',
+        '<meta charset="utf-8">',
+        f"<title>{e(ir['name'])} - Resume</title>",
+        f"<style>{HTML_STYLE % {'accent': _accent(color)}}</style>",
+        '</head>',
+        '<body>',
+        '<header>',
+        f"<h1>{e(ir['name'].upper())}</h1>",
+        f"<p class=\"contact\">{' | '.join(e(c) for c in ir['contact'])}</p>",
+        '</header>',
+    ]
+
+    for section in ir['sections']:
+        parts.append(f"<section id=\"{section['id']}\">")
+        parts.append(f"<h2>{e(section['title'])}</h2>")
+        if section['kind'] == 'paragraphs':
+            parts += [f"<p>{e(p)}</p>" for p in section['paragraphs']]
+        elif section['kind'] == 'items':
+            parts.append('<ul class="skills">' + ''.join(f"<li>{e(s)}</li>" for s in section['items']) + '</ul>')
+        else:
+            for entry in section['entries']:
+                meta = ' | '.join(e(part) for part in (entry['subheading'], entry['dates']) if part)
+                parts.append('<div class="entry">')
+                parts.append(f"<h3>{e(entry['heading'])}</h3>")
+                if meta:
+                    parts.append(f"<div class=\"meta\">{meta}</div>")
+                if entry['bullets']:
+                    parts.append('<ul>' + ''.join(f"<li>{e(b)}</li>" for b in entry['bullets']) + '</ul>')
+                parts.append('</div>')
+        parts.append('</section>')
+
+    parts += ['</body>', '</html>']
+    return '\n'.join(parts).encode('utf-8')
+
+
+# ---------------------------------------------------------------------------
+# DOCX - WordprocessingML written directly, no python-docx dependency
+# ---------------------------------------------------------------------------
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>"""
+
+DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCX_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+# Sizes are in half-points, spacing and indents in twentieths of a point
+DOCX_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="%(ns)s">
+<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/><w:sz w:val="21"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:spacing w:after="60"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/><w:pPr><w:spacing w:after="40"/></w:pPr><w:rPr><w:b/><w:sz w:val="48"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:before="240" w:after="80"/><w:pBdr><w:bottom w:val="single" w:sz="8" w:space="1" w:color="%(accent)s"/></w:pBdr><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:caps/><w:color w:val="%(accent)s"/><w:sz w:val="26"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:before="120" w:after="0"/><w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:b/><w:sz w:val="22"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Meta"><w:name w:val="Meta"/><w:basedOn w:val="Normal"/><w:rPr><w:color w:val="666666"/><w:sz w:val="19"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/><w:basedOn w:val="Normal"/><w:pPr><w:spacing w:after="20"/><w:ind w:left="360" w:hanging="220"/></w:pPr></w:style>
+</w:styles>"""
+
+
+def _docx_paragraph(text, style=None):
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{escape(str(text))}</w:t></w:r></w:p>'
+
+
+@exporter('docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'docx')
+def export_docx(ir, color='blue', **options):
+    body = [_docx_paragraph(ir['name'].upper(), 'Title')]
+    if ir['contact']:
+        body.append(_docx_paragraph(' | '.join(ir['contact']), 'Meta'))
+
+    for section in ir['sections']:
+        body.append(_docx_paragraph(section['title'], 'Heading1'))
+        if section['kind'] == 'paragraphs':
+            body += [_docx_paragraph(p) for p in section['paragraphs']]
+        elif section['kind'] == 'items':
+            body.append(_docx_paragraph(', '.join(section['items'])))
+        else:
+            for entry in section['entries']:
+                body.append(_docx_paragraph(entry['heading'], 'Heading2'))
+                meta = ' | '.join(part for part in (entry['subheading'], entry['dates']) if part)
+                if meta:
+                    body.append(_docx_paragraph(meta, 'Meta'))
+                body += [_docx_paragraph(f"• {b}", 'ListBullet') for b in entry['bullets']]
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}"><w:body>{"".join(body)}'
+        '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+        '<w:pgMar w:top="1080" w:right="1080" w:bottom="1080" w:left="1080" w:header="720" w:footer="720" w:gutter="0"/>'
+        '</w:sectPr></w:body></w:document>'
+    )
+
+    parts = {
+        '[Content_Types].xml': DOCX_CONTENT_TYPES,
+        '_rels/.rels': DOCX_RELS,
+        'word/_rels/document.xml.rels': DOCX_DOCUMENT_RELS,
+        'word/styles.xml': DOCX_STYLES % {'ns': W_NS, 'accent': _accent(color).lstrip('#').upper()},
+        'word/document.xml': document,
+    }
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as docx:
+        for name, xml in parts.items():
+            # Fixed timestamps keep the archive identical for identical content
+            docx.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), xml.encode('utf-8'),
+                          compress_type=zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
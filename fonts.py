@@ -0,0 +1,176 @@
+"""
+Font Registry
+Registers TrueType/OpenType font families once per process and shares the
+parsed fonts, and the subset glyph tables embedded in each PDF, across renders.
+
+Call preload_fonts() before worker processes are forked (app.py does it at
+import, so `gunicorn --preload app:app` shares the parsed fonts copy-on-write;
+the render pool and warm-up thread are started in each worker, not at import).
+"""
+
+import os
+import re
+from collections import OrderedDict
+from threading import Lock
+
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+
+
+# Standard PDF fonts - always available, nothing to embed
+BUILTIN_FONTS = {
+    'helvetica': ('Helvetica', 'Helvetica-Bold'),
+    'times': ('Times-Roman', 'Times-Bold'),
+    'courier': ('Courier', 'Courier-Bold'),
+}
+
+# Project fonts/ folder plus any extra folders in RESUME_FONT_DIRS (os.pathsep separated)
+FONT_DIRS = [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')] + [
+    d for d in os.getenv('RESUME_FONT_DIRS', '').split(os.pathsep) if d
+]
+
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+# Filename suffix (after the last '-') -> style
+STYLE_SUFFIXES = {
+    'regular': 'regular', 'book': 'regular', 'roman': 'regular', 'normal': 'regular',
+    'bold': 'bold', 'semibold': 'semibold', 'demibold': 'semibold',
+    'italic': 'italic', 'oblique': 'italic',
+    'bolditalic': 'boldItalic', 'boldoblique': 'boldItalic',
+}
+
+# Subset font programs, keyed by (font file, glyph subset)
+SUBSET_CACHE_SIZE = 256
+
+_families = {}          # slug -> {'label': str, 'regular': name, 'bold': name, ...}
+_subset_cache = OrderedDict()
+_lock = Lock()
+_preloaded = False
+
+
+def _slug(family):
+    return re.sub(r'[^a-z0-9]+', '_', family.lower()).strip('_')
+
+
+def discover_font_files(dirs=None):
+    """
+    Group font files into families by the `Family-Style.ttf` naming convention.
+
+    Returns:
+        dict: family name -> {style: path}
+    """
+    families = {}
+    for directory in dirs or FONT_DIRS:
+        if not os.path.isdir(directory):
+            continue
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            stem, ext = os.path.splitext(entry.name)
+            if not entry.is_file() or ext.lower() not in FONT_EXTENSIONS:
+                continue
+            family, _, suffix = stem.rpartition('-')
+            style = STYLE_SUFFIXES.get(suffix.lower().replace('_', ''))
+            if not family or style is None:
+                family, style = stem, 'regular'
+            families.setdefault(family, {}).setdefault(style, entry.path)
+    return families
+
+
+def _cached_subsets(face):
+    """Memoize a face's makeSubset so each glyph subset is only built once per process."""
+    make_subset = face.makeSubset
+
+    def make_subset_cached(subset):
+        key = (face.filename, tuple(subset))
+        with _lock:
+            data = _subset_cache.get(key)
+            if data is not None:
+                _subset_cache.move_to_end(key)
+                return data
+        data = make_subset(subset)
+        with _lock:
+            _subset_cache[key] = data
+            while len(_subset_cache) > SUBSET_CACHE_SIZE:
+                _subset_cache.popitem(last=False)
+        return data
+
+    face.makeSubset = make_subset_cached
+
+
+def _register_face(font_name, path):
+    font = TTFont(font_name, path)
+    _cached_subsets(font.face)
+    pdfmetrics.registerFont(font)
+    return font_name
+
+
+def register_family(family, styles):
+    """
+    Register one font family with ReportLab.
+
+    Args:
+        family (str): Family name, e.g. 'Inter'
+        styles (dict): style -> font file path ('regular' is required)
+
+    Returns:
+        str: The slug used as the `font_family` form value, or None if it couldn't be loaded
+    """
+    if 'regular' not in styles:
+        print(f"Skipping font family '{family}': no regular style")
+        return None
+
+    slug = _slug(family)
+    names = {}
+    try:
+        for style, path in styles.items():
+            suffix = '' if style == 'regular' else f"-{style[0].upper()}{style[1:]}"
+            names[style] = _register_face(f"{family}{suffix}", path)
+    except TTFError as e:
+        # e.g. CFF-flavoured .otf files, which ReportLab can't embed
+        print(f"Skipping font family '{family}': {e}")
+        return None
+
+    regular = names['regular']
+    bold = names.get('bold') or names.get('semibold') or regular
+    italic = names.get('italic', regular)
+    bold_italic = names.get('boldItalic', bold)
+
+    # Lets <b>/<i> markup inside Paragraphs pick the right face
+    addMapping(regular, 0, 0, regular)
+    addMapping(regular, 1, 0, bold)
+    addMapping(regular, 0, 1, italic)
+    addMapping(regular, 1, 1, bold_italic)
+
+    with _lock:
+        _families[slug] = {'label': family, 'regular': regular, 'bold': bold}
+    return slug
+
+
+def preload_fonts(dirs=None):
+    """Register every font family found in the font folders (once per process)."""
+    global _preloaded
+    if _preloaded and dirs is None:
+        return sorted(_families)
+
+    for family, styles in discover_font_files(dirs).items():
+        if _slug(family) not in _families:
+            register_family(family, styles)
+
+    if dirs is None:
+        _preloaded = True
+    return sorted(_families)
+
+
+def resolve_font(font_family):
+    """Return (base_font, bold_font) ReportLab names for a `font_family` form value."""
+    if font_family in BUILTIN_FONTS:
+        return BUILTIN_FONTS[font_family]
+    family = _families.get(font_family)
+    if family is None:
+        return BUILTIN_FONTS['helvetica']
+    return family['regular'], family['bold']
+
+
+def available_fonts():
+    """Registered custom families as (value, label) pairs for the font selectors."""
+    return [(slug, info['label']) for slug, info in sorted(_families.items())]
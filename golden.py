@@ -0,0 +1,206 @@
+"""
+Golden Renders
+Byte-for-byte regression check for the PDF renderer. Every template x accent
+color x font is rendered in deterministic mode from a fixed sample resume,
+plus an optimized and a fit-to-one-page variant of each template, and the
+SHA-256 of each PDF is compared with golden/manifest.json.
+
+Run `check` before and after any renderer or template refactor: a change
+that should not alter the output must leave every hash unchanged.
+
+Usage:
+    python golden.py check [--quick] [--pdfs DIR]    # exit 1 if any output changed
+    python golden.py check --quick --threads 8       # also catch thread-safety regressions
+    python golden.py record [--quick]                # accept the current output
+
+--pdfs writes the PDFs that differ (check) so they can be compared visually.
+--threads N renders every case N times at once (the web process renders in
+threads when the pool is off, for exports, warm-up and profiled requests);
+every copy must match the golden hash and none may raise.
+Custom fonts only take part when installed (fonts/ or RESUME_FONT_DIRS).
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import reportlab
+
+from fonts import BUILTIN_FONTS, available_fonts, preload_fonts
+from resume_templates_unique import ACCENT_COLORS, TEMPLATES, create_unique_resume
+
+
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'manifest.json')
+
+# Fixed forever: changing it changes every hash (re-record the manifest if you must)
+GOLDEN_USER = {'name': 'Zoë Müller-Ortega', 'email': 'zoe@example.com', 'phone': '+1 (555) 010-2030',
+               'location': 'San José, CA'}
+GOLDEN_RESUME = {
+    'summary': 'Staff engineer with 12 years across payments, data platforms and developer tooling — '
+               'ships reliable systems & mentors teams. Comfortable with "ambiguous" problems.',
+    'skills': ['Python', 'Go', 'PostgreSQL', 'Kafka', 'Kubernetes', 'Terraform', 'AWS', 'React',
+               'TypeScript', 'gRPC', 'Observability', 'C++', 'C#', 'Node.js'],
+    'experience': [
+        {'title': f'Senior Engineer {i}', 'company': f'Company {i} GmbH & Co.', 'period': f'{2024 - 2 * i} - {2026 - 2 * i}',
+         'achievements': [
+             f'Led migration {i} of the billing pipeline to event sourcing, cutting reconciliation time by {10 + i}%.',
+             'Designed <internal> APIs used by 40+ teams; wrote the RFC & the rollout plan.',
+             'Mentored engineers; introduced design reviews and on-call playbooks.',
+         ]}
+        for i in range(7)
+    ],
+    'education': [
+        {'degree': 'M.Sc. Computer Science', 'institution': 'Technische Universität München', 'year': '2012'},
+        {'degree': 'B.Sc. Mathematics', 'institution': 'Universidad de Costa Rica', 'year': '2010'},
+    ],
+}
+
+
+def golden_cases(quick=False):
+    """
+    Every case to render, as (case id, create_unique_resume options).
+
+    quick: each color with the default font and each font with the default color,
+    instead of every combination.
+    """
+    preload_fonts()
+    fonts = list(BUILTIN_FONTS) + [slug for slug, _ in available_fonts()]
+    for template in TEMPLATES:
+        for color in ACCENT_COLORS:
+            for font in fonts:
+                if quick and color != 'blue' and font != 'helvetica':
+                    continue
+                yield f"{template}/{color}/{font}", {'template': template, 'color': color, 'font': font}
+        yield f"{template}/blue/helvetica/optimized", {'template': template, 'optimize': True}
+        yield f"{template}/blue/helvetica/fit1", {'template': template, 'fit_pages': 1}
+
+
+def render_case(options):
+    """Deterministic PDF bytes for one case."""
+    buffer = io.BytesIO()
+    create_unique_resume(GOLDEN_RESUME, GOLDEN_USER, buffer, deterministic=True, **options)
+    return buffer.getvalue()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'reportlab': None, 'cases': {}}
+
+
+def _render_all(options, threads, executor):
+    """Render a case `threads` times at once; returns (pdf bytes list, first error or None)."""
+    if executor is None:
+        return [render_case(options)], None
+    futures = [executor.submit(render_case, options) for _ in range(threads)]
+    outputs, error = [], None
+    for future in futures:
+        try:
+            outputs.append(future.result())
+        except Exception as e:
+            error = error or f"{type(e).__name__}: {e}"
+    return outputs, error
+
+
+def check(quick=False, pdf_dir=None, path=MANIFEST_PATH, threads=1):
+    """
+    Compare every case with the manifest.
+
+    Args:
+        threads (int): Render each case this many times concurrently; every
+            copy must match (a thread-safety check for the shared caches)
+
+    Returns:
+        dict: changed, failed (raised while rendering), new (not in the
+            manifest) and missing (in the manifest but not rendered here,
+            e.g. a font that isn't installed) case ids
+    """
+    manifest = load_manifest(path)
+    golden = manifest['cases']
+    changed, failed, new, seen = [], [], [], set()
+    executor = ThreadPoolExecutor(threads) if threads > 1 else None
+    try:
+        for case, options in golden_cases(quick):
+            seen.add(case)
+            outputs, error = _render_all(options, threads, executor)
+            if error:
+                failed.append(f"{case} ({error})")
+            digests = {hashlib.sha256(data).hexdigest(): data for data in outputs}
+            if case not in golden:
+                new.append(case)
+            elif set(digests) - {golden[case]}:
+                changed.append(case)
+                if pdf_dir:
+                    for data in digests.values():
+                        _write_pdf(pdf_dir, case, data)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    missing = [case for case in golden if case not in seen and not (quick and _quick_skips(case))]
+    return {'changed': changed, 'failed': failed, 'new': new, 'missing': missing, 'checked': len(seen),
+            'reportlab': manifest['reportlab']}
+
+
+def _quick_skips(case):
+    parts = case.split('/')
+    return len(parts) == 3 and parts[1] != 'blue' and parts[2] != 'helvetica'
+
+
+def record(quick=False, path=MANIFEST_PATH):
+    """Render every case and store its hash (cases not rendered this time are kept)."""
+    manifest = load_manifest(path)
+    for case, options in golden_cases(quick):
+        manifest['cases'][case] = hashlib.sha256(render_case(options)).hexdigest()
+    manifest['reportlab'] = reportlab.Version
+    manifest['cases'] = dict(sorted(manifest['cases'].items()))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+        f.write('\n')
+    return len(manifest['cases'])
+
+
+def _write_pdf(pdf_dir, case, data):
+    os.makedirs(pdf_dir, exist_ok=True)
+    with open(os.path.join(pdf_dir, case.replace('/', '_') + '.pdf'), 'wb') as f:
+        f.write(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['check', 'record'])
+    parser.add_argument('--quick', action='store_true', help='Each color and each font once per template')
+    parser.add_argument('--pdfs', help='Write changed PDFs here (check)')
+    parser.add_argument('--threads', type=int, default=1, help='Render each case this many times at once (check)')
+    parser.add_argument('--manifest', default=MANIFEST_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        count = record(args.quick, args.manifest)
+        print(f"Recorded {count} golden hashes in {args.manifest}")
+        return 0
+
+    result = check(args.quick, args.pdfs, args.manifest, args.threads)
+    if result['reportlab'] and result['reportlab'] != reportlab.Version:
+        print(f"Note: manifest recorded with ReportLab {result['reportlab']}, running {reportlab.Version}")
+    for case in result['changed']:
+        print(f"CHANGED  {case}")
+    for case in result['failed']:
+        print(f"FAILED   {case}")
+    for case in result['new']:
+        print(f"NEW      {case} (not in the manifest - record to accept)")
+    for case in result['missing']:
+        print(f"SKIPPED  {case} (not rendered here - font not installed?)")
+    print(f"{result['checked']} cases checked: {len(result['changed'])} changed, "
+          f"{len(result['failed'])} failed, {len(result['new'])} new")
+    return 1 if result['changed'] or result['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+HTTP Caching
+Serves rendered PDFs, which never change once written, with content-hash
+ETags and immutable cache headers.
+
+Werkzeug handles If-None-Match (304) and Range (206) requests against the
+ETag, so the browser's PDF viewer can load a preview progressively and an
+edit-page reload doesn't refetch it. With gzip enabled, a precompressed
+`.gz` sibling is built once per file and sent to clients that accept it.
+"""
+
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+from werkzeug.exceptions import NotFound
+
+
+ONE_YEAR = 365 * 24 * 3600
+
+# Content hashes, keyed by path and invalidated by (mtime, size)
+ETAG_CACHE_SIZE = 1024
+
+_etags = OrderedDict()
+_lock = Lock()
+
+
+def content_etag(path):
+    """SHA-256 based ETag of a file's content (cached until the file changes)."""
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _etags.get(path)
+        if cached is not None and cached[0] == version:
+            _etags.move_to_end(path)
+            return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    etag = digest.hexdigest()[:32]
+
+    with _lock:
+        _etags[path] = (version, etag)
+        while len(_etags) > ETAG_CACHE_SIZE:
+            _etags.popitem(last=False)
+    return etag
+
+
+def _gzipped(path):
+    """Path of the precompressed copy of `path`, building it on first use."""
+    gz_path = path + '.gz'
+    if not os.path.exists(gz_path) or os.path.getmtime(gz_path) < os.path.getmtime(path):
+        tmp_path = f"{gz_path}.{os.getpid()}.tmp"
+        with open(path, 'rb') as src, open(tmp_path, 'wb') as raw:
+            # mtime=0 keeps the .gz bytes identical for identical PDFs
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) as dst:
+                dst.write(src.read())
+        os.replace(tmp_path, gz_path)
+    return gz_path
+
+
+def send_immutable(directory, filename, as_attachment=False, allow_gzip=False, download_name=None):
+    """
+    send_from_directory for files that never change once written.
+
+    Args:
+        directory (str): Folder the file lives in
+        filename (str): File name (from the URL - checked by safe_join)
+        as_attachment (bool): Download instead of displaying inline
+        download_name (str): Name the browser saves it as (default: filename)
+        allow_gzip (bool): Send a precompressed copy to clients that accept gzip
+            (full responses only - ranges are always served from the original)
+
+    Returns:
+        Response: 200, 206 or 304 with ETag and Cache-Control: immutable
+
+    Raises:
+        NotFound: the file doesn't exist
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    etag = content_etag(path)
+    send_name, encoding = filename, None
+    if allow_gzip and 'Range' not in request.headers and 'gzip' in request.accept_encodings:
+        send_name, encoding = os.path.basename(_gzipped(path)), 'gzip'
+        etag += '-gz'
+
+    response = send_from_directory(
+        directory, send_name, as_attachment=as_attachment, download_name=download_name or filename,
+        mimetype='application/pdf' if filename.endswith('.pdf') else None,
+        etag=etag, max_age=ONE_YEAR, conditional=True,
+    )
+    response.cache_control.immutable = True
+    if allow_gzip:
+        response.vary.add('Accept-Encoding')
+    if encoding and response.status_code == 200:
+        response.content_encoding = encoding
+    return response
@@ -0,0 +1,181 @@
+"""
+Job Description Matcher
+Local, LLM-free keyword/TF-IDF pre-pass used to rank the candidate's skills
+and experience against a job description before anything is sent to the LLM.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+
+
+# Keeps tech-style tokens intact: c++, c#, node.js, .net
+TOKEN_PATTERN = r"(?u)[a-z0-9.][a-z0-9+#.-]*[a-z0-9+#]|[a-z]"
+
+# Words that show up in nearly every job posting and say nothing about the role
+JOB_POSTING_STOP_WORDS = {
+    'ability', 'able', 'across', 'including', 'experience', 'experienced', 'years', 'year',
+    'strong', 'excellent', 'good', 'great', 'work', 'working', 'team', 'teams', 'role',
+    'required', 'requirements', 'preferred', 'plus', 'responsibilities', 'candidate',
+    'company', 'join', 'looking', 'knowledge', 'skills', 'skill', 'understanding', 'using',
+    'etc', 'e.g', 'i.e', 'must', 'will', 'new', 'help', 'opportunity', 'position', 'job',
+    'needed', 'seeking', 'ideal', 'proven', 'familiarity', 'solid', 'hands-on',
+}
+
+STOP_WORDS = frozenset(ENGLISH_STOP_WORDS) | JOB_POSTING_STOP_WORDS
+
+# Job descriptions shorter than this are passed to the LLM untouched
+CONDENSE_THRESHOLD = 1200
+
+
+def tokenize(text):
+    """Lowercase and split text into keyword tokens, dropping stop words."""
+    tokens = re.findall(TOKEN_PATTERN, (text or '').lower())
+    return [t for t in tokens if t not in STOP_WORDS and any(c.isalpha() for c in t)]
+
+
+def split_segments(text):
+    """Split free text into lines/sentences that can be scored on their own."""
+    segments = []
+    for line in (text or '').splitlines():
+        line = line.strip(' \t-•*▸→')
+        if not line:
+            continue
+        segments.extend(s.strip() for s in re.split(r'(?<=[.!?;])\s+', line) if s.strip())
+    return segments
+
+
+def split_skills(skills):
+    """Normalize skills given either as a list or a comma-separated string."""
+    if isinstance(skills, str):
+        skills = re.split(r'[,;\n]', skills)
+    return [s.strip() for s in (skills or []) if s and s.strip()]
+
+
+class JobIndex:
+    """Precomputed TF-IDF feature index for a single job description"""
+
+    def __init__(self, job_description, max_keywords=25):
+        self.job_description = job_description or ''
+        self.segments = split_segments(self.job_description) or [self.job_description]
+
+        # Each line/sentence of the posting is a "document" so IDF rewards
+        # terms that are concentrated in a few requirements
+        self.vectorizer = TfidfVectorizer(
+            tokenizer=tokenize,
+            token_pattern=None,
+            lowercase=False,
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+        )
+        try:
+            self.segment_matrix = self.vectorizer.fit_transform(self.segments)
+        except ValueError:
+            # Empty vocabulary - the posting is only stop words
+            self.segment_matrix = None
+            self.vocabulary = np.array([], dtype=object)
+            self.job_vector = np.zeros(0)
+            self.keywords = []
+            return
+
+        self.vocabulary = self.vectorizer.get_feature_names_out()
+        job_vector = np.asarray(self.segment_matrix.sum(axis=0)).ravel()
+        norm = np.linalg.norm(job_vector)
+        self.job_vector = job_vector / norm if norm else job_vector
+
+        # Bigrams help ranking, but single terms make clearer keywords
+        unigram = np.array([' ' not in term for term in self.vocabulary])
+        weights = np.where(unigram, self.job_vector, 0.0)
+        top = np.argsort(-weights)[:max_keywords]
+        self.keywords = [(self.vocabulary[i], float(weights[i])) for i in top if weights[i] > 0]
+
+    def score_items(self, items):
+        """Cosine relevance of each item against the job description (0-1)."""
+        if not items or self.segment_matrix is None:
+            return np.zeros(len(items or []))
+        matrix = self.vectorizer.transform(items)
+        return np.asarray(matrix @ self.job_vector).ravel()
+
+    def rank(self, items):
+        """Return (item, score) pairs sorted by relevance, most relevant first."""
+        scores = self.score_items(items)
+        order = np.argsort(-scores, kind='stable')
+        return [(items[i], float(scores[i])) for i in order]
+
+    def coverage(self, candidate_texts):
+        """Split keywords into those found in the candidate's text and those missing."""
+        present = set(tokenize(' '.join(candidate_texts)))
+
+        matched, missing = [], []
+        for term, weight in self.keywords:
+            (matched if term in present else missing).append((term, weight))
+        return matched, missing
+
+    def match_score(self, candidate_texts):
+        """Weighted share of the job's keywords covered by the candidate, 0-100."""
+        matched, missing = self.coverage(candidate_texts)
+        total = sum(w for _, w in matched) + sum(w for _, w in missing)
+        if not total:
+            return 0.0
+        return round(100.0 * sum(w for _, w in matched) / total, 1)
+
+    def condensed_description(self, max_segments=12):
+        """Keep only the most keyword-dense lines of a long posting, in original order."""
+        if len(self.job_description) <= CONDENSE_THRESHOLD or self.segment_matrix is None:
+            return self.job_description
+        scores = np.asarray(self.segment_matrix @ self.job_vector).ravel()
+        keep = sorted(np.argsort(-scores)[:max_segments])
+        return '\n'.join(f"- {self.segments[i]}" for i in keep)
+
+
+@lru_cache(maxsize=64)
+def get_job_index(job_description):
+    """Build (or reuse) the feature index for a job description."""
+    return JobIndex(job_description)
+
+
+def analyze_match(job_description, skills, experience_lines):
+    """
+    Rank the candidate's skills and experience lines against a job description.
+
+    Args:
+        job_description (str): The job posting or description
+        skills (list|str): Candidate skills, list or comma-separated
+        experience_lines (list): Experience lines / achievements
+
+    Returns:
+        dict: score, ranked skills and experience, matched and missing keywords
+    """
+    index = get_job_index(job_description or '')
+    skills = split_skills(skills)
+    experience_lines = [line for line in (experience_lines or []) if line and line.strip()]
+
+    matched, missing = index.coverage(skills + experience_lines)
+
+    return {
+        'score': index.match_score(skills + experience_lines),
+        'skills': index.rank(skills),
+        'experience': index.rank(experience_lines),
+        'keywords': [term for term, _ in index.keywords],
+        'matched_keywords': [term for term, _ in matched],
+        'missing_keywords': [term for term, _ in missing],
+    }
+
+
+def analyze_user_info(job_description, user_info):
+    """Match report for the raw form input sent to /generate."""
+    experience_lines = split_segments(user_info.get('experience')) + split_segments(user_info.get('background'))
+    return analyze_match(job_description, user_info.get('skills'), experience_lines)
+
+
+def analyze_resume_data(job_description, resume_data):
+    """Match report for generated (or edited) resume content shown in the editor."""
+    experience_lines = []
+    if resume_data.get('summary'):
+        experience_lines.extend(split_segments(resume_data['summary']))
+    for exp in resume_data.get('experience', []):
+        experience_lines.append(exp.get('title', ''))
+        experience_lines.extend(exp.get('achievements', []))
+    return analyze_match(job_description, resume_data.get('skills', []), experience_lines)
@@ -0,0 +1,170 @@
+"""
+Section Layout Cache
+Reuses built and wrapped flowables for resume sections whose content hasn't
+changed, so a regenerate only re-lays-out the sections that were edited.
+"""
+
+import copy
+import json
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+from reportlab.platypus.flowables import Flowable
+from reportlab.platypus.tables import Table
+
+
+def content_key(*parts):
+    """Stable hash of JSON-compatible section content and render parameters."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _clone(flowable):
+    """
+    Per-render copy of a wrapped flowable, down to the flowables nested in it.
+
+    Layout results (line breaks, row heights) stay shared read-only, but every
+    flowable that gets drawn is this render's own: drawOn sets and deletes
+    .canv on the object it draws, so two renders must never draw the same one.
+    """
+    clone = copy.copy(flowable)
+    if isinstance(flowable, Table):
+        clone._cellvalues = [[_clone_cell(value) for value in row] for row in flowable._cellvalues]
+    return clone
+
+
+def _clone_cell(value):
+    if isinstance(value, Flowable):
+        return _clone(value)
+    if isinstance(value, (list, tuple)):
+        return [_clone_cell(item) for item in value]
+    return value
+
+
+class _Slot:
+    """One cached flowable: a wrapped prototype plus the size it measured"""
+    __slots__ = ('flowable', 'width', 'size')
+
+    def __init__(self, flowable):
+        self.flowable = flowable
+        self.width = None   # width the prototype was last wrapped at
+        self.size = None
+
+
+class MeasuredFlowable(Flowable):
+    """Wraps a cached flowable and reuses its measured size for the same frame width.
+
+    Every render gets its own copy of the cached prototype (see _clone), so
+    the layout state set by wrap (line breaks, row heights) is shared read-only
+    and page-break decisions use the cached height without re-wrapping.
+    """
+
+    def __init__(self, slot, lock):
+        # Flowable.__init__ is skipped on purpose: hAlign and friends must
+        # come from the wrapped flowable, not the wrapper's defaults
+        self.width = self.height = 0
+        self._slot = slot
+        self._lock = lock
+        with lock:
+            self.inner = _clone(slot.flowable)
+            self._warm_width = slot.width
+            self._warm_size = slot.size
+
+    def __getattr__(self, name):
+        # Anything platypus looks up that we don't override (hAlign, _ZEROSIZE, ...)
+        inner = self.__dict__.get('inner')
+        if inner is None:
+            raise AttributeError(name)
+        return getattr(inner, name)
+
+    def wrap(self, availWidth, availHeight):
+        if self._warm_width == availWidth:
+            self.width, self.height = self._warm_size
+            return self._warm_size
+
+        size = self.inner.wrapOn(getattr(self, 'canv', None), availWidth, availHeight)
+        with self._lock:
+            self._slot.flowable = _clone(self.inner)
+            self._slot.width = availWidth
+            self._slot.size = size
+        self._warm_width, self._warm_size = availWidth, size
+        self.width, self.height = size
+        return size
+
+    def splitOn(self, canv, aW, aH):
+        return self._split_result(self.inner.splitOn(canv, aW, aH))
+
+    def split(self, availWidth, availHeight):
+        return self._split_result(self.inner.split(availWidth, availHeight))
+
+    def _split_result(self, parts):
+        # A refused split can discard layout state (Paragraph drops blPara),
+        # so the next wrap on the following page must really re-wrap
+        if not parts:
+            self._warm_width = None
+        return parts
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        self.inner.drawOn(canvas, x, y, _sW)
+
+    def getSpaceBefore(self):
+        return self.inner.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.inner.getSpaceAfter()
+
+    def getKeepWithNext(self):
+        return self.inner.getKeepWithNext()
+
+    def identity(self, maxLen=None):
+        return self.inner.identity(maxLen)
+
+
+class SectionCache:
+    """LRU cache of section flowables keyed by a hash of the section's content"""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def section(self, key_parts, builder):
+        """
+        Return flowables for a section, building them only if its content changed.
+
+        Args:
+            key_parts (tuple): Everything the section's appearance depends on
+                (template, color, font, section name and its content)
+            builder (callable): Returns the section's list of flowables
+
+        Returns:
+            list: Fresh MeasuredFlowable wrappers, safe to hand to doc.build
+        """
+        key = content_key(*key_parts)
+        with self._lock:
+            slots = self._entries.get(key)
+            if slots is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if slots is None:
+            slots = [_Slot(f) for f in builder()]
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = slots
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        return [MeasuredFlowable(slot, self._lock) for slot in slots]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Shared by all templates in this process
+SECTION_CACHE = SectionCache()
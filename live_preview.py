@@ -0,0 +1,98 @@
+"""
+Live Preview
+Re-renders the editor's preview over a WebSocket while fields are edited.
+
+The editor sends each field edit as JSON Patch operations against a per-
+connection draft. Edits are debounced server-side and renders run as
+background tasks, one at a time per draft: a render whose draft has been
+edited again before it starts is skipped, and one superseded while running
+is dropped, so only the latest preview is ever pushed.
+"""
+
+import time
+from threading import Lock
+
+from draft_diff import PatchError, apply_patch
+
+
+DEBOUNCE_SECONDS = 0.15
+
+
+class _Draft:
+    """One editor connection's working copy"""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.generation = 0         # bumped on every edit
+        self.render_lock = Lock()   # one render at a time per draft
+
+
+class LivePreview:
+    """
+    Debounced background re-rendering for live preview connections.
+
+    Args:
+        socketio (SocketIO): Used to start background tasks and push results
+        render (callable): render(doc) -> dict payload for the 'preview' event
+        validate (callable): validate(doc, patch) raising on a bad edit, which is
+            then not applied; None accepts any patch that applies
+        debounce (float): Seconds without edits before a render starts
+    """
+
+    def __init__(self, socketio, render, validate=None, debounce=DEBOUNCE_SECONDS, namespace='/preview'):
+        self.socketio = socketio
+        self.render = render
+        self.validate = validate
+        self.debounce = debounce
+        self.namespace = namespace
+        self._drafts = {}
+        self._lock = Lock()
+
+    def open(self, sid, doc):
+        """Start tracking a connection's draft (doc: the JSON document edits are applied to)."""
+        with self._lock:
+            self._drafts[sid] = _Draft(doc)
+
+    def close(self, sid):
+        with self._lock:
+            self._drafts.pop(sid, None)
+
+    def edit(self, sid, patch):
+        """
+        Apply a connection's edits and schedule a re-render.
+
+        Raises:
+            PatchError: If the patch doesn't apply to the draft
+            Anything `validate` raises; the draft is left unchanged
+        """
+        with self._lock:
+            draft = self._drafts.get(sid)
+            if draft is None:
+                raise PatchError('No live preview draft for this connection')
+            doc = apply_patch(draft.doc, patch)
+            if self.validate is not None:
+                self.validate(doc, patch)
+            draft.doc = doc
+            draft.generation += 1
+            generation = draft.generation
+        self.socketio.start_background_task(self._render_latest, sid, draft, generation, doc, time.perf_counter())
+
+    def _render_latest(self, sid, draft, generation, doc, edited_at):
+        self.socketio.sleep(self.debounce)
+        with draft.render_lock:
+            if draft.generation != generation:
+                return      # edited again while waiting - a newer task will render
+            start = time.perf_counter()
+            try:
+                payload = self.render(doc)
+            except Exception as e:
+                if draft.generation == generation:
+                    self.socketio.emit('preview_error', {'error': str(e), 'generation': generation},
+                                       to=sid, namespace=self.namespace)
+                return
+            if draft.generation != generation:
+                return      # superseded while rendering
+        now = time.perf_counter()
+        payload = dict(payload, generation=generation, render_ms=round((now - start) * 1000, 1),
+                       latency_ms=round((now - edited_at) * 1000, 1))
+        self.socketio.emit('preview', payload, to=sid, namespace=self.namespace)
@@ -0,0 +1,262 @@
+"""
+Candidate Profile Store
+Parses a candidate's background once into a structured profile with
+precomputed TF-IDF vectors for each achievement, stored alongside their
+resumes, so each new job only needs a top-k lookup instead of resending
+(and re-reading) their whole history.
+
+Vectors use feature hashing, so a profile needs no stored vocabulary and
+any job's keywords can be projected into the same space. A profile is
+rebuilt only when the background text it was parsed from changes.
+"""
+
+import hashlib
+import io
+import json
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sqlalchemy import DateTime, Integer, LargeBinary, String, JSON, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from job_matcher import get_job_index, split_segments, split_skills, tokenize
+from resume_import import parse_experience
+from resume_store import Base, get_session, user_key_for
+
+
+# Achievements sent to the LLM for each job, per experience entry
+TOP_K = 3
+
+HASH_FEATURES = 2 ** 20
+
+# Fields the profile is parsed from; a change to any of them rebuilds it
+SOURCE_FIELDS = ('background', 'skills', 'experience', 'education')
+
+# Bumped when parse_profile's output changes, so stored profiles are re-parsed
+PARSER_VERSION = 2
+
+PROFILE_CACHE_SIZE = 128
+
+
+def _terms(text):
+    """Unigrams and bigrams, matching the JobIndex vocabulary (ngram_range=(1, 2))."""
+    tokens = tokenize(text)
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+# Profile text -> hashed term counts, and single JobIndex terms -> their hashed feature
+_text_hasher = HashingVectorizer(analyzer=_terms, n_features=HASH_FEATURES, alternate_sign=False, norm=None)
+_term_hasher = HashingVectorizer(analyzer=lambda term: [term], n_features=HASH_FEATURES,
+                                 alternate_sign=False, norm=None)
+
+
+class CandidateProfile(Base):
+    """A candidate's parsed history and achievement vectors, one per user"""
+    __tablename__ = 'candidate_profiles'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_key: Mapped[str] = mapped_column(String(255), unique=True)
+    source_hash: Mapped[str] = mapped_column(String(64))
+    structured: Mapped[dict] = mapped_column(JSON)
+    vectors: Mapped[bytes] = mapped_column(LargeBinary)     # CSR matrix (.npz), one row per achievement
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class Profile:
+    """Loaded profile: structured history plus its L2-normalized achievement vectors"""
+
+    def __init__(self, user_key, source_hash, structured, vectors):
+        self.user_key = user_key
+        self.source_hash = source_hash
+        self.structured = structured
+        self.vectors = vectors
+
+    @property
+    def skills(self):
+        return self.structured['skills']
+
+    @property
+    def achievements(self):
+        return self.structured['achievements']
+
+    @property
+    def experience(self):
+        return self.structured['experience']
+
+    def _scores(self, job_description):
+        """Cosine similarity of each achievement to the job, or None if the job has no keywords."""
+        if not self.achievements:
+            return None
+        index = get_job_index(job_description or '')
+        if not index.keywords:
+            return None
+        # The job's TF-IDF vector, moved into the hashed feature space
+        job_vector = sparse.csr_matrix(index.job_vector) @ _term_hasher.transform(index.vocabulary)
+        return (self.vectors @ job_vector.T).toarray().ravel()
+
+    def top_achievements(self, job_description, k=TOP_K):
+        """
+        Each experience entry with its k achievements most relevant to a job.
+
+        Returns:
+            list: (entry header {title, company, period} or None for lines not
+                under a job, [(achievement dict, score)]) in the history's own
+                order; achievements that share no terms with the job are left
+                out, and so is the None group when none of its lines match
+        """
+        scores = self._scores(job_description)
+        if scores is None or not (scores > 0).any():
+            return []
+        groups = []
+        for entry in list(range(len(self.experience))) + [None]:
+            members = [i for i, achievement in enumerate(self.achievements) if achievement['entry'] == entry]
+            top = sorted(i for i in sorted(members, key=lambda i: -scores[i])[:k] if scores[i] > 0)
+            if entry is not None or top:
+                header = self.experience[entry] if entry is not None else None
+                groups.append((header, [(self.achievements[i], float(scores[i])) for i in top]))
+        return groups
+
+    def prompt_info(self, job_description, user_info, k=TOP_K):
+        """
+        user_info for the prompt with each job cut down to its top-k achievements for this job.
+
+        Every job header (title, company, dates) is kept, so achievements stay
+        under the employer they belong to. Falls back to the full text when
+        nothing in the history matches the job.
+        """
+        groups = self.top_achievements(job_description, k)
+        if not groups:
+            return user_info
+        lines = []
+        for header, top in groups:
+            if header is not None:
+                lines.append(_header_line(header))
+            lines += [f"- {achievement['text']}" for achievement, _ in top]
+        info = dict(user_info)
+        info['experience'] = ''.join(f"\n{line}" for line in lines)
+        info['background'] = self.structured['background']
+        return info
+
+
+def _header_line(header):
+    line = ' at '.join(filter(None, [header['title'], header['company']]))
+    return f"{line} ({header['period']})" if header['period'] else line
+
+
+def source_hash_for(user_info):
+    """Hash of the text a profile is parsed from."""
+    source = {field: user_info.get(field) or '' for field in SOURCE_FIELDS}
+    source['parser'] = PARSER_VERSION
+    payload = json.dumps(source, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def parse_profile(user_info):
+    """
+    Structure a candidate's free-text background.
+
+    Returns:
+        dict: skills (list), experience (job headers [{title, company, period}]),
+            achievements ([{'text', 'entry'}], entry indexing experience, or None
+            for lines not under a job), education (list of lines) and
+            background (first sentences, for the prompt)
+    """
+    entries, loose = parse_experience(user_info.get('experience'))
+    achievements = [{'text': text, 'entry': i} for i, entry in enumerate(entries) for text in entry['achievements']]
+    achievements += [{'text': text, 'entry': None} for line in loose for text in split_segments(line)]
+    background = split_segments(user_info.get('background'))
+    return {
+        'skills': split_skills(user_info.get('skills')),
+        'experience': [{field: entry[field] for field in ('title', 'company', 'period')} for entry in entries],
+        'achievements': achievements,
+        'education': split_segments(user_info.get('education')),
+        'background': ' '.join(background[:2]),
+    }
+
+
+def _vectorize(achievements):
+    """Sublinear TF-IDF over the candidate's own achievements, L2-normalized per row."""
+    texts = [achievement['text'] for achievement in achievements]
+    if not texts:
+        return sparse.csr_matrix((0, HASH_FEATURES))
+    counts = _text_hasher.transform(texts)
+    return TfidfTransformer(sublinear_tf=True).fit_transform(counts).tocsr()
+
+
+def _dump_matrix(matrix):
+    buffer = io.BytesIO()
+    sparse.save_npz(buffer, matrix)
+    return buffer.getvalue()
+
+
+def _load_matrix(data):
+    return sparse.load_npz(io.BytesIO(data)).tocsr()
+
+
+_profiles = OrderedDict()
+_profiles_lock = Lock()
+_table_ready = False
+
+
+def _session():
+    global _table_ready
+    db = get_session()
+    if not _table_ready:
+        # The resume tables may have been created before this module was imported
+        CandidateProfile.__table__.create(bind=db.get_bind(), checkfirst=True)
+        _table_ready = True
+    return db
+
+
+def _remember(profile):
+    with _profiles_lock:
+        _profiles[profile.user_key] = profile
+        _profiles.move_to_end(profile.user_key)
+        while len(_profiles) > PROFILE_CACHE_SIZE:
+            _profiles.popitem(last=False)
+
+
+def get_profile(user_info):
+    """
+    Load the candidate's profile, parsing and storing it first if their background changed.
+
+    Args:
+        user_info (dict): The form input (name/email identify the candidate)
+
+    Returns:
+        Profile: Structured history and achievement vectors
+    """
+    user_key = user_key_for(user_info)
+    source_hash = source_hash_for(user_info)
+    with _profiles_lock:
+        cached = _profiles.get(user_key)
+    if cached is not None and cached.source_hash == source_hash:
+        return cached
+
+    with _session() as db:
+        row = db.scalars(select(CandidateProfile).where(CandidateProfile.user_key == user_key)).first()
+        if row is not None and row.source_hash == source_hash:
+            profile = Profile(user_key, source_hash, row.structured, _load_matrix(row.vectors))
+        else:
+            structured = parse_profile(user_info)
+            vectors = _vectorize(structured['achievements'])
+            if row is None:
+                row = CandidateProfile(user_key=user_key)
+                db.add(row)
+            row.source_hash = source_hash
+            row.structured = structured
+            row.vectors = _dump_matrix(vectors)
+            row.updated_at = datetime.now()
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another request stored this user's first profile at the same time
+                db.rollback()
+            profile = Profile(user_key, source_hash, structured, vectors)
+
+    _remember(profile)
+    return profile
@@ -0,0 +1,270 @@
+"""
+Request Profiling
+Opt-in sampling profiler for single requests. A sampler thread reads the
+request thread's stack every few milliseconds (sys._current_frames), so
+the profiled code runs unmodified; each sample is filed under the phase the
+request was in - llm_wait, json_parse, flowables, doc_build - marked with
+phase() around those steps.
+
+Profiles are saved as speedscope JSON (https://www.speedscope.app) and as
+collapsed stacks (flamegraph.pl / inferno), for download.
+
+Safe to leave available in production: the sampling interval has a floor,
+each profile stops sampling after PROFILE_MAX_SECONDS or
+PROFILE_MAX_SAMPLES, only PROFILE_MAX_CONCURRENT requests are profiled at
+once (others just run normally), and old profiles are pruned. The time the
+sampler itself spent is recorded with each profile.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Event, Thread, get_ident
+
+
+PROFILE_DIR = os.getenv('RESUME_PROFILE_DIR', 'profiles')
+PROFILE_INTERVAL_MS = max(float(os.getenv('RESUME_PROFILE_INTERVAL_MS', 5)), 1.0)   # 1 ms floor
+PROFILE_MAX_SECONDS = float(os.getenv('RESUME_PROFILE_MAX_SECONDS', 60))
+PROFILE_MAX_SAMPLES = int(os.getenv('RESUME_PROFILE_MAX_SAMPLES', 20000))
+PROFILE_MAX_CONCURRENT = int(os.getenv('RESUME_PROFILE_MAX_CONCURRENT', 2))
+PROFILE_KEEP = int(os.getenv('RESUME_PROFILE_KEEP', 200))                          # files per format
+
+MAX_DEPTH = 128
+OTHER_PHASE = 'other'
+
+# Profiles saved as <id>.speedscope.json and <id>.folded
+FORMATS = {
+    'speedscope': ('.speedscope.json', 'application/json'),
+    'folded': ('.folded', 'text/plain'),
+}
+
+# Thread id -> running Profile; read by phase() on every call, so keep it a plain dict
+_active = {}
+_slots = BoundedSemaphore(PROFILE_MAX_CONCURRENT)
+
+
+class Profile:
+    """Samples one thread's stack until stopped"""
+
+    def __init__(self, name, thread_id=None, interval_ms=PROFILE_INTERVAL_MS):
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.thread_id = thread_id or get_ident()
+        self.interval = max(interval_ms, 1.0) / 1000
+        self.phase = OTHER_PHASE
+        self.phase_ms = Counter()       # wall time per phase, from phase() enter/exit
+        self.samples = []               # (phase, stack root-first, weight in seconds)
+        self.truncated = False
+        self.overhead_s = 0.0
+        self.started = self.stopped = None
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        _active[self.thread_id] = self
+        self._thread = Thread(target=self._sample_loop, name=f'profiler-{self.id}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self.stopped is not None:
+            return self
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+        _active.pop(self.thread_id, None)
+        return self
+
+    @property
+    def duration_ms(self):
+        return ((self.stopped or time.perf_counter()) - self.started) * 1000
+
+    def _sample_loop(self):
+        last = time.perf_counter()
+        deadline = last + PROFILE_MAX_SECONDS
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            if now > deadline or len(self.samples) >= PROFILE_MAX_SAMPLES:
+                self.truncated = True
+                return
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.samples.append((self.phase, _stack(frame), now - last))
+            del frame
+            last = now
+            self.overhead_s += time.perf_counter() - now
+
+    def collapsed(self):
+        """Collapsed stacks ("phase;outer;...;inner count"), weighted by sample count."""
+        counts = Counter()
+        for phase, stack, _ in self.samples:
+            counts[';'.join([phase] + [_frame_label(frame) for frame in stack])] += 1
+        return ''.join(f"{line} {count}\n" for line, count in sorted(counts.items()))
+
+    def speedscope(self):
+        """speedscope sampled profile; each phase is a root frame, weights in milliseconds."""
+        frames, index = [], {}
+
+        def frame_index(frame):
+            if frame not in index:
+                index[frame] = len(frames)
+                name, filename, line = frame
+                frames.append({'name': name, 'file': filename, 'line': line} if filename else {'name': name})
+            return index[frame]
+
+        samples, weights = [], []
+        for phase, stack, weight in self.samples:
+            samples.append([frame_index((phase, None, None))] + [frame_index(frame) for frame in stack])
+            weights.append(round(weight * 1000, 3))
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': self.name,
+            'exporter': 'resume-builder profiling',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': self.name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': round(sum(weights), 3),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+
+    def summary(self):
+        """Per-phase wall times and sample counts, plus the sampler's own overhead."""
+        sampled = Counter(phase for phase, _, _ in self.samples)
+        return {
+            'id': self.id,
+            'name': self.name,
+            'duration_ms': round(self.duration_ms, 2),
+            'interval_ms': round(self.interval * 1000, 2),
+            'samples': len(self.samples),
+            'truncated': self.truncated,
+            'overhead_ms': round(self.overhead_s * 1000, 2),
+            'phase_ms': {phase: round(ms, 2) for phase, ms in self.phase_ms.items()},
+            'phase_samples': dict(sampled),
+        }
+
+    def save(self, directory=PROFILE_DIR):
+        """
+        Write the profile in every format.
+
+        Returns:
+            dict: format -> file path
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {fmt: os.path.join(directory, self.id + suffix) for fmt, (suffix, _) in FORMATS.items()}
+        with open(paths['speedscope'], 'w', encoding='utf-8') as f:
+            json.dump(self.speedscope(), f, separators=(',', ':'))
+        with open(paths['folded'], 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+        _prune(directory)
+        return paths
+
+
+def _stack(frame):
+    """(function, file, first line) per frame, outermost first."""
+    stack = []
+    while frame is not None and len(stack) < MAX_DEPTH:
+        code = frame.f_code
+        stack.append((getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _frame_label(frame):
+    name, filename, _ = frame
+    # ';' separates frames and ' ' the count in the collapsed format
+    return f"{name} ({os.path.basename(filename)})".replace(';', ':').replace(' ', '_')
+
+
+def _prune(directory, keep=PROFILE_KEEP):
+    for suffix, _ in FORMATS.values():
+        files = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(suffix)]
+        files.sort(key=os.path.getmtime)
+        for path in files[:-keep] if keep else []:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+@contextmanager
+def phase(name):
+    """
+    Mark a step of the current request (no-op unless it's being profiled).
+
+    Samples taken inside are filed under `name`, and its wall time is recorded.
+    Phases nest; the innermost one wins.
+    """
+    profile = _active.get(get_ident())
+    if profile is None:
+        yield
+        return
+    outer, profile.phase = profile.phase, name
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.phase_ms[name] += (time.perf_counter() - start) * 1000
+        profile.phase = outer
+
+
+def active():
+    """The running profile for the current thread, or None."""
+    return _active.get(get_ident())
+
+
+def start_profile(name):
+    """
+    Start profiling the current thread.
+
+    Returns:
+        Profile: The running profile, or None when PROFILE_MAX_CONCURRENT
+            profiles are already running (the request just isn't profiled)
+    """
+    if get_ident() in _active or not _slots.acquire(blocking=False):
+        return None
+    try:
+        return Profile(name).start()
+    except Exception:
+        _slots.release()
+        raise
+
+
+def finish_profile(profile, directory=PROFILE_DIR):
+    """
+    Stop a profile from start_profile and save it.
+
+    Returns:
+        dict: The profile's summary
+    """
+    try:
+        profile.stop()
+    finally:
+        _slots.release()
+    profile.save(directory)
+    return profile.summary()
+
+
+def profile_path(profile_id, fmt, directory=PROFILE_DIR):
+    """
+    Saved profile file for download.
+
+    Returns:
+        tuple: (path, mimetype), or None if the id/format is unknown or the file is gone
+    """
+    if fmt not in FORMATS or not profile_id.isalnum():
+        return None
+    suffix, mimetype = FORMATS[fmt]
+    path = os.path.join(directory, profile_id + suffix)
+    return (path, mimetype) if os.path.exists(path) else None
@@ -0,0 +1,302 @@
+"""
+LLM Rate Limiter
+Token-bucket scheduling of OpenAI calls with global and per-API-key limits on
+both requests per minute and tokens per minute. The server's own key is only
+held to the global limits; keys users bring get the per-key limits too.
+
+Each call estimates its tokens up front (prompt + max completion, as OpenAI
+counts them against TPM) and waits for budget instead of failing with a 429.
+Waiting calls are served most urgent priority class first (see scheduler;
+they age up the same way), then round-robin across users (not keys), so one
+busy user sharing the server key can't starve everyone else, and a throttled
+key serves editor work before batch work. The estimate is settled against
+the real usage once the response arrives.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict, deque
+from threading import Condition
+
+from scheduler import AGING_SECONDS, PRIORITIES, current_priority
+
+
+# Server-wide limits (all keys together) and limits for each API key other than the server's
+GLOBAL_RPM = int(os.getenv('RESUME_LLM_RPM', 500))
+GLOBAL_TPM = int(os.getenv('RESUME_LLM_TPM', 200000))
+KEY_RPM = int(os.getenv('RESUME_LLM_KEY_RPM', 60))
+KEY_TPM = int(os.getenv('RESUME_LLM_KEY_TPM', 60000))
+MAX_WAIT_SECONDS = float(os.getenv('RESUME_LLM_MAX_WAIT', 120))
+
+SERVER_KEY = 'server'       # key_label() of OPENAI_API_KEY
+KEY_BUCKETS_SIZE = 10000    # idle keys beyond this are forgotten (a full bucket is the same as a new one)
+WAIT_SAMPLES = 1000         # recent queue waits kept for the quantiles in metrics()
+
+# tiktoken counts per message of chat formatting overhead
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encodings = {}
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when a call waited MAX_WAIT_SECONDS without getting budget"""
+
+
+def _encoding(model):
+    """tiktoken encoding for a model, or None when tiktoken (or its data) isn't available."""
+    if model not in _encodings:
+        try:
+            import tiktoken
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _encodings[model] = tiktoken.get_encoding('o200k_base')
+        except Exception:
+            # Not installed, or the BPE file can't be downloaded - fall back to a length estimate
+            _encodings[model] = None
+    return _encodings[model]
+
+
+def estimate_tokens(messages, model='gpt-4o-mini', max_tokens=0):
+    """
+    Estimate the tokens a chat completion counts against TPM.
+
+    Args:
+        messages (list): Chat messages ({'role', 'content'})
+        model (str): Model name, for the tokenizer
+        max_tokens (int): Completion limit, which OpenAI reserves up front
+
+    Returns:
+        int: Estimated prompt tokens + max_tokens
+    """
+    encoding = _encoding(model)
+    prompt = 0
+    for message in messages:
+        content = message.get('content') or ''
+        prompt += MESSAGE_OVERHEAD_TOKENS
+        prompt += len(encoding.encode(content)) if encoding else len(content) // 4 + 1
+    return prompt + max_tokens
+
+
+def key_label(api_key):
+    """Short, non-reversible label for an API key (used as the limiter key and in metrics)."""
+    if not api_key:
+        return 'none'
+    if api_key == os.getenv('OPENAI_API_KEY'):
+        return SERVER_KEY
+    return 'key-' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+class TokenBucket:
+    """Refills continuously to `per_minute` units over a minute"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` is available (requests larger than the bucket wait for a full one)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount, now):
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, delta):
+        """Charge (or refund, if negative) the difference between an estimate and real usage."""
+        self.level = min(self.capacity, self.level - delta)
+
+
+class _Ticket:
+    __slots__ = ('key', 'user', 'tokens', 'rank', 'since')
+
+    def __init__(self, key, user, tokens, priority, since):
+        self.key = key
+        self.user = user
+        self.tokens = tokens
+        self.rank = PRIORITIES.index(priority)
+        self.since = since
+
+
+class Reservation:
+    """Budget granted to one call; settle() it with the real token usage, or refund() it if the call failed"""
+
+    def __init__(self, limiter, key, tokens, waited):
+        self.limiter = limiter
+        self.key = key
+        self.tokens = tokens
+        self.waited = waited
+        self.settled = False
+
+    def settle(self, actual_tokens):
+        """Charge the real usage instead of the estimate (None keeps the estimate); only the first call counts."""
+        if self.settled:
+            return
+        self.settled = True
+        if actual_tokens is not None:
+            self.limiter._settle(self.key, actual_tokens - self.tokens)
+
+    def refund(self):
+        """Give back the estimated tokens of a call that raised (its request still counts); no-op once settled."""
+        self.settle(0)
+
+
+class RateLimiter:
+    """Blocking token-bucket limiter for RPM and TPM, globally and per key, fair across users"""
+
+    def __init__(self, rpm=GLOBAL_RPM, tpm=GLOBAL_TPM, key_rpm=KEY_RPM, key_tpm=KEY_TPM,
+                 max_wait=MAX_WAIT_SECONDS, aging=AGING_SECONDS):
+        self.key_rpm = key_rpm
+        self.key_tpm = key_tpm
+        self.max_wait = max_wait
+        self.aging = aging
+        self._global = (TokenBucket(rpm), TokenBucket(tpm))
+        self._keys = OrderedDict()      # key -> (rpm bucket, tpm bucket)
+        self._waiting = OrderedDict()   # user -> deque of tickets; first user is next in the rotation
+        self._cond = Condition()
+
+        self._wait_count = 0
+        self._wait_sum = 0.0
+        self._recent_waits = deque(maxlen=WAIT_SAMPLES)
+
+    def _buckets(self, key):
+        """The key's own (rpm, tpm) buckets, or () for the server key (global limits only)."""
+        if key == SERVER_KEY:
+            return ()
+        buckets = self._keys.get(key)
+        if buckets is None:
+            buckets = self._keys[key] = (TokenBucket(self.key_rpm), TokenBucket(self.key_tpm))
+            while len(self._keys) > KEY_BUCKETS_SIZE:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+        return buckets
+
+    def _charged(self, key):
+        """Every (rpm, tpm) bucket pair a call on `key` counts against."""
+        buckets = self._buckets(key)
+        return (buckets, self._global) if buckets else (self._global,)
+
+    def _next(self, now):
+        """
+        The ticket that may go now, or (None, seconds to wait).
+
+        Each user's most urgent ticket (oldest first within a class) is a
+        candidate if its API key's budget allows it; the most urgent candidate,
+        earliest in the user rotation on a tie, is next in line for the global
+        budget.
+        """
+        key_wait = best = best_rank = None
+        for queue in self._waiting.values():
+            ticket = min(queue, key=lambda t: (self._rank(t, now), t.since))
+            wait = self._wait(self._buckets(ticket.key), ticket.tokens, now)
+            if wait > 0:
+                key_wait = wait if key_wait is None else min(key_wait, wait)
+                continue
+            rank = self._rank(ticket, now)
+            if best is None or rank < best_rank:
+                best, best_rank = ticket, rank
+        if best is None:
+            return None, key_wait
+        wait = self._wait(self._global, best.tokens, now)
+        return (best, 0.0) if wait == 0 else (None, wait)
+
+    def _rank(self, ticket, now):
+        """Priority rank, one class more urgent for every `aging` seconds waited (as in Scheduler)."""
+        if not self.aging:
+            return ticket.rank
+        return max(ticket.rank - int((now - ticket.since) / self.aging), 0)
+
+    @staticmethod
+    def _wait(buckets, tokens, now):
+        if not buckets:
+            return 0.0
+        rpm, tpm = buckets
+        return max(rpm.wait_time(1, now), tpm.wait_time(tokens, now))
+
+    def acquire(self, key, tokens, user=None, priority=None):
+        """
+        Block until `key` may make a call estimated at `tokens` tokens.
+
+        Args:
+            key (str): API key label (see key_label) - whose budget is charged
+            tokens (int): Estimated tokens (see estimate_tokens)
+            user (str): Who the call is for - waiting calls take turns by user;
+                defaults to the key
+            priority (str): Priority class; defaults to the current one (see scheduler.priority())
+
+        Returns:
+            Reservation: settle() it with the response's total tokens
+
+        Raises:
+            RateLimitTimeout: no budget within max_wait seconds
+        """
+        user = user or key
+        start = time.monotonic()
+        ticket = _Ticket(key, user, tokens, priority or current_priority(), start)
+        with self._cond:
+            self._waiting.setdefault(user, deque()).append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    chosen, delay = self._next(now)
+                    if chosen is ticket:
+                        break
+                    remaining = self.max_wait - (now - start)
+                    if remaining <= 0:
+                        raise RateLimitTimeout(f"No LLM budget for {key} after {self.max_wait:g}s")
+                    self._cond.wait(min(delay or remaining, remaining))
+                for rpm, tpm in self._charged(key):
+                    rpm.take(1, now)
+                    tpm.take(tokens, now)
+            finally:
+                queue = self._waiting[user]
+                queue.remove(ticket)
+                # Served (or gave up): this user goes to the back of the rotation
+                del self._waiting[user]
+                if queue:
+                    self._waiting[user] = queue
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._wait_count += 1
+            self._wait_sum += waited
+            self._recent_waits.append(waited)
+        return Reservation(self, key, tokens, waited)
+
+    def _settle(self, key, delta):
+        with self._cond:
+            for _, tpm in self._charged(key):
+                tpm.adjust(delta)
+            self._cond.notify_all()
+
+    def metrics(self):
+        """Queue depth and wait-time statistics (seconds)."""
+        with self._cond:
+            waits = sorted(self._recent_waits)
+            depth = sum(len(queue) for queue in self._waiting.values())
+            count, total = self._wait_count, self._wait_sum
+
+        def quantile(q):
+            return waits[min(len(waits) - 1, int(q * len(waits)))] if waits else 0.0
+
+        return {
+            'queue_depth': depth,
+            'wait_count': count,
+            'wait_seconds_sum': total,
+            'wait_seconds_p50': quantile(0.5),
+            'wait_seconds_p95': quantile(0.95),
+            'wait_seconds_max': waits[-1] if waits else 0.0,
+        }
+
+
+LLM_LIMITER = RateLimiter()
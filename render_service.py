@@ -0,0 +1,281 @@
+"""
+Render Service
+Renders resume PDFs in a pool of worker processes, so ReportLab layout (pure
+CPU, holding the GIL) never stalls the web workers.
+
+Workers are started by the first render in each web process and warmed -
+fonts registered, every template compiled and rendered once - before they
+take jobs. They come from a forkserver with ReportLab and the templates
+preloaded, never forked from the multithreaded web process itself.
+
+Jobs are plain dicts of resume content and render options; results come
+back as PDF bytes plus the fit report, or handed over in a shared memory
+block that the web tier reads through a memoryview without copying. The
+number of jobs in flight is bounded, a render that runs past its timeout
+restarts the pool, and each worker is replaced after a fixed number of
+renders to cap memory growth.
+"""
+
+import io
+import os
+import tempfile
+import uuid
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+from threading import BoundedSemaphore, Lock
+
+
+RENDER_PROCESSES = int(os.getenv('RESUME_RENDER_PROCESSES', min(os.cpu_count() or 1, 4)))
+RENDER_QUEUE_SIZE = int(os.getenv('RESUME_RENDER_QUEUE', RENDER_PROCESSES * 4))    # jobs in flight
+RENDER_TIMEOUT = float(os.getenv('RESUME_RENDER_TIMEOUT', 30))                    # seconds per job
+RENDER_RECYCLE_AFTER = int(os.getenv('RESUME_RENDER_RECYCLE', 200))              # renders per worker
+
+# Shared memory blocks outlive the worker that wrote them only on POSIX
+SHARED_MEMORY = os.name == 'posix'
+
+# Rendered by each new worker so its first real job runs warm
+_WARMUP_RESUME = {
+    'summary': 'Warm-up render.',
+    'skills': ['Python'],
+    'experience': [{'title': 'Engineer', 'company': 'Co', 'period': '2020', 'achievements': ['Shipped']}],
+    'education': [{'degree': 'BS', 'institution': 'University', 'year': '2015'}],
+}
+_WARMUP_USER = {'name': 'Warm Up', 'email': 'warm@example.com', 'phone': '555', 'location': 'Remote'}
+
+
+class RenderError(RuntimeError):
+    """Raised when the render service can't produce a PDF"""
+
+
+class RenderQueueFull(RenderError):
+    """Raised when RENDER_QUEUE_SIZE jobs are already in flight"""
+
+
+class RenderTimeout(RenderError):
+    """Raised when a job runs past its timeout (the pool is restarted)"""
+
+
+def _warm_worker():
+    """Pool initializer: register fonts and render every template once."""
+    from fonts import preload_fonts
+    from resume_templates_unique import TEMPLATES, create_unique_resume
+
+    preload_fonts()
+    for template in TEMPLATES:
+        create_unique_resume(_WARMUP_RESUME, _WARMUP_USER, io.BytesIO(), template=template)
+
+
+def _render(job):
+    from resume_templates_unique import create_unique_resume
+
+    buffer = io.BytesIO()
+    options = {k: v for k, v in job.items() if k not in ('resume_data', 'user_info')}
+    fit = create_unique_resume(job['resume_data'], job['user_info'], buffer, **options)
+    return buffer, fit
+
+
+def render_job(job):
+    """
+    Render one job in the current process.
+
+    Args:
+        job (dict): resume_data, user_info and optional template, color, font,
+            fit_pages, optimize, deterministic (create_unique_resume arguments)
+
+    Returns:
+        tuple: (pdf bytes, fit report or None)
+    """
+    buffer, fit = _render(job)
+    return buffer.getvalue(), fit
+
+
+def render_job_shared(job, name):
+    """
+    Render one job into a new shared memory block instead of returning bytes.
+
+    The caller picks the block's name (see RenderService.render), so it can
+    unlink the block even if this worker dies or the result never arrives.
+    Ownership passes to the caller (see SharedPDF), which unlinks the block.
+
+    Returns:
+        tuple: (pdf size, fit report or None)
+    """
+    buffer, fit = _render(job)
+    pdf = buffer.getbuffer()
+    size = len(pdf)
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        block.buf[:size] = pdf
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    finally:
+        pdf.release()
+    block.close()
+    # Otherwise the resource tracker unlinks it when this worker is recycled
+    resource_tracker.unregister(block._name, 'shared_memory')
+    return size, fit
+
+
+def _unlink_block(name):
+    """Free the block a failed or abandoned shared render may have left behind."""
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+class SharedPDF:
+    """
+    A rendered PDF in a shared memory block, read in place through `view`.
+
+    Close it (or use it as a context manager) once the PDF has been written
+    or sent, which frees the block.
+    """
+
+    def __init__(self, name, size, fit):
+        self._block = shared_memory.SharedMemory(name=name)
+        self.name = name
+        self.size = size
+        self.fit = fit
+        self.view = self._block.buf[:size]
+
+    def close(self):
+        if self._block is None:
+            return
+        self.view.release()
+        self._block.close()
+        self._block.unlink()
+        self._block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_once(path, data):
+    """
+    Atomically create `path` with `data` (bytes or a memoryview), never replacing it.
+
+    The data goes to a private temp file in the same folder that is then
+    hard-linked into place, so readers only ever see a complete file and the
+    first of several concurrent writers wins.
+
+    Returns:
+        bool: True if this call created the file
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            return False
+        return True
+    finally:
+        os.unlink(tmp_path)
+
+
+class RenderService:
+    """Pool of warmed render processes with bounded admission and per-job timeouts"""
+
+    def __init__(self, processes=RENDER_PROCESSES, queue_size=RENDER_QUEUE_SIZE, timeout=RENDER_TIMEOUT,
+                 recycle_after=RENDER_RECYCLE_AFTER):
+        self.processes = processes
+        self.timeout = timeout
+        self.recycle_after = recycle_after
+        self._slots = BoundedSemaphore(queue_size)
+        self._lock = Lock()
+        self._pool = None
+        self._generation = 0    # bumped on every restart, so concurrent timeouts restart once
+
+    def _new_pool(self):
+        # Forking the web process (restarts and maxtasksperchild replacements happen while
+        # other threads render) could copy a lock another thread holds, e.g. the section
+        # cache's. The forkserver is a fresh single-threaded process; its children share
+        # the preloaded ReportLab and templates copy-on-write.
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(['render_service', 'resume_templates_unique'])
+        else:
+            context = multiprocessing.get_context('spawn')
+        return context.Pool(
+            self.processes, initializer=_warm_worker, maxtasksperchild=self.recycle_after or None
+        )
+
+    def start(self):
+        """
+        Start (and warm) the worker processes if they aren't running.
+
+        Called by the first render, so call it (or render) only in the process
+        that serves requests: a pool doesn't survive a fork, its handler threads
+        stay behind in the parent.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+                self._generation += 1
+            return self._pool, self._generation
+
+    def restart(self, generation=None):
+        """Kill all workers and start fresh ones (only if `generation` is still current)."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            old, self._pool = self._pool, self._new_pool()
+            self._generation += 1
+        if old is not None:
+            old.terminate()
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    def render(self, job, timeout=None, shared=False):
+        """
+        Render a job (see render_job) in a worker process.
+
+        A job that times out takes its worker down with it: the whole pool is
+        restarted, so other renders running at that moment fail too.
+
+        Returns:
+            tuple: (pdf bytes, fit report or None), or with shared=True (POSIX
+                only) a SharedPDF the caller must close
+
+        Raises:
+            RenderQueueFull: too many jobs in flight - retry later
+            RenderTimeout: the render took longer than `timeout` seconds
+        """
+        if not self._slots.acquire(blocking=False):
+            raise RenderQueueFull('Too many resumes rendering right now, please try again')
+        # Named here, not in the worker, so a block from a render that timed out
+        # or failed is still ours to unlink and never stays behind in /dev/shm
+        name = f"resume_{uuid.uuid4().hex[:20]}" if shared else None
+        try:
+            pool, generation = self.start()
+            if shared:
+                result = pool.apply_async(render_job_shared, (job, name))
+            else:
+                result = pool.apply_async(render_job, (job,))
+            try:
+                value = result.get(timeout or self.timeout)
+            except multiprocessing.TimeoutError:
+                # Terminates the workers, so the job can't create the block after this
+                self.restart(generation)
+                raise RenderTimeout(f"Rendering took longer than {timeout or self.timeout:g}s")
+            return SharedPDF(name, *value) if shared else value
+        except BaseException:
+            if shared:
+                _unlink_block(name)
+            raise
+        finally:
+            self._slots.release()
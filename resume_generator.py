@@ -1,11 +1,19 @@
 import os
 import json
+import time
+from collections import OrderedDict
+from threading import Lock
 from openai import OpenAI
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from job_matcher import get_job_index, analyze_user_info
+from rate_limiter import LLM_LIMITER, estimate_tokens, key_label
+from usage_ledger import prompt_hash, record_usage
+from profiling import phase
+from scheduler import LLM_SCHEDULER
 
 # Try to load .env file if python-dotenv is installed
 try:
@@ -15,40 +23,13 @@ except ImportError:
     pass  # python-dotenv not installed, will use system environment variables
 
 
-class ResumeGenerator:
-    def __init__(self, api_key=None):
-        """Initialize the Resume Generator with OpenAI API key."""
-        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
-        self.client = OpenAI(api_key=self.api_key)
-    
-    def generate_resume_content(self, job_description, user_info):
-        """
-        Generate tailored resume content using GPT based on job description.
-        
-        Args:
-            job_description (str): The job posting or description
-            user_info (dict): Dictionary containing user's background information
-        
-        Returns:
-            dict: Structured resume content
-        """
-        prompt = f"""You are a professional resume writer. Create a tailored resume based on the following:
+# The prompt is a static prefix (system message with the instructions and JSON
+# schema) followed by the per-request details. Keeping the prefix byte-identical
+# across calls lets OpenAI's prompt cache reuse it; anything that varies must go
+# in REQUEST_TEMPLATE, after it.
+RESUME_INSTRUCTIONS = """You are a professional resume writer who outputs structured JSON.
 
-JOB DESCRIPTION:
-{job_description}
-
-CANDIDATE INFORMATION:
-Name: {user_info.get('name', 'John Doe')}
-Email: {user_info.get('email', 'email@example.com')}
-Phone: {user_info.get('phone', '(555) 123-4567')}
-Location: {user_info.get('location', 'City, State')}
-
-Background: {user_info.get('background', 'Please provide your professional background')}
-Skills: {user_info.get('skills', 'Please list your skills')}
-Experience: {user_info.get('experience', 'Please describe your work experience')}
-Education: {user_info.get('education', 'Please describe your education')}
+Create a tailored resume from the JOB DESCRIPTION and CANDIDATE INFORMATION in the user message.
 
 INSTRUCTIONS:
 1. Create a professional summary that highlights relevant skills for this specific job
@@ -56,57 +37,200 @@ INSTRUCTIONS:
 3. Tailor the work experience descriptions to emphasize relevant achievements
 4. Format education appropriately
 5. Keep it concise and ATS-friendly
+6. If a PRIORITIZED FOCUS section is given, lead with those skills and experiences
 
 Return the resume in the following JSON structure:
-{{
+{
     "summary": "Professional summary paragraph",
     "skills": ["skill1", "skill2", "skill3"],
     "experience": [
-        {{
+        {
             "title": "Job Title",
             "company": "Company Name",
             "period": "Start Date - End Date",
             "achievements": ["achievement1", "achievement2"]
-        }}
+        }
     ],
     "education": [
-        {{
+        {
             "degree": "Degree Name",
             "institution": "School Name",
             "year": "Graduation Year"
-        }}
+        }
     ]
-}}
+}
 
 Provide ONLY the JSON output, no additional text."""
 
+PROMPT_PREFIX = [{"role": "system", "content": RESUME_INSTRUCTIONS}]
+
+# Identifies the prefix version in the usage ledger, and routes calls that share it to the same cache
+PROMPT_PREFIX_HASH = prompt_hash(PROMPT_PREFIX)
+
+REQUEST_TEMPLATE = """JOB DESCRIPTION:
+{job_description}
+
+CANDIDATE INFORMATION:
+Name: {name}
+Email: {email}
+Phone: {phone}
+Location: {location}
+
+Background: {background}
+Skills: {skills}
+Experience: {experience}
+Education: {education}
+{focus}"""
+
+# OpenAI clients by API key, so requests with the same key reuse one HTTP connection pool
+CLIENT_CACHE_SIZE = 32
+
+_clients = OrderedDict()
+_clients_lock = Lock()
+
+
+def get_client(api_key):
+    """Shared OpenAI client for an API key (created on first use)."""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = OpenAI(api_key=api_key)
+            while len(_clients) > CLIENT_CACHE_SIZE:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(api_key)
+        return client
+
+
+class ResumeGenerator:
+    def __init__(self, api_key=None):
+        """Initialize the Resume Generator with OpenAI API key."""
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        if not self.api_key:
+            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
+        self.client = get_client(self.api_key)
+    
+    def generate_resume_content(self, job_description, user_info, usage_tags=None, profile=None, user=None):
+        """
+        Generate tailored resume content using GPT based on job description.
+        
+        Args:
+            job_description (str): The job posting or description
+            user_info (dict): Dictionary containing user's background information
+            usage_tags (dict): Extra usage ledger fields for this call (endpoint, user, template)
+            profile (Profile): The candidate's stored profile; only its achievements
+                most relevant to this job are sent instead of the whole experience text
+            user (str): Who the call is for; calls waiting for rate limit budget
+                take turns by user (default: by API key)
+        
+        Returns:
+            dict: Structured resume content
+        """
+        # Local pre-pass: rank skills/experience and condense long postings
+        # so the LLM gets a smaller, more focused prompt
+        match = analyze_user_info(job_description, user_info)
+        if profile is not None:
+            prompt_info = profile.prompt_info(job_description, user_info)
+        else:
+            prompt_info = user_info
+        # Top-k achievements are already the ranked experience - don't list them twice
+        focus = self._build_focus_block(match, top_experience=0 if prompt_info is not user_info else 6)
+        condensed_description = get_job_index(job_description).condensed_description()
+        
+        model = "gpt-4o-mini"  # Changed from gpt-4 - 15x cheaper!
+        max_tokens = 2000
+        messages = self.build_messages(condensed_description, prompt_info, focus)
+        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Changed from gpt-4 - 15x cheaper!
-                messages=[
-                    {"role": "system", "content": "You are a professional resume writer who outputs structured JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Try to parse JSON from the response
-            # Sometimes GPT wraps JSON in code blocks
-            if content.startswith("```json"):
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif content.startswith("```"):
-                content = content.split("```")[1].split("```")[0].strip()
+            # Single generations go ahead of batch ones, which only get part of the concurrent calls
+            with phase('llm_wait'), LLM_SCHEDULER.slot():
+                # Wait for this key's (and the server's) RPM/TPM budget instead of hitting 429s;
+                # a throttled key hands its budget out in the same priority order
+                reservation = LLM_LIMITER.acquire(key_label(self.api_key),
+                                                  estimate_tokens(messages, model, max_tokens), user=user)
+                try:
+                    start = time.perf_counter()
+                    response = self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=0.7,
+                        max_tokens=max_tokens,
+                        prompt_cache_key=PROMPT_PREFIX_HASH
+                    )
+                    reservation.settle(response.usage.total_tokens if response.usage else None)
+                finally:
+                    # A call that raised gives its token estimate back
+                    reservation.refund()
+            latency_ms = (time.perf_counter() - start) * 1000
+            try:
+                entry = record_usage(model, messages, response.usage, latency_ms,
+                                     prefix_hash=PROMPT_PREFIX_HASH, **(usage_tags or {}))
+                print(f"LLM call: {entry['prompt_tokens']} prompt tokens ({entry['cached_tokens']} cached), "
+                      f"{entry['completion_tokens']} completion, {entry['latency_ms']:.0f} ms")
+            except OSError as e:
+                print(f"Error writing usage ledger: {e}")
             
-            resume_data = json.loads(content)
+            with phase('json_parse'):
+                content = response.choices[0].message.content.strip()
+                
+                # Try to parse JSON from the response
+                # Sometimes GPT wraps JSON in code blocks
+                if content.startswith("```json"):
+                    content = content.split("```json")[1].split("```")[0].strip()
+                elif content.startswith("```"):
+                    content = content.split("```")[1].split("```")[0].strip()
+                
+                resume_data = json.loads(content)
             return resume_data
             
         except Exception as e:
             print(f"Error generating resume content: {e}")
             raise
     
+    @staticmethod
+    def build_messages(job_description, user_info, focus=''):
+        """
+        Chat messages for one resume: the static prefix, then this request's details.
+        
+        Args:
+            job_description (str): The (condensed) job posting
+            user_info (dict): Dictionary containing user's background information
+            focus (str): Prioritized focus block from _build_focus_block
+        
+        Returns:
+            list: Chat messages ({'role', 'content'})
+        """
+        return PROMPT_PREFIX + [{"role": "user", "content": REQUEST_TEMPLATE.format(
+            job_description=job_description,
+            name=user_info.get('name', 'John Doe'),
+            email=user_info.get('email', 'email@example.com'),
+            phone=user_info.get('phone', '(555) 123-4567'),
+            location=user_info.get('location', 'City, State'),
+            background=user_info.get('background', 'Please provide your professional background'),
+            skills=user_info.get('skills', 'Please list your skills'),
+            experience=user_info.get('experience', 'Please describe your work experience'),
+            education=user_info.get('education', 'Please describe your education'),
+            focus=focus,
+        )}]
+    
+    @staticmethod
+    def _build_focus_block(match, top_skills=12, top_experience=6):
+        """Summarize the local match report as a short prompt section."""
+        lines = []
+        relevant_skills = [skill for skill, score in match['skills'] if score > 0][:top_skills]
+        if relevant_skills:
+            lines.append(f"Most relevant skills (ranked): {', '.join(relevant_skills)}")
+        relevant_experience = [line for line, score in match['experience'] if score > 0][:top_experience]
+        if relevant_experience:
+            lines.append("Most relevant experience:")
+            lines.extend(f"- {line}" for line in relevant_experience)
+        if match['missing_keywords']:
+            lines.append(f"Job keywords not yet covered (only use if truthful): {', '.join(match['missing_keywords'][:10])}")
+        
+        if not lines:
+            return ''
+        return "\nPRIORITIZED FOCUS (pre-ranked):\n" + "\n".join(lines) + "\n"
+    
     def create_pdf(self, resume_data, user_info, output_filename="resume.pdf", template='sidebar_accent'):
         """
         Create a professional PDF resume from the generated content.
@@ -288,7 +412,7 @@ def main():
     
     # Generate resume
     print("\n🤖 Generating tailored resume content...")
-    resume_data = generator.generate_resume_content(job_description, user_info)
+    resume_data = generator.generate_resume_content(job_description, user_info, usage_tags={'endpoint': 'cli'})
     
     # Create PDF
     output_file = "tailored_resume.pdf"
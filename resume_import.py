@@ -0,0 +1,531 @@
+"""
+Resume Import
+Turns existing resumes (PDF, DOCX or plain text) into resume_data and contact
+info with local heuristics: headings split the text into sections, date
+ranges and bullets split experience into entries, and degree/school keywords
+split education. Only the fragments the heuristics can't place are sent to
+the LLM, and only when asked to.
+
+Directories are imported by a process pool that streams results to a JSON
+Lines file, with a bounded number of files in flight so memory stays flat
+for any number of resumes.
+
+Usage:
+    python resume_import.py DIR_OR_FILES... [-o imported.jsonl] [--processes N] [--llm]
+
+PDF import needs pypdf (pip install pypdf); DOCX and text need nothing extra.
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zipfile
+from threading import BoundedSemaphore
+from xml.etree import ElementTree
+
+from job_matcher import split_skills
+
+
+IMPORT_EXTENSIONS = ('.pdf', '.docx', '.txt', '.md')
+
+MAX_FILE_BYTES = 10 * 1024 * 1024
+
+# Files a worker imports before it is replaced (PDF parsing can hold on to memory)
+TASKS_PER_WORKER = 200
+
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about', 'about me', 'overview'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'core competencies',
+               'competencies', 'technologies', 'tools', 'skills & tools', 'skills and tools'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'relevant experience'),
+    'education': ('education', 'education & training', 'education and training', 'academic background',
+                  'qualifications'),
+    'other': ('projects', 'certifications', 'certificates', 'awards', 'publications', 'languages',
+              'interests', 'volunteering', 'volunteer experience', 'references', 'activities'),
+}
+_HEADINGS = {title: section for section, titles in SECTION_HEADINGS.items() for title in titles}
+
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+DATE = rf'(?:{MONTH}\s+)?(?:\d{{1,2}}/)?(?:19|20)\d{{2}}'
+DATE_RANGE = re.compile(rf'\(?\s*({DATE})\s*(?:-|–|—|to|until)\s*({DATE}|present|current|now|today)\s*\)?',
+                        re.IGNORECASE)
+YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE = re.compile(r'(?:\+\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+LOCATION = re.compile(r"\b[A-Z][A-Za-z.' -]+,\s*(?:[A-Z]{2}|[A-Z][a-z]+)\b")
+BULLET = re.compile(r'^\s*[•\-*▪●◦‣–·>]\s*')
+TITLE_SEPARATORS = re.compile(r'\s+(?:at|@)\s+|\s*[|–—]\s*|\s+-\s+|,\s+')
+
+DEGREE_WORDS = re.compile(r"\b(?:b\.?s\.?c?|b\.?a|m\.?s\.?c?|m\.?a|mba|ph\.?d|bachelor|master|doctor|"
+                          r"associate|diploma|certificate|degree|b\.?eng|m\.?eng|high school)\b", re.IGNORECASE)
+TITLE_WORDS = re.compile(r'\b(?:engineer|developer|manager|analyst|designer|architect|consultant|director|'
+                         r'lead|intern|specialist|scientist|administrator|officer|assistant|coordinator|'
+                         r'head|president|founder|associate|technician|programmer)\b', re.IGNORECASE)
+SCHOOL_WORDS = re.compile(r'\b(?:university|college|institute|school|academy|polytechnic)\b', re.IGNORECASE)
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class ImportFailed(ValueError):
+    """Raised when a file can't be read as a resume"""
+
+
+def _pdf_text(data):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ImportFailed('PDF import needs pypdf (pip install pypdf)')
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+    except Exception as e:
+        raise ImportFailed(f'Unreadable PDF: {e}')
+
+
+def _docx_text(data):
+    """Paragraph text of a .docx, read straight from its XML (tabs and breaks kept)."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as docx:
+            root = ElementTree.fromstring(docx.read('word/document.xml'))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ImportFailed(f'Unreadable DOCX: {e}')
+
+    paragraphs = []
+    for paragraph in root.iter(_W + 'p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == _W + 't':
+                parts.append(node.text or '')
+            elif node.tag == _W + 'tab':
+                parts.append('\t')
+            elif node.tag in (_W + 'br', _W + 'cr'):
+                parts.append('\n')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+
+def _plain_text(data):
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def extract_text(filename, data):
+    """
+    Text of a resume file.
+
+    Args:
+        filename (str): Name of the file (its extension picks the reader)
+        data (bytes): File content
+
+    Raises:
+        ImportFailed: Unsupported type, or the file can't be read
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.pdf':
+        return _pdf_text(data)
+    if extension == '.docx':
+        return _docx_text(data)
+    if extension in ('.txt', '.md'):
+        return _plain_text(data)
+    raise ImportFailed(f'Unsupported file type: {extension or filename}')
+
+
+def _heading(line):
+    """Section a heading line starts, or None."""
+    title = line.strip().rstrip(':').strip().lower()
+    title = re.sub(r'\s+', ' ', title.strip('#*_ '))
+    return _HEADINGS.get(title) if len(title) <= 40 else None
+
+
+def _contact(lines, user_info):
+    """Pull name, email, phone and location out of the resume's header lines; return the rest."""
+    rest = []
+    for line in lines:
+        remaining = line
+        email = EMAIL.search(remaining)
+        if email and not user_info.get('email'):
+            user_info['email'] = email.group()
+            remaining = remaining.replace(email.group(), ' ')
+        phone = PHONE.search(remaining)
+        if phone and not user_info.get('phone'):
+            user_info['phone'] = phone.group().strip()
+            remaining = remaining.replace(phone.group(), ' ')
+        location = LOCATION.search(remaining) if (email or phone) else None
+        if location and not user_info.get('location'):
+            user_info['location'] = location.group().strip()
+            remaining = remaining.replace(location.group(), ' ')
+
+        remaining = remaining.strip(' |•·,\t')
+        if not remaining or remaining != line.strip(' |•·,\t'):
+            continue    # a contact line
+        words = remaining.split()
+        if not user_info.get('name') and 1 < len(words) <= 4 and all(w[:1].isupper() for w in words) \
+                and not any(c.isdigit() for c in remaining):
+            user_info['name'] = remaining
+            continue
+        rest.append(line)
+    return rest
+
+
+def _split_header(text):
+    """'Title at Company' / 'Title | Company' / 'Company, Title' -> (title, company)."""
+    parts = [part.strip(' ,|:') for part in TITLE_SEPARATORS.split(text) if part.strip(' ,|:')]
+    if not parts:
+        return '', ''
+    return parts[0], ', '.join(parts[1:])
+
+
+def _parse_experience(lines, ambiguous):
+    """Experience lines -> entries: a header (with a date range) starts one, bullets and sentences fill it."""
+    entries = []
+    current = None
+    for line in lines:
+        bullet = BULLET.match(line)
+        text = line[bullet.end():].strip() if bullet else line.strip()
+        date = DATE_RANGE.search(text)
+        header_like = not bullet and len(text) <= 100 and not text.endswith('.')
+
+        if header_like and date:
+            header = (text[:date.start()] + ' ' + text[date.end():]).strip(' ,|–—-:()')
+            period = f"{date.group(1)} - {date.group(2)}"
+            if current is not None and not current['period'] and not current['achievements']:
+                # Date on the line after the title
+                current['period'] = period
+                if header and not current['company']:
+                    current['company'] = header
+                continue
+            title, company = _split_header(header)
+            current = {'title': title, 'company': company, 'period': period, 'achievements': []}
+            entries.append(current)
+        elif header_like and (current is None or current['achievements']):
+            title, company = _split_header(text)
+            current = {'title': title, 'company': company, 'period': '', 'achievements': []}
+            entries.append(current)
+        elif header_like and not current['company'] and not current['period']:
+            # Second header line: "Company" then "Title" is as common as the reverse
+            if TITLE_WORDS.search(text) and not TITLE_WORDS.search(current['title']):
+                current['title'], current['company'] = text, current['title']
+            else:
+                current['company'] = text
+        elif current is not None:
+            if not bullet and current['achievements'] and not current['achievements'][-1].endswith('.'):
+                current['achievements'][-1] += ' ' + text   # wrapped line
+            else:
+                current['achievements'].append(text)
+        else:
+            ambiguous.append({'section': 'experience', 'text': text})
+
+    # A "header" with neither a date nor bullets is probably mis-split prose
+    placed = []
+    for entry in entries:
+        if entry['period'] or entry['achievements']:
+            placed.append(entry)
+        else:
+            ambiguous.append({'section': 'experience',
+                              'text': ' '.join(filter(None, [entry['title'], entry['company']]))})
+    return placed
+
+
+def parse_experience(text):
+    """
+    Free-text work history -> entries, as in an imported resume.
+
+    Returns:
+        tuple: (entries [{title, company, period, achievements}], lines that
+            couldn't be placed under a job header)
+    """
+    ambiguous = []
+    lines = [line.replace('\u00a0', ' ').strip() for line in (text or '').splitlines()]
+    entries = _parse_experience([line for line in lines if line], ambiguous)
+    return entries, [item['text'] for item in ambiguous]
+
+
+def _parse_education(lines, ambiguous):
+    entries = []
+    for line in lines:
+        text = BULLET.sub('', line).strip()
+        years = YEAR.findall(text)
+        rest = YEAR.sub(' ', text)
+        rest = re.sub(r'\(\s*[-–]?\s*\)|\s[-–]\s*$', ' ', rest)
+        parts = [part.strip(' ,|–—-()') for part in re.split(r'[,|–—]|\s-\s', rest) if part.strip(' ,|–—-()')]
+        degree = next((p for p in parts if DEGREE_WORDS.search(p)), '')
+        school = next((p for p in parts if SCHOOL_WORDS.search(p) and p != degree), '')
+        current = entries[-1] if entries else None
+
+        if degree or school:
+            if current and not (current['degree'] and current['institution']) \
+                    and bool(degree) != bool(current['degree']) and bool(school) != bool(current['institution']):
+                # Degree and school on separate lines
+                current['degree'] = current['degree'] or degree
+                current['institution'] = current['institution'] or school
+                current['year'] = current['year'] or (years[-1] if years else '')
+                continue
+            entries.append({'degree': degree or (parts[0] if parts and parts[0] != school else ''),
+                            'institution': school or ', '.join(p for p in parts if p != degree),
+                            'year': years[-1] if years else ''})
+        elif years and current and not current['year']:
+            current['year'] = years[-1]
+        elif text:
+            ambiguous.append({'section': 'education', 'text': text})
+    return entries
+
+
+def _skills(lines):
+    skills = []
+    for line in lines:
+        text = BULLET.sub('', line)
+        if ':' in text:
+            text = text.split(':', 1)[1]     # "Languages: Python, Go"
+        skills.extend(split_skills(re.sub(r'\s*[|•·]\s*', ',', text)))
+    return list(dict.fromkeys(skills))
+
+
+def segment_resume(text):
+    """
+    Split resume text into resume_data sections and contact info.
+
+    Returns:
+        dict: resume_data ({summary, skills, experience, education}), user_info
+            (name, email, phone, location), and ambiguous ([{'section', 'text'}]) -
+            the text the heuristics couldn't place
+    """
+    sections = {'header': []}
+    section = 'header'
+    for raw in text.splitlines():
+        line = raw.replace(' ', ' ').strip()
+        if not line:
+            continue
+        heading = _heading(line)
+        if heading:
+            section = heading
+            sections.setdefault(section, [])
+            continue
+        sections[section].append(line)
+
+    user_info = {}
+    ambiguous = []
+    preamble = _contact(sections['header'][:10], user_info) + sections['header'][10:]
+
+    if not any(name in sections for name in ('summary', 'skills', 'experience', 'education')):
+        # No recognizable structure at all
+        if preamble:
+            ambiguous.append({'section': 'resume', 'text': '\n'.join(preamble)})
+        preamble = []
+
+    resume_data = {
+        'summary': ' '.join(BULLET.sub('', line) for line in sections.get('summary') or preamble),
+        'skills': _skills(sections.get('skills', [])),
+        'experience': _parse_experience(sections.get('experience', []), ambiguous),
+        'education': _parse_education(sections.get('education', []), ambiguous),
+    }
+    return {'resume_data': resume_data, 'user_info': user_info, 'ambiguous': ambiguous}
+
+
+def import_bytes(filename, data):
+    """Import one resume from its file content (see segment_resume for the result)."""
+    if len(data) > MAX_FILE_BYTES:
+        raise ImportFailed(f'File is larger than {MAX_FILE_BYTES // (1024 * 1024)} MB')
+    return segment_resume(extract_text(filename, data))
+
+
+def import_file(path):
+    """
+    Import one file for the pool; never raises.
+
+    Returns:
+        dict: segment_resume's result plus path, bytes and seconds - or path and error
+    """
+    start = time.perf_counter()
+    try:
+        size = os.path.getsize(path)
+        if size > MAX_FILE_BYTES:
+            raise ImportFailed(f'File is larger than {MAX_FILE_BYTES // (1024 * 1024)} MB')
+        with open(path, 'rb') as f:
+            result = import_bytes(path, f.read())
+    except (ImportFailed, OSError) as e:
+        return {'path': path, 'error': str(e)}
+    except Exception as e:
+        # Malformed files shouldn't take down a bulk run
+        return {'path': path, 'error': f'{type(e).__name__}: {e}'}
+    result.update(path=path, bytes=size, seconds=round(time.perf_counter() - start, 4))
+    return result
+
+
+def form_fields(result):
+    """The index page's text fields, pre-filled from an import (unplaced text goes into experience)."""
+    resume_data, user_info = result['resume_data'], result['user_info']
+    experience = []
+    for entry in resume_data['experience']:
+        header = ' at '.join(filter(None, [entry['title'], entry['company']]))
+        if entry['period']:
+            header += f" ({entry['period']})"
+        # One bullet per line, so parse_experience and split_segments read them back as written
+        experience.append(header)
+        experience.extend(f"- {achievement}" for achievement in entry['achievements'])
+    experience.extend(fragment['text'] for fragment in result['ambiguous'] if fragment['section'] != 'education')
+    education = [', '.join(filter(None, [e['degree'], e['institution'], e['year']])) for e in resume_data['education']]
+    education.extend(fragment['text'] for fragment in result['ambiguous'] if fragment['section'] == 'education')
+    return {
+        'name': user_info.get('name', ''),
+        'email': user_info.get('email', ''),
+        'phone': user_info.get('phone', ''),
+        'location': user_info.get('location', ''),
+        'background': resume_data['summary'],
+        'skills': ', '.join(resume_data['skills']),
+        'experience': '\n'.join(experience),
+        'education': '\n'.join(education),
+    }
+
+
+LLM_PROMPT = """Structure these resume fragments, which an automatic parser could not place.
+Return ONLY JSON: {"experience": [{"title", "company", "period", "achievements": []}],
+"education": [{"degree", "institution", "year"}], "summary": "text or empty"}.
+Use only information in the fragments.
+
+FRAGMENTS:
+"""
+
+
+def resolve_ambiguous(result, client, model='gpt-4o-mini'):
+    """
+    Ask the LLM to structure an import's ambiguous fragments and merge them in.
+
+    Args:
+        result (dict): import_file result with a non-empty 'ambiguous' list
+        client (OpenAI): API client
+
+    Returns:
+        dict: The result, with the fragments merged into resume_data and 'ambiguous' emptied
+    """
+    from rate_limiter import LLM_LIMITER, estimate_tokens, key_label
+    from usage_ledger import prompt_hash, record_usage
+
+    fragments = '\n\n'.join(f"[{fragment['section']}]\n{fragment['text']}" for fragment in result['ambiguous'])
+    # Instructions first and alone, like resume_generator's prompt: the ledger's excerpt and
+    # prefix_hash then name the prompt without any of the uploaded resume's text
+    messages = [{"role": "system", "content": LLM_PROMPT}, {"role": "user", "content": fragments}]
+    max_tokens = 1500
+    reservation = LLM_LIMITER.acquire(key_label(client.api_key), estimate_tokens(messages, model, max_tokens))
+    try:
+        start = time.perf_counter()
+        response = client.chat.completions.create(model=model, messages=messages, temperature=0,
+                                                  max_tokens=max_tokens, response_format={'type': 'json_object'})
+        reservation.settle(response.usage.total_tokens if response.usage else None)
+    finally:
+        # A call that raised gives its token estimate back
+        reservation.refund()
+    latency_ms = (time.perf_counter() - start) * 1000
+    try:
+        record_usage(model, messages, response.usage, latency_ms, endpoint='import',
+                     prefix_hash=prompt_hash(messages[:1]))
+    except OSError as e:
+        print(f"Error writing usage ledger: {e}")
+
+    structured = json.loads(response.choices[0].message.content)
+    resume_data = result['resume_data']
+    resume_data['experience'].extend(structured.get('experience') or [])
+    resume_data['education'].extend(structured.get('education') or [])
+    if structured.get('summary') and not resume_data['summary']:
+        resume_data['summary'] = structured['summary']
+    result['ambiguous'] = []
+    result['llm'] = True
+    return result
+
+
+def iter_resume_files(paths):
+    """Resume files under the given files/directories, walked lazily."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(IMPORT_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _bounded(items, slots):
+    """Yield items only while a slot is free, so the pool's feeder can't queue everything at once."""
+    for item in items:
+        slots.acquire()
+        yield item
+
+
+def import_many(paths, processes=None, max_in_flight=None):
+    """
+    Import resumes with a process pool, yielding results as they finish.
+
+    At most `max_in_flight` files are queued or being parsed at once (default
+    4 per process), so memory doesn't grow with the number of files.
+    """
+    processes = processes or os.cpu_count() or 1
+    slots = BoundedSemaphore(max_in_flight or processes * 4)
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    with multiprocessing.get_context(method).Pool(processes, maxtasksperchild=TASKS_PER_WORKER) as pool:
+        for result in pool.imap_unordered(import_file, _bounded(iter_resume_files(paths), slots), chunksize=1):
+            slots.release()
+            yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import existing resumes into resume_data (JSON Lines)')
+    parser.add_argument('paths', nargs='+', help='Resume files or directories')
+    parser.add_argument('-o', '--output', default='imported.jsonl')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--llm', action='store_true', help='Structure ambiguous fragments with the LLM '
+                                                           '(uses OPENAI_API_KEY)')
+    args = parser.parse_args(argv)
+
+    client = None
+    if args.llm:
+        from openai import OpenAI
+        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+
+    counts = {'imported': 0, 'failed': 0, 'ambiguous': 0, 'llm': 0}
+    total_bytes = 0
+    start = time.perf_counter()
+    with open(args.output, 'w', encoding='utf-8') as out:
+        for result in import_many(args.paths, args.processes):
+            if 'error' in result:
+                counts['failed'] += 1
+                print(f"{result['path']}: {result['error']}", file=sys.stderr)
+            else:
+                counts['imported'] += 1
+                total_bytes += result['bytes']
+                if result['ambiguous']:
+                    counts['ambiguous'] += 1
+                    if client is not None:
+                        try:
+                            resolve_ambiguous(result, client)
+                            counts['llm'] += 1
+                        except Exception as e:
+                            print(f"{result['path']}: LLM resolution failed: {e}", file=sys.stderr)
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+            done = counts['imported'] + counts['failed']
+            if done % 500 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{done} files, {done / elapsed:.1f} files/s", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    done = counts['imported'] + counts['failed']
+    print(f"{done} files in {elapsed:.1f}s: {done / elapsed if elapsed else 0:.1f} files/s, "
+          f"{total_bytes / (1024 * 1024) / elapsed if elapsed else 0:.2f} MB/s")
+    print(f"imported {counts['imported']}, failed {counts['failed']}, "
+          f"with ambiguous text {counts['ambiguous']}, resolved by LLM {counts['llm']}")
+    print(f"results: {args.output}")
+    return 0 if counts['imported'] or not done else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
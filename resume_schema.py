@@ -0,0 +1,160 @@
+"""
+Resume Schema
+JSON Schema (draft 2020-12) for an editor draft - {'resume_data', 'user_info',
+'options'} - with validators compiled once at import.
+
+A JSON Patch only re-validates what it touched: the object or list holding
+each changed path, against that node's own subschema, instead of the whole
+resume.
+"""
+
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+
+
+SHORT_TEXT = {'type': ['string', 'null'], 'maxLength': 500}
+LONG_TEXT = {'type': ['string', 'null'], 'maxLength': 10000}
+
+DRAFT_SCHEMA = {
+    '$schema': 'https://json-schema.org/draft/2020-12/schema',
+    'type': 'object',
+    'properties': {
+        'resume_data': {
+            'type': 'object',
+            'properties': {
+                'summary': LONG_TEXT,
+                'skills': {'type': 'array', 'items': {'type': 'string', 'maxLength': 200}, 'maxItems': 300},
+                'experience': {
+                    'type': 'array',
+                    'maxItems': 200,
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'title': SHORT_TEXT,
+                            'company': SHORT_TEXT,
+                            'period': SHORT_TEXT,
+                            'achievements': {'type': 'array', 'items': {'type': 'string', 'maxLength': 2000},
+                                             'maxItems': 200},
+                        },
+                        'required': ['title', 'achievements'],
+                    },
+                },
+                'education': {
+                    'type': 'array',
+                    'maxItems': 50,
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'degree': SHORT_TEXT,
+                            'institution': SHORT_TEXT,
+                            'year': SHORT_TEXT,
+                        },
+                        'required': ['degree'],
+                    },
+                },
+            },
+            'required': ['summary', 'skills', 'experience', 'education'],
+        },
+        'user_info': {
+            'type': 'object',
+            'properties': {
+                'name': {'type': 'string', 'minLength': 1, 'maxLength': 200},
+                'email': SHORT_TEXT,
+                'phone': SHORT_TEXT,
+                'location': SHORT_TEXT,
+            },
+            'required': ['name'],
+        },
+        'options': {
+            'type': 'object',
+            'properties': {
+                'template': SHORT_TEXT,
+                'color_scheme': SHORT_TEXT,
+                'font_family': SHORT_TEXT,
+                # Strings come from the editor's <select> ('' = off); minimum/maximum only
+                # bound numbers, so the pattern holds strings to the same 1-10
+                'fit_pages': {'type': ['integer', 'string', 'null'], 'minimum': 1, 'maximum': 10,
+                              'pattern': '^([1-9]|10)?$'},
+            },
+        },
+    },
+    'required': ['resume_data', 'user_info', 'options'],
+}
+
+Draft202012Validator.check_schema(DRAFT_SCHEMA)
+DRAFT_VALIDATOR = Draft202012Validator(DRAFT_SCHEMA)
+
+# Compiled validators for every subschema, keyed by schema path ('*' for list items)
+_validators = {}
+
+
+def _compile(schema, key=()):
+    _validators[key] = Draft202012Validator(schema) if key else DRAFT_VALIDATOR
+    for name, child in schema.get('properties', {}).items():
+        _compile(child, key + (name,))
+    if 'items' in schema:
+        _compile(schema['items'], key + ('*',))
+
+
+_compile(DRAFT_SCHEMA)
+
+
+class DraftInvalid(ValueError):
+    """Raised when a draft (or the part a patch changed) doesn't match the schema"""
+
+
+def _validator_for(tokens):
+    """Compiled validator for the node at a pointer, or None if the schema doesn't describe it."""
+    return _validators.get(tuple('*' if token.isdigit() or token == '-' else token for token in tokens))
+
+
+def _raise_first(errors, prefix=''):
+    error = best_match(errors)
+    if error is not None:
+        location = '/'.join(str(part) for part in error.absolute_path)
+        where = '/'.join(filter(None, [prefix, location])) or 'draft'
+        raise DraftInvalid(f"{where}: {error.message}")
+
+
+def validate_draft(doc):
+    """
+    Validate a whole draft.
+
+    Raises:
+        DraftInvalid: With the path and reason of the most relevant error
+    """
+    _raise_first(DRAFT_VALIDATOR.iter_errors(doc))
+
+
+def _tokens(pointer):
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer.split('/')[1:]]
+
+
+def _changed_parents(patch):
+    """Pointers of the containers a patch modified, without ones nested inside another."""
+    parents = set()
+    for op in patch:
+        for pointer in (op.get('path'), op.get('from') if op.get('op') == 'move' else None):
+            if pointer is None:
+                continue
+            tokens = tuple(_tokens(pointer))
+            parents.add(tokens[:-1])
+    return [tokens for tokens in parents
+            if not any(other != tokens and tokens[:len(other)] == other for other in parents)]
+
+
+def validate_patched(doc, patch):
+    """
+    Validate only the parts of `doc` (already patched) that `patch` changed.
+
+    Raises:
+        DraftInvalid: With the path and reason of the most relevant error
+    """
+    for tokens in _changed_parents(patch):
+        validator = _validator_for(tokens)
+        if validator is None:
+            continue
+        node = doc
+        for token in tokens:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        _raise_first(validator.iter_errors(node), '/'.join(tokens))
@@ -0,0 +1,451 @@
+"""
+Resume Store
+Persistent SQLite repository for generated resumes and their version history.
+Revisions are stored as JSON Patch diffs against their parent revision, with a
+full snapshot every SNAPSHOT_EVERY revisions to keep reconstruction cheap.
+"""
+
+import os
+import copy
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+
+from sqlalchemy import (
+    JSON, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint,
+    create_engine, event, inspect, or_, select, text,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, sessionmaker
+
+from draft_diff import apply_patch, make_patch
+
+
+DATABASE_URL = os.getenv('RESUME_DATABASE_URL', 'sqlite:///resumes.db')
+
+# Store a full copy every N revisions along a chain, diffs in between
+SNAPSHOT_EVERY = 10
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Resume(Base):
+    """One resume per (user, job); edits become new versions.
+
+    `latest_version` counts stored revisions; `current_version` is the one
+    the editor is on, and moves with undo/redo.
+    """
+    __tablename__ = 'resumes'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_key: Mapped[str] = mapped_column(String(255))
+    owner_key: Mapped[str | None] = mapped_column(String(64), nullable=True)   # browser session that created it
+    name: Mapped[str] = mapped_column(String(255), default='')
+    job_hash: Mapped[str] = mapped_column(String(64), default='')
+    job_description: Mapped[str] = mapped_column(Text, default='')
+    latest_version: Mapped[int] = mapped_column(Integer, default=0)
+    current_version: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+    versions: Mapped[list['ResumeVersion']] = relationship(
+        back_populates='resume', order_by='ResumeVersion.version', cascade='all, delete-orphan'
+    )
+
+    __table_args__ = (
+        Index('ix_resumes_user_created', 'user_key', 'created_at'),
+        Index('ix_resumes_owner_created', 'owner_key', 'created_at'),
+        Index('ix_resumes_job_hash', 'job_hash'),
+        Index('ix_resumes_created_at', 'created_at'),
+    )
+
+
+class ResumeVersion(Base):
+    """One revision: a full snapshot or a patch against its parent, plus render parameters"""
+    __tablename__ = 'resume_versions'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    resume_id: Mapped[int] = mapped_column(ForeignKey('resumes.id', ondelete='CASCADE'))
+    version: Mapped[int] = mapped_column(Integer)
+    parent_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    depth: Mapped[int] = mapped_column(Integer, default=0)  # revisions since last snapshot
+    snapshot: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    patch: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    template: Mapped[str] = mapped_column(String(64), default='sidebar_accent')
+    color_scheme: Mapped[str] = mapped_column(String(32), default='blue')
+    font_family: Mapped[str] = mapped_column(String(64), default='helvetica')
+    fit_pages: Mapped[int | None] = mapped_column(Integer, nullable=True)   # None = template's own sizes
+    filename: Mapped[str] = mapped_column(String(255), default='')
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+    resume: Mapped[Resume] = relationship(back_populates='versions')
+
+    __table_args__ = (
+        UniqueConstraint('resume_id', 'version', name='uq_resume_version'),
+    )
+
+
+_engine = None
+_Session = None
+
+
+def get_session():
+    """Return a new ORM session, creating the database on first use."""
+    global _engine, _Session
+    if _Session is None:
+        _engine = create_engine(DATABASE_URL)
+        if _engine.dialect.name == 'sqlite':
+            @event.listens_for(_engine, 'connect')
+            def _sqlite_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA synchronous=NORMAL')
+                cursor.execute('PRAGMA foreign_keys=ON')
+                cursor.close()
+        Base.metadata.create_all(_engine)
+        _add_missing_columns(_engine)
+        _Session = sessionmaker(bind=_engine, expire_on_commit=False)
+    return _Session()
+
+
+# Columns added after the tables were first created: (table, column, statements that add it)
+ADDED_COLUMNS = [
+    ('resumes', 'owner_key', [
+        'ALTER TABLE resumes ADD COLUMN owner_key VARCHAR(64)',
+        'CREATE INDEX IF NOT EXISTS ix_resumes_owner_created ON resumes (owner_key, created_at)',
+    ]),
+    ('resume_versions', 'fit_pages', ['ALTER TABLE resume_versions ADD COLUMN fit_pages INTEGER']),
+]
+
+
+def _add_missing_columns(engine):
+    """create_all doesn't alter existing tables: add ADDED_COLUMNS to databases from before them."""
+    def has_column(table, column):
+        return column in {c['name'] for c in inspect(engine).get_columns(table)}
+
+    for table, column, statements in ADDED_COLUMNS:
+        if has_column(table, column):
+            continue
+        try:
+            with engine.begin() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+        except DBAPIError:
+            # Another process added it first
+            if not has_column(table, column):
+                raise
+
+
+def user_key_for(user_info):
+    """Identify a user by email, falling back to their name."""
+    key = (user_info.get('email') or user_info.get('name') or 'anonymous').strip().lower()
+    return key or 'anonymous'
+
+
+def job_hash_for(job_description):
+    """Stable hash of a job description, used to find resumes for the same posting."""
+    normalized = ' '.join((job_description or '').split()).lower()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+# Reconstructed documents keyed by (resume_id, version); revisions never change
+_doc_cache = OrderedDict()
+_doc_cache_lock = Lock()
+DOC_CACHE_SIZE = 256
+
+
+def _cache_doc(key, doc):
+    with _doc_cache_lock:
+        _doc_cache[key] = doc
+        _doc_cache.move_to_end(key)
+        while len(_doc_cache) > DOC_CACHE_SIZE:
+            _doc_cache.popitem(last=False)
+
+
+def _cached_doc(key):
+    with _doc_cache_lock:
+        doc = _doc_cache.get(key)
+        if doc is not None:
+            _doc_cache.move_to_end(key)
+        return doc
+
+
+def _reconstruct(db, resume_id, version):
+    """Rebuild a revision's document by applying patches forward from the nearest snapshot."""
+    cached = _cached_doc((resume_id, version))
+    if cached is not None:
+        return cached
+
+    # One query for the whole (small) history, then walk parent links in memory
+    rows = {
+        row.version: row for row in db.execute(
+            select(ResumeVersion.version, ResumeVersion.parent_version,
+                   ResumeVersion.snapshot, ResumeVersion.patch)
+            .where(ResumeVersion.resume_id == resume_id, ResumeVersion.version <= version)
+        )
+    }
+    chain = []
+    cursor = version
+    while True:
+        row = rows.get(cursor)
+        if row is None:
+            return None
+        cached = _cached_doc((resume_id, cursor))
+        if cached is not None:
+            doc = cached
+            break
+        if row.snapshot is not None:
+            doc = row.snapshot
+            _cache_doc((resume_id, cursor), doc)
+            break
+        chain.append(row)
+        cursor = row.parent_version
+
+    for row in reversed(chain):
+        doc = apply_patch(doc, row.patch)
+        _cache_doc((resume_id, row.version), doc)
+    return doc
+
+
+def _version_dict(resume, version, doc):
+    return {
+        'id': resume.id,
+        'version': version.version,
+        'parent_version': version.parent_version,
+        'current_version': resume.current_version,
+        'latest_version': resume.latest_version,
+        'name': resume.name,
+        'user_key': resume.user_key,
+        'job_hash': resume.job_hash,
+        'job_description': resume.job_description,
+        # Copies, so callers can't modify cached revisions
+        'resume_data': copy.deepcopy(doc['resume_data']),
+        'user_info': copy.deepcopy(doc['user_info']),
+        'template': version.template,
+        'color_scheme': version.color_scheme,
+        'font_family': version.font_family,
+        'fit_pages': version.fit_pages,
+        'filename': version.filename,
+        'created_at': version.created_at,
+    }
+
+
+def save_resume(resume_data, user_info, filename, template='sidebar_accent', color_scheme='blue',
+                font_family='helvetica', job_description=None, resume_id=None, owner_key=None, fit_pages=None):
+    """
+    Store a resume revision as a child of the resume's current version.
+
+    Args:
+        resume_data (dict): Structured resume content
+        user_info (dict): User's contact/background information
+        filename (str): Rendered PDF for this revision
+        template, color_scheme, font_family (str): Render parameters
+        fit_pages (int): Page count the revision was fitted to, or None
+        job_description (str): Job posting (only needed for new resumes)
+        resume_id (int): Existing resume to add a version to, or None for a new one
+        owner_key (str): Who may list and open it (see list_resumes/get_resume);
+            a resume_id owned by someone else starts a new resume instead
+
+    Returns:
+        tuple: (resume_id, version)
+    """
+    doc = {'resume_data': resume_data, 'user_info': user_info}
+    template = template or 'sidebar_accent'
+    color_scheme = color_scheme or 'blue'
+    font_family = font_family or 'helvetica'
+
+    with get_session() as db:
+        resume = db.get(Resume, resume_id) if resume_id else None
+        if resume is not None and resume.owner_key != owner_key:
+            resume = None
+        now = datetime.now()
+
+        if resume is None:
+            resume = Resume(
+                user_key=user_key_for(user_info),
+                owner_key=owner_key,
+                name=user_info.get('name') or '',
+                job_hash=job_hash_for(job_description),
+                job_description=job_description or '',
+                latest_version=0,
+                current_version=0,
+                created_at=now,
+            )
+            db.add(resume)
+            db.flush()
+
+        parent = None
+        if resume.current_version:
+            parent = db.scalars(select(ResumeVersion).where(
+                ResumeVersion.resume_id == resume.id,
+                ResumeVersion.version == resume.current_version,
+            )).first()
+
+        patch = None
+        if parent is not None:
+            patch = make_patch(_reconstruct(db, resume.id, parent.version), doc)
+            unchanged_render = ((parent.template, parent.color_scheme, parent.font_family, parent.fit_pages)
+                                == (template, color_scheme, font_family, fit_pages))
+            if not patch and unchanged_render:
+                # Nothing changed - keep the existing revision
+                return resume.id, parent.version
+
+        resume.latest_version += 1
+        resume.current_version = resume.latest_version
+        resume.updated_at = now
+        resume.name = user_info.get('name') or resume.name
+
+        take_snapshot = parent is None or parent.depth + 1 >= SNAPSHOT_EVERY
+        db.add(ResumeVersion(
+            resume_id=resume.id,
+            version=resume.latest_version,
+            parent_version=parent.version if parent is not None else None,
+            depth=0 if take_snapshot else parent.depth + 1,
+            snapshot=doc if take_snapshot else None,
+            patch=None if take_snapshot else patch,
+            template=template,
+            color_scheme=color_scheme,
+            font_family=font_family,
+            fit_pages=fit_pages,
+            filename=filename,
+            created_at=now,
+        ))
+        db.commit()
+        _cache_doc((resume.id, resume.latest_version), copy.deepcopy(doc))
+        return resume.id, resume.latest_version
+
+
+def get_resume(resume_id, version=None, owner_key=None):
+    """
+    Load a resume revision (the current one by default), or None.
+
+    With owner_key, resumes that belong to someone else are None too.
+    """
+    with get_session() as db:
+        resume = db.get(Resume, resume_id)
+        if resume is None or (owner_key is not None and resume.owner_key != owner_key):
+            return None
+        row = db.scalars(select(ResumeVersion).where(
+            ResumeVersion.resume_id == resume_id,
+            ResumeVersion.version == (version or resume.current_version),
+        )).first()
+        if row is None:
+            return None
+        return _version_dict(resume, row, _reconstruct(db, resume_id, row.version))
+
+
+def _move_to(resume_id, find_target):
+    with get_session() as db:
+        resume = db.get(Resume, resume_id)
+        if resume is None:
+            return None
+        target = find_target(db, resume)
+        if target is None:
+            return None
+        resume.current_version = target
+        db.commit()
+    return get_resume(resume_id, target)
+
+
+def undo(resume_id):
+    """Step back to the parent of the current version; None if there is nothing to undo."""
+    def parent_of_current(db, resume):
+        return db.scalar(select(ResumeVersion.parent_version).where(
+            ResumeVersion.resume_id == resume.id,
+            ResumeVersion.version == resume.current_version,
+        ))
+    return _move_to(resume_id, parent_of_current)
+
+
+def redo(resume_id):
+    """Step forward to the newest child of the current version; None if there is nothing to redo."""
+    def newest_child(db, resume):
+        return db.scalar(
+            select(ResumeVersion.version)
+            .where(ResumeVersion.resume_id == resume.id,
+                   ResumeVersion.parent_version == resume.current_version)
+            .order_by(ResumeVersion.version.desc())
+        )
+    return _move_to(resume_id, newest_child)
+
+
+def history_state(resume_id):
+    """Whether undo/redo are available from the current version."""
+    with get_session() as db:
+        resume = db.get(Resume, resume_id)
+        if resume is None:
+            return {'can_undo': False, 'can_redo': False, 'version': None, 'latest_version': None}
+        current = resume.current_version
+        can_undo = db.scalar(select(ResumeVersion.parent_version).where(
+            ResumeVersion.resume_id == resume_id, ResumeVersion.version == current)) is not None
+        can_redo = db.scalar(select(ResumeVersion.version).where(
+            ResumeVersion.resume_id == resume_id, ResumeVersion.parent_version == current).limit(1)) is not None
+        return {'can_undo': can_undo, 'can_redo': can_redo,
+                'version': current, 'latest_version': resume.latest_version}
+
+
+def job_description_for(resume_id, owner_key=None):
+    """The posting a resume was generated for ('' if unknown), without rebuilding its content."""
+    with get_session() as db:
+        resume = db.get(Resume, resume_id)
+        if resume is None or (owner_key is not None and resume.owner_key != owner_key):
+            return ''
+        return resume.job_description
+
+
+def list_versions(resume_id):
+    """Version numbers, parents, filenames and timestamps for one resume, oldest first."""
+    with get_session() as db:
+        stmt = (
+            select(ResumeVersion.version, ResumeVersion.parent_version,
+                   ResumeVersion.filename, ResumeVersion.created_at)
+            .where(ResumeVersion.resume_id == resume_id)
+            .order_by(ResumeVersion.version)
+        )
+        return [{'version': v, 'parent_version': p, 'filename': f, 'created_at': c}
+                for v, p, f, c in db.execute(stmt)]
+
+
+def list_resumes(user_key=None, query=None, job_description=None, limit=50, owner_key=None):
+    """
+    List stored resumes, newest first.
+
+    Args:
+        owner_key (str): Only resumes created by this browser session
+        user_key (str): Only resumes belonging to this user
+        query (str): Case-insensitive match on name, user or job description
+        job_description (str): Only resumes generated for this exact posting
+        limit (int): Maximum number of rows
+
+    Returns:
+        list: Summary dicts (no resume content)
+    """
+    with get_session() as db:
+        stmt = select(Resume).order_by(Resume.created_at.desc()).limit(limit)
+        if owner_key is not None:
+            stmt = stmt.where(Resume.owner_key == owner_key)
+        if user_key:
+            stmt = stmt.where(Resume.user_key == user_key.strip().lower())
+        if job_description:
+            stmt = stmt.where(Resume.job_hash == job_hash_for(job_description))
+        if query:
+            pattern = f"%{query.strip()}%"
+            stmt = stmt.where(or_(
+                Resume.name.ilike(pattern),
+                Resume.user_key.ilike(pattern),
+                Resume.job_description.ilike(pattern),
+            ))
+        return [{
+            'id': r.id,
+            'name': r.name,
+            'user_key': r.user_key,
+            'job_hash': r.job_hash,
+            'job_excerpt': ' '.join(r.job_description.split())[:120],
+            'current_version': r.current_version,
+            'latest_version': r.latest_version,
+            'created_at': r.created_at,
+            'updated_at': r.updated_at,
+        } for r in db.scalars(stmt)]
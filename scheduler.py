@@ -0,0 +1,185 @@
+"""
+Priority Scheduler
+Orders work on a shared resource - the render workers, the LLM - by
+priority class, so a batch of generations can't make the editor unusable.
+
+Classes, most urgent first:
+    interactive   editor re-renders and live previews
+    single        one resume generated from the form
+    batch         bulk generation (requests that ask for it)
+
+Each resource admits `capacity` jobs at once. Each class also has its own
+limit below that: single work leaves a slot free for interactive work and
+batch work only ever gets part of the capacity. When a slot frees up, the
+most urgent waiter its class limit allows goes next; waiters age one class
+up for every `aging` seconds they've waited, so a steady stream of
+interactive work delays batch work but never starves it.
+
+The current request's class is a context variable set with priority(), so
+the render and LLM paths pick it up without it being passed down.
+"""
+
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+from threading import Condition
+
+from render_service import RENDER_PROCESSES
+
+
+PRIORITIES = ('interactive', 'single', 'batch')
+DEFAULT_PRIORITY = 'single'
+
+RENDER_CONCURRENCY = int(os.getenv('RESUME_RENDER_CONCURRENCY', RENDER_PROCESSES or min(os.cpu_count() or 1, 4)))
+LLM_CONCURRENCY = int(os.getenv('RESUME_LLM_CONCURRENCY', 16))
+AGING_SECONDS = float(os.getenv('RESUME_PRIORITY_AGING', 10))      # waited per class promotion
+MAX_WAIT_SECONDS = float(os.getenv('RESUME_SCHEDULER_MAX_WAIT', 120))
+
+WAIT_SAMPLES = 1000     # recent waits per class kept for metrics()
+
+_priority = ContextVar('priority', default=DEFAULT_PRIORITY)
+
+
+class SchedulerTimeout(RuntimeError):
+    """Raised when a job waited max_wait seconds without getting a slot"""
+
+
+def default_limits(capacity):
+    """Per-class limits for a capacity: one slot kept free of single work, batch gets half."""
+    return {
+        'interactive': capacity,
+        'single': max(capacity - 1, 1),
+        'batch': max(capacity // 2, 1),
+    }
+
+
+def set_priority(name):
+    """priority() for code that can't wrap a block (request hooks); returns the token for reset_priority()."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name!r} (expected one of {', '.join(PRIORITIES)})")
+    return _priority.set(name)
+
+
+def reset_priority(token):
+    _priority.reset(token)
+
+
+@contextmanager
+def priority(name):
+    """Run the block (and the render/LLM work it schedules) in priority class `name`."""
+    token = set_priority(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+class _Waiter:
+    __slots__ = ('seq', 'priority', 'rank', 'since')
+
+    def __init__(self, seq, priority, since):
+        self.seq = seq
+        self.priority = priority
+        self.rank = PRIORITIES.index(priority)
+        self.since = since
+
+
+class Scheduler:
+    """Priority admission to a resource with per-class concurrency limits and aging"""
+
+    def __init__(self, name, capacity, limits=None, aging=AGING_SECONDS, max_wait=MAX_WAIT_SECONDS):
+        self.name = name
+        self.capacity = max(capacity, 1)
+        self.limits = dict(default_limits(self.capacity), **(limits or {}))
+        self.aging = aging
+        self.max_wait = max_wait
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        self._waiting = []
+        self._seq = count()
+        self._cond = Condition()
+
+        self._served = dict.fromkeys(PRIORITIES, 0)
+        self._recent_waits = {p: deque(maxlen=WAIT_SAMPLES) for p in PRIORITIES}
+
+    def _effective_rank(self, waiter, now):
+        if not self.aging:
+            return waiter.rank
+        return max(waiter.rank - int((now - waiter.since) / self.aging), 0)
+
+    def _next(self, now):
+        """The waiter that may go now, or None."""
+        if sum(self._running.values()) >= self.capacity:
+            return None
+        admissible = [w for w in self._waiting if self._running[w.priority] < self.limits[w.priority]]
+        if not admissible:
+            return None
+        return min(admissible, key=lambda w: (self._effective_rank(w, now), w.since, w.seq))
+
+    @contextmanager
+    def slot(self, priority=None):
+        """
+        Hold one of the resource's slots for the block.
+
+        Args:
+            priority (str): Priority class; defaults to the current one (see priority())
+
+        Raises:
+            SchedulerTimeout: no slot within max_wait seconds
+        """
+        priority = priority or current_priority()
+        start = time.monotonic()
+        waiter = _Waiter(next(self._seq), priority, start)
+        with self._cond:
+            self._waiting.append(waiter)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._next(now) is waiter:
+                        break
+                    remaining = self.max_wait - (now - start)
+                    if remaining <= 0:
+                        raise SchedulerTimeout(f"No {self.name} slot for {priority} work after {self.max_wait:g}s")
+                    # Re-checked whenever a slot is released (aging only matters at that point)
+                    self._cond.wait(remaining)
+                self._running[priority] += 1
+                self._served[priority] += 1
+                self._recent_waits[priority].append(now - start)
+            finally:
+                self._waiting.remove(waiter)
+                self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running[priority] -= 1
+                self._cond.notify_all()
+
+    def metrics(self):
+        """Running, waiting and served jobs per class, with the p95 of recent waits."""
+        with self._cond:
+            waiting = dict.fromkeys(PRIORITIES, 0)
+            for waiter in self._waiting:
+                waiting[waiter.priority] += 1
+            stats = {}
+            for p in PRIORITIES:
+                waits = sorted(self._recent_waits[p])
+                stats[p] = {
+                    'running': self._running[p],
+                    'waiting': waiting[p],
+                    'served': self._served[p],
+                    'limit': self.limits[p],
+                    'wait_seconds_p95': waits[min(int(len(waits) * 0.95), len(waits) - 1)] if waits else 0.0,
+                }
+            return stats
+
+
+# Shared by every request in this process: the render workers and concurrent LLM calls
+RENDER_SCHEDULER = Scheduler('render', RENDER_CONCURRENCY)
+LLM_SCHEDULER = Scheduler('llm', LLM_CONCURRENCY)
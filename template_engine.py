@@ -0,0 +1,762 @@
+"""
+Template Engine
+Renders resumes from declarative JSON template specs (template_specs/*.json).
+
+A spec describes page margins, page decorations, named paragraph/table styles
+and an ordered list of sections built from a handful of flowable types. Each
+spec is compiled once per (template, accent color, font) into ReportLab styles,
+a page canvas and section builders; sections go through the shared layout
+cache so unchanged sections are reused between renders, and the decorations
+are drawn once per (template, accent color) into a form every page references.
+"""
+
+import hashlib
+import io
+import os
+import json
+import string
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfdoc import (PDFDictionary, PDFFormXObject, PDFInfo, PDFResourceDictionary, PDFStream,
+                                      PDFZCompress, pdfdocEnc)
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus.frames import _FUZZ
+
+from fonts import resolve_font
+from layout_cache import SECTION_CACHE
+from profiling import phase
+
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template_specs')
+
+ALIGNMENTS = {'left': TA_LEFT, 'center': TA_CENTER, 'right': TA_RIGHT, 'justify': TA_JUSTIFY}
+
+# Fields every section can reference; anything else comes from the repeated item
+USER_FIELDS = ('name', 'email', 'phone', 'location')
+RESUME_FIELDS = ('summary', 'skills', 'experience', 'education')
+
+# Fit-to-pages bounds (fraction of the spec's own sizes) when a spec has no "fit" block
+DEFAULT_FIT_BOUNDS = {
+    'font_scale': [0.85, 1.0],
+    'leading_scale': [0.85, 1.0],
+    'spacing_scale': [0.5, 1.0],
+}
+FIT_STEPS = 64      # resolution of the search between natural and tightest layout
+
+# Platypus frame padding on each side (SimpleDocTemplate's Frame default)
+FRAME_PADDING = 6
+
+# Bump whenever a renderer change alters the output for unchanged inputs (layout, fit,
+# stream encoding): it's part of the content-addressed PDF file names (see spec_hash)
+RENDERER_VERSION = 1
+
+_formatter = string.Formatter()
+
+PAGE_ART_CACHE_SIZE = 64   # compiled decorations, one per (template, accent color)
+_page_art_cache = OrderedDict()
+_page_art_lock = Lock()
+
+
+class TemplateSpecError(ValueError):
+    """Raised when a template spec is missing or malformed"""
+
+
+class _StrippedInfo(PDFInfo):
+    """Document info dictionary with no producer, dates or placeholder title/author"""
+
+    def format(self, document):
+        return PDFDictionary({}).format(document)
+
+
+def _binary_stream(content, comment):
+    """
+    A compressed stream written as raw binary instead of ASCII85 text (25% smaller).
+
+    ReportLab picks the encoding from the process-wide rl_config.useA85 when it
+    formats a page or form that has no stream yet; one that already has its own
+    keeps it, so optimized documents get binary streams without touching the
+    setting other renders in other threads read.
+    """
+    stream = PDFStream(content=content, filters=[PDFZCompress])
+    stream.__Comment__ = comment
+    return stream
+
+
+class PageArt:
+    """
+    A template's page decorations, drawn once per (template, accent color) into
+    form XObject content that each document adds once and every page references.
+    """
+
+    def __init__(self, template):
+        scratch = canvas.Canvas(io.BytesIO(), pagesize=letter)
+        template.draw_decorations(scratch)
+        self.stream = pdfdocEnc('\n'.join(scratch._code))
+        # Alpha states the ops use, by the names the stream refers to them with
+        self.ext_states = {name: dict((state,)) for state, name in scratch._extgstate._c.items()}
+        self.bbox = (0, 0) + letter
+
+    def add_to(self, doc, name, compression, binary=False):
+        """Add the art to a document as form `name` (pages then draw it with doForm)."""
+        form = PDFFormXObject(*self.bbox)
+        if compression and binary:
+            # Left uncompressed as far as format() knows, so it keeps these filters
+            form.Contents = _binary_stream(self.stream, 'xobject form stream')
+        else:
+            form.stream = self.stream
+            form.compression = compression
+        resources = PDFResourceDictionary()
+        if self.ext_states:
+            resources.ExtGState = PDFDictionary(
+                {key: PDFDictionary(dict(state)) for key, state in self.ext_states.items()}
+            )
+        form.Resources = resources
+        doc.addForm(name, form)
+
+
+def _page_art(template):
+    """PageArt for a compiled template, shared by every font and fit scale of it."""
+    key = (template.name, template.accent_color, json.dumps(template.decorations))
+    with _page_art_lock:
+        art = _page_art_cache.get(key)
+        if art is not None:
+            _page_art_cache.move_to_end(key)
+            return art
+
+    art = PageArt(template)
+    with _page_art_lock:
+        _page_art_cache[key] = art
+        while len(_page_art_cache) > PAGE_ART_CACHE_SIZE:
+            _page_art_cache.popitem(last=False)
+    return art
+
+
+class _Context(dict):
+    """Format context: unknown fields render as '' like exp.get('field', '')"""
+
+    def __missing__(self, key):
+        return ''
+
+
+def _fields_in(text):
+    return {name for _, name, _, _ in _formatter.parse(text) if name}
+
+
+# ---------------------------------------------------------------------------
+# Spec loading
+# ---------------------------------------------------------------------------
+
+def spec_path(name):
+    return os.path.join(SPEC_DIR, f"{name}.json")
+
+
+@lru_cache(maxsize=None)
+def _load_spec_file(path, mtime):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_spec(name):
+    """Load a template spec by name (re-read automatically when the file changes)."""
+    path = spec_path(name)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        raise TemplateSpecError(f"Unknown template: {name!r}")
+    return _load_spec_file(path, mtime)
+
+
+@lru_cache(maxsize=None)
+def _hash_spec_file(path, mtime):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def spec_hash(name):
+    """
+    Hash of a spec file's current content, for cache keys of rendered output.
+
+    Specs are re-read when edited, so anything cached by its inputs alone
+    would keep serving the old design; None for an unknown template.
+    """
+    path = spec_path(name)
+    try:
+        return _hash_spec_file(path, os.path.getmtime(path))
+    except OSError:
+        return None
+
+
+def available_templates():
+    """All specs in SPEC_DIR as dicts with name, label, short_label and form_value, in menu order."""
+    templates = []
+    for filename in sorted(os.listdir(SPEC_DIR)):
+        if filename.endswith('.json'):
+            spec = load_spec(filename[:-5])
+            templates.append({
+                'name': spec['name'],
+                'label': spec.get('label', spec['name']),
+                'short_label': spec.get('short_label', spec.get('label', spec['name'])),
+                'form_value': spec.get('form_value', spec['name']),
+                'order': spec.get('order', 100),
+            })
+    return sorted(templates, key=lambda t: (t['order'], t['name']))
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+class CompiledTemplate:
+    """A spec resolved for one accent color, font and (optionally) fit scale, ready to render"""
+
+    def __init__(self, spec, accent_color, font_family, scale=None):
+        self.name = spec['name']
+        self.accent_color = accent_color
+        self.font_family = font_family
+        self.base_font, self.bold_font = resolve_font(font_family)
+        # (font, leading, spacing) multipliers from fit_to_pages; None renders the spec as written
+        self.scale = scale
+
+        margins = spec.get('page', {}).get('margins', {})
+        self.margins = {side: margins.get(side, 0.5) * inch for side in ('left', 'right', 'top', 'bottom')}
+
+        self.styles = {
+            name: ParagraphStyle(name[:1].upper() + name[1:], **self._scaled_style(
+                {k: self._value(k, v) for k, v in attrs.items()}
+            ))
+            for name, attrs in spec.get('styles', {}).items()
+        }
+        self.table_styles = {
+            name: TableStyle([self._table_command(cmd) for cmd in commands])
+            for name, commands in spec.get('table_styles', {}).items()
+        }
+        self.decorations = spec.get('decorations', [])
+        self.page_art = _page_art(self) if self.decorations else None
+        self.canvasmaker = self._make_canvas() if self.decorations else canvas.Canvas
+        self.optimized_canvasmaker = self._make_canvas(optimize=True)
+
+        self.sections = [self._compile_section(section) for section in spec.get('sections', [])]
+
+    # -- value resolution ---------------------------------------------------
+
+    def _value(self, key, value):
+        """Resolve $variables, colors and alignment names in a spec value."""
+        if key == 'alignment' and isinstance(value, str):
+            return ALIGNMENTS[value]
+        if isinstance(value, str):
+            if value == '$accent':
+                return colors.HexColor(self.accent_color)
+            if value == '$white':
+                return colors.white
+            if value == '$base_font':
+                return self.base_font
+            if value == '$bold_font':
+                return self.bold_font
+            if value.startswith('#'):
+                return colors.HexColor(value)
+        return value
+
+    def _table_command(self, cmd):
+        if len(cmd) == 2:
+            # e.g. ["ROUNDEDCORNERS", [5, 5, 5, 5]]
+            return tuple(cmd)
+        op, start, stop, *args = cmd
+        if self.scale and op in ('TOPPADDING', 'BOTTOMPADDING'):
+            args = [args[0] * self.scale[2]]
+        return (op, tuple(start), tuple(stop), *[self._value(op, arg) for arg in args])
+
+    def _scaled_style(self, attrs):
+        if not self.scale:
+            return attrs
+        font, leading, spacing = self.scale
+        attrs = dict(attrs)
+        attrs['fontSize'] = attrs.get('fontSize', ParagraphStyle.defaults['fontSize']) * font
+        attrs['leading'] = attrs.get('leading', ParagraphStyle.defaults['leading']) * leading
+        for key in ('spaceBefore', 'spaceAfter'):
+            if key in attrs:
+                attrs[key] *= spacing
+        return attrs
+
+    # -- page decorations ---------------------------------------------------
+
+    def _make_canvas(self, optimize=False):
+        """
+        Canvas class that puts the spec's decorations on every page.
+
+        The decorations are added to each document once, as a Form XObject from
+        the shared PageArt, and every page references it. With optimize, streams
+        are written as binary (see _binary_stream) and the document info
+        metadata is stripped.
+        """
+        art = self.page_art
+        form_name = f"{self.name}_decorations"
+
+        class DecoratedCanvas(canvas.Canvas):
+            def __init__(self, *args, **kwargs):
+                canvas.Canvas.__init__(self, *args, **kwargs)
+                self.pages = []
+                if optimize:
+                    self._doc.info = _StrippedInfo()
+
+            def showPage(self):
+                self.pages.append(dict(self.__dict__))
+                self._startPage()
+
+            def save(self):
+                if art and self.pages:
+                    art.add_to(self._doc, form_name, self._pageCompression, binary=optimize)
+                # Decorations go on top of each page once its content is laid out
+                for page in self.pages:
+                    self.__dict__.update(page)
+                    if art:
+                        self.doForm(form_name)
+                    canvas.Canvas.showPage(self)
+                if optimize:
+                    for page in self._doc.Pages.pages:
+                        if page.compression and not page.Contents:
+                            page.Contents = _binary_stream(page.stream, 'page stream')
+                canvas.Canvas.save(self)
+
+        DecoratedCanvas.__name__ = f"{self.name.title()}Canvas"
+        return DecoratedCanvas
+
+    def draw_decorations(self, c):
+        """Replay the spec's decoration ops (lengths in inches) on a canvas."""
+        for op, *args in self.decorations:
+            if op == 'fill':
+                c.setFillColor(self._value(op, args[0]))
+            elif op == 'alpha':
+                c.setFillAlpha(args[0])
+            elif op == 'rect':
+                x, y, w, h = args
+                c.rect(x*inch, y*inch, w*inch, h*inch, fill=1, stroke=0)
+            elif op == 'circle':
+                x, y, r = args
+                c.circle(x*inch, y*inch, r*inch, fill=1, stroke=0)
+            elif op == 'polygon':
+                (x0, y0), *rest = args[0]
+                path = c.beginPath()
+                path.moveTo(x0*inch, y0*inch)
+                for x, y in rest:
+                    path.lineTo(x*inch, y*inch)
+                path.close()
+                c.drawPath(path, fill=1, stroke=0)
+            elif op == 'save':
+                c.saveState()
+            elif op == 'restore':
+                c.restoreState()
+            elif op == 'translate':
+                c.translate(args[0]*inch, args[1]*inch)
+            elif op == 'rotate':
+                c.rotate(args[0])
+            else:
+                raise TemplateSpecError(f"{self.name}: unknown decoration op {op!r}")
+
+    # -- sections -----------------------------------------------------------
+
+    def _compile_section(self, section):
+        fields = set()
+        self._collect_fields(section.get('flowables', []), fields)
+        fields.discard('item')
+        repeat = section.get('repeat')
+        if repeat:
+            # Fields resolved from the repeated item are covered by hashing the item itself
+            fields = {f for f in fields if f in USER_FIELDS or f in RESUME_FIELDS}
+        return {
+            'id': section['id'],
+            'when': section.get('when', repeat),
+            'repeat': repeat,
+            'flowables': section.get('flowables', []),
+            'fields': sorted(fields),
+        }
+
+    def _collect_fields(self, specs, fields):
+        """Find every context field a list of flowable specs depends on."""
+        for spec in specs:
+            if isinstance(spec, str):
+                fields.update(_fields_in(spec))
+                continue
+            if isinstance(spec, list):
+                self._collect_fields(spec, fields)
+                continue
+            kind = spec.get('type')
+            if kind not in FLOWABLE_TYPES:
+                raise TemplateSpecError(f"{self.name}: unknown flowable type {kind!r}")
+            if spec.get('style') and kind != 'table' and spec['style'] not in self.styles:
+                raise TemplateSpecError(f"{self.name}: unknown style {spec['style']!r}")
+            if kind == 'table' and isinstance(spec.get('style'), str) and spec['style'] not in self.table_styles:
+                raise TemplateSpecError(f"{self.name}: unknown table style {spec['style']!r}")
+            if kind == 'grid' and spec['table_style'] not in self.table_styles:
+                raise TemplateSpecError(f"{self.name}: unknown table style {spec['table_style']!r}")
+            for key in ('text', 'format'):
+                if key in spec:
+                    fields.update(_fields_in(spec[key]))
+            if 'items' in spec:
+                fields.add(spec['items'])
+            if kind == 'contact':
+                fields.update(field for field, _ in spec['fields'])
+            for row in spec.get('rows', []):
+                self._collect_fields(row, fields)
+            self._collect_fields(spec.get('flowables', []), fields)
+
+    def build_elements(self, resume_data, user_info):
+        """Build the document's flowables, reusing cached sections."""
+        context = _Context(
+            {field: user_info.get(field) for field in USER_FIELDS},
+            name=user_info.get('name', 'Your Name'),
+            summary=resume_data.get('summary', ''),
+            skills=resume_data.get('skills', []),
+            experience=resume_data.get('experience', []),
+            education=resume_data.get('education', []),
+        )
+        design = (self.name, self.accent_color, self.font_family)
+        if self.scale:
+            design += (self.scale,)
+
+        elements = []
+        for section in self.sections:
+            if section['when'] and not context[section['when']]:
+                continue
+            shared = {field: context[field] for field in section['fields']}
+
+            if section['repeat']:
+                for item in context[section['repeat']]:
+                    item_context = _Context(context, **item)
+                    elements.extend(SECTION_CACHE.section(
+                        design + (section['id'], shared, item),
+                        lambda ctx=item_context, s=section: self._build(s['flowables'], ctx, user_info),
+                    ))
+            else:
+                elements.extend(SECTION_CACHE.section(
+                    design + (section['id'], shared),
+                    lambda s=section: self._build(s['flowables'], context, user_info),
+                ))
+        return elements
+
+    # -- flowable builders --------------------------------------------------
+
+    def _build(self, specs, context, user_info):
+        flowables = []
+        for spec in specs:
+            flowables.extend(FLOWABLE_TYPES[spec['type']](self, spec, context, user_info))
+        return flowables
+
+    def _text(self, spec, context):
+        text = spec['text'].format_map(context)
+        if spec.get('transform') == 'upper':
+            text = text.upper()
+        return text
+
+    def _paragraph(self, spec, context, user_info):
+        return [Paragraph(self._text(spec, context), self.styles[spec['style']])]
+
+    def _spacer(self, spec, context, user_info):
+        height = spec['height']*inch
+        if self.scale:
+            height *= self.scale[2]
+        return [Spacer(1, height)]
+
+    def _contact(self, spec, context, user_info):
+        parts = [fmt.format_map(context) for field, fmt in spec['fields'] if user_info.get(field)]
+        return [Paragraph(spec['separator'].join(parts), self.styles[spec['style']])]
+
+    def _join(self, spec, context, user_info):
+        text = spec['separator'].join(spec['format'].format_map(_Context(context, item=item))
+                                      for item in context[spec['items']])
+        return [Paragraph(text, self.styles[spec['style']])]
+
+    def _each(self, spec, context, user_info):
+        flowables = []
+        for item in context[spec['items']]:
+            flowables.extend(self._build(spec['flowables'], _Context(context, item=item), user_info))
+        return flowables
+
+    def _cell(self, cell, context, user_info):
+        if isinstance(cell, str):
+            return cell.format_map(context)
+        if isinstance(cell, list):
+            return self._build(cell, context, user_info)
+        return self._build([cell], context, user_info)[0]
+
+    def _table(self, spec, context, user_info):
+        rows = [[self._cell(cell, context, user_info) for cell in row] for row in spec['rows']]
+        table = Table(rows, colWidths=[w*inch for w in spec['col_widths']])
+        table.setStyle(self.table_styles[spec['style']])
+        return [table]
+
+    def _grid(self, spec, context, user_info):
+        """Lay items out in a fixed number of columns, row by row or column by column."""
+        items = list(context[spec['items']])
+        columns = spec['columns']
+        style = self.styles[spec['style']]
+
+        if spec.get('fill', 'rows') == 'columns':
+            per_column = (len(items) + columns - 1) // columns
+            cols = [items[i*per_column:(i + 1)*per_column] for i in range(columns)]
+            cols = [col + [''] * (per_column - len(col)) for col in cols]
+            item_rows = [list(row) for row in zip(*cols)]
+        else:
+            item_rows = [items[i:i + columns] for i in range(0, len(items), columns)]
+            item_rows = [row + [''] * (columns - len(row)) for row in item_rows]
+
+        text = spec.get('text', '{item}')
+        blank_paragraph = spec.get('empty') == 'paragraph'
+        rows = []
+        for row in item_rows:
+            cells = []
+            for item in row:
+                if item:
+                    cells.append(Paragraph(text.format_map(_Context(context, item=item)), style))
+                else:
+                    cells.append(Paragraph('', style) if blank_paragraph else '')
+            rows.append(cells)
+
+        table = Table(rows, colWidths=[w*inch for w in spec['col_widths']])
+        table.setStyle(self.table_styles[spec['table_style']])
+        return [table]
+
+    # -- rendering ----------------------------------------------------------
+
+    def frame_size(self):
+        """Width and height available to flowables on each page."""
+        width, height = letter
+        return (width - self.margins['left'] - self.margins['right'] - 2*FRAME_PADDING,
+                height - self.margins['top'] - self.margins['bottom'] - 2*FRAME_PADDING)
+
+    def count_pages(self, elements, limit=None):
+        """
+        Count the pages `elements` need using wrap/split measurements only.
+
+        Follows platypus' Frame.add/split rules without drawing anything: space
+        before is dropped at the top of a page and overlaps the previous
+        flowable's space after (rl_config.overlapAttachedSpace), oversized
+        flowables are split. Stops as soon as `limit` pages are exceeded.
+        """
+        width, frame_height = self.frame_size()
+        overlap = rl_config.overlapAttachedSpace
+        pages, y, at_top, space_after = 1, frame_height, True, 0
+        queue = list(reversed(elements))
+        while queue:
+            flowable = queue.pop()
+            transfer = getattr(flowable, '_SPACETRANSFER', False)
+            space = 0
+            if not at_top:
+                space = flowable.getSpaceBefore()
+                if overlap:
+                    if transfer or getattr(flowable, '_ZEROSIZE', False):
+                        space = space_after
+                    space = max(space - space_after, 0)
+            avail = y - space
+            if avail > 0:
+                _, height = flowable.wrap(width, avail)
+                if height <= avail + _FUZZ:
+                    after = flowable.getSpaceAfter()
+                    if overlap and not transfer:
+                        space_after = after
+                    below = avail - height - after
+                    # Like the frame, a flowable that takes no room leaves it at the top
+                    y, at_top = below, at_top and below == y
+                    continue
+                parts = flowable.split(width, avail)
+                if len(parts) > 1:
+                    queue.extend(reversed(parts))
+                    continue
+            if at_top:
+                # Taller than an empty page and unsplittable - platypus clips it the same way
+                y, at_top = 0, False
+                continue
+            pages += 1
+            if limit and pages > limit:
+                break
+            y, at_top, space_after = frame_height, True, 0
+            queue.append(flowable)
+        return pages
+
+    def render(self, resume_data, user_info, output_filename, optimize=False, deterministic=False):
+        """
+        Build the PDF and return its page count (optimize: binary streams, no metadata;
+        deterministic: fixed dates and document ID, so equal inputs give equal bytes).
+        """
+        doc = SimpleDocTemplate(
+            output_filename,
+            pagesize=letter,
+            rightMargin=self.margins['right'],
+            leftMargin=self.margins['left'],
+            topMargin=self.margins['top'],
+            bottomMargin=self.margins['bottom'],
+            pageCompression=1 if optimize else None,
+            # ReportLab's invariant mode: a fixed timestamp, and an /ID derived from it
+            invariant=1 if deterministic else None,
+        )
+        canvasmaker = self.optimized_canvasmaker if optimize else self.canvasmaker
+        with phase('flowables'):
+            elements = self.build_elements(resume_data, user_info)
+        with phase('doc_build'):
+            doc.build(elements, canvasmaker=canvasmaker)
+        return doc.page
+
+
+FLOWABLE_TYPES = {
+    'paragraph': CompiledTemplate._paragraph,
+    'spacer': CompiledTemplate._spacer,
+    'contact': CompiledTemplate._contact,
+    'join': CompiledTemplate._join,
+    'each': CompiledTemplate._each,
+    'table': CompiledTemplate._table,
+    'grid': CompiledTemplate._grid,
+}
+
+
+@lru_cache(maxsize=256)
+def _compile(name, mtime, accent_color, font_family, scale):
+    return CompiledTemplate(load_spec(name), accent_color, font_family, scale)
+
+
+def compile_template(name, accent_color=None, font_family='helvetica', scale=None):
+    """Compiled template for a spec, accent color, font and fit scale (cached)."""
+    spec = load_spec(name)
+    accent_color = accent_color or spec.get('default_accent', '#4A90E2')
+    return _compile(name, os.path.getmtime(spec_path(name)), accent_color, font_family, scale)
+
+
+def render(name, resume_data, user_info, output_filename, accent_color=None, font_family='helvetica', optimize=False,
+           deterministic=False):
+    """
+    Render a resume PDF with a template spec.
+
+    Args:
+        name (str): Template spec name (file name in template_specs without .json)
+        resume_data (dict): Structured resume content
+        user_info (dict): User's contact information
+        output_filename (str|file): Output path or file-like object
+        accent_color (str): Hex accent color, defaults to the spec's default_accent
+        font_family (str): Font selector value (see fonts.resolve_font)
+        optimize (bool): Smaller output - binary compressed streams and no document
+            info metadata
+        deterministic (bool): Byte-identical output for identical inputs (fixed
+            creation/modification dates and document ID)
+
+    Returns:
+        int: Number of pages
+    """
+    return compile_template(name, accent_color, font_family).render(resume_data, user_info, output_filename, optimize,
+                                                                    deterministic)
+
+
+def _fit_scale(spec, step):
+    """(font, leading, spacing) scale `step` FIT_STEPS of the way from natural to tightest."""
+    bounds = dict(DEFAULT_FIT_BOUNDS, **spec.get('fit', {}))
+    return tuple(
+        round(bounds[key][1] - (bounds[key][1] - bounds[key][0]) * step / FIT_STEPS, 4)
+        for key in ('font_scale', 'leading_scale', 'spacing_scale')
+    )
+
+
+def fit_to_pages(name, resume_data, user_info, output_filename, pages=1, accent_color=None, font_family='helvetica',
+                 optimize=False, deterministic=False):
+    """
+    Render with the largest font size, leading and spacing that fit in `pages` pages.
+
+    Binary-searches a single tightness step between the spec as written and the
+    lower bounds in its "fit" block, measuring each candidate with cached
+    wrap/split measurements instead of building the document. Only the chosen
+    layout is actually rendered.
+
+    Args:
+        name (str): Template spec name
+        resume_data (dict): Structured resume content
+        user_info (dict): User's contact information
+        output_filename (str|file): Output path or file-like object
+        pages (int): Target page count
+        accent_color (str): Hex accent color
+        font_family (str): Font selector value
+        optimize (bool): See render()
+        deterministic (bool): See render()
+
+    Returns:
+        dict: Report with target_pages, natural_pages, pages, fits, the applied
+            font/leading/spacing scales (1.0 = unchanged), measure_passes and layout_ms
+    """
+    spec = load_spec(name)
+    start = time.perf_counter()
+    measured = {}
+
+    def measure(step):
+        if step not in measured:
+            scale = _fit_scale(spec, step) if step else None
+            template = compile_template(name, accent_color, font_family, scale)
+            # The natural layout is counted in full for the report; candidates stop at pages + 1
+            with phase('fit_measure'):
+                measured[step] = template.count_pages(template.build_elements(resume_data, user_info),
+                                                      limit=pages if step else None)
+        return measured[step]
+
+    natural_pages = measure(0)
+    if natural_pages <= pages:
+        step = 0
+    elif measure(FIT_STEPS) > pages:
+        step = FIT_STEPS
+    else:
+        # Smallest step that fits: fits(step) is monotonic in step
+        lo, hi = 0, FIT_STEPS
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if measure(mid) <= pages:
+                hi = mid
+            else:
+                lo = mid
+        step = hi
+    layout_ms = (time.perf_counter() - start) * 1000
+
+    scale = _fit_scale(spec, step) if step else None
+    actual = compile_template(name, accent_color, font_family, scale).render(
+        resume_data, user_info, output_filename, optimize, deterministic)
+    # count_pages follows the frame rules but not e.g. keepWithNext grouping; tighten further if it was off
+    while actual > pages and step < FIT_STEPS:
+        step += 1
+        scale = _fit_scale(spec, step)
+        if hasattr(output_filename, 'seek'):
+            output_filename.seek(0)
+            output_filename.truncate()
+        actual = compile_template(name, accent_color, font_family, scale).render(
+            resume_data, user_info, output_filename, optimize, deterministic)
+
+    font, leading, spacing = scale or (1.0, 1.0, 1.0)
+    return {
+        'target_pages': pages,
+        'natural_pages': natural_pages,
+        'pages': actual,
+        'fits': actual <= pages,
+        'font_scale': font,
+        'leading_scale': leading,
+        'spacing_scale': spacing,
+        'measure_passes': len(measured),
+        'layout_ms': round(layout_ms, 1),
+    }
+
+
+class SpecTemplate:
+    """Template-class interface (create_pdf) for a spec, used by the TEMPLATES registries"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def create_pdf(self, resume_data, user_info, output_filename, accent_color=None, font_family='helvetica',
+                   fit_pages=None, optimize=False, deterministic=False):
+        """Render this spec (accent_color defaults to the spec's default_accent)"""
+        if fit_pages:
+            return fit_to_pages(self.name, resume_data, user_info, output_filename, pages=fit_pages,
+                                accent_color=accent_color, font_family=font_family, optimize=optimize,
+                                deterministic=deterministic)
+        render(self.name, resume_data, user_info, output_filename, accent_color=accent_color, font_family=font_family,
+               optimize=optimize, deterministic=deterministic)
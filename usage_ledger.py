@@ -0,0 +1,245 @@
+"""
+Usage Ledger
+Append-only record of every LLM call's token usage, latency and cost, with
+reports by day, user, endpoint, template or prompt prefix and a view of the
+most expensive prompt templates.
+
+Cached tokens are the prompt-prefix tokens OpenAI served from its prompt
+cache; reports split latency between calls that hit the cache and calls that
+didn't, so the effect of a stable prefix can be checked on repeated calls.
+
+Each call is one JSON line in RESUME_USAGE_LEDGER (default usage_ledger.jsonl),
+written with a single append so concurrent web workers don't interleave.
+
+Usage:
+    python usage_ledger.py report [--by day|user|endpoint|template|model|prefix_hash]
+    python usage_ledger.py top [-n 10]     # cost per endpoint and prompt prefix version
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from threading import Lock
+
+
+LEDGER_PATH = os.getenv('RESUME_USAGE_LEDGER', 'usage_ledger.jsonl')
+
+# USD per million tokens: (input, cached input, output)
+PRICES = {
+    'gpt-4o-mini': (0.15, 0.075, 0.60),
+    'gpt-4o': (2.50, 1.25, 10.00),
+}
+
+REPORT_KEYS = ('day', 'user', 'endpoint', 'template', 'model', 'prefix_hash')
+
+EXCERPT_CHARS = 80
+
+_lock = Lock()
+
+
+def prompt_hash(messages):
+    """Stable hash of the exact messages sent, so repeated prompts group together."""
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def prompt_excerpt(messages, length=EXCERPT_CHARS):
+    """
+    Start of the first message, whitespace collapsed.
+
+    Callers put the static instructions first (see resume_generator.PROMPT_PREFIX),
+    so this names the prompt template without storing the request's details.
+    """
+    content = messages[0].get('content') if messages else None
+    text = ' '.join(content.split()) if isinstance(content, str) else ''
+    return text if len(text) <= length else text[:length - 3] + '...'
+
+
+def cost_usd(model, prompt_tokens, completion_tokens, cached_tokens=0):
+    """Estimated cost of one call (0 for models missing from PRICES)."""
+    input_price, cached_price, output_price = PRICES.get(model, (0, 0, 0))
+    uncached = prompt_tokens - cached_tokens
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1e6
+
+
+def record_usage(model, messages, usage, latency_ms, path=None, **tags):
+    """
+    Append one LLM call to the ledger.
+
+    Args:
+        model (str): Model the call used
+        messages (list): Chat messages sent (only their hash and a short excerpt
+            of the first one are stored)
+        usage: The response's `usage` object (None if the API didn't return one)
+        latency_ms (float): Wall time of the API call
+        path (str): Ledger file (default LEDGER_PATH)
+        **tags: Reporting dimensions, e.g. endpoint, user, template, and
+            prefix_hash (the prompt template's version, used by top_prompts)
+
+    Returns:
+        dict: The ledger entry
+    """
+    prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+    completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+
+    now = datetime.now(timezone.utc)
+    entry = {
+        'ts': now.isoformat(timespec='seconds'),
+        'day': now.date().isoformat(),
+        'model': model,
+        'prompt_hash': prompt_hash(messages),
+        'prompt_excerpt': prompt_excerpt(messages),
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'cached_tokens': cached_tokens,
+        'total_tokens': prompt_tokens + completion_tokens,
+        'latency_ms': round(latency_ms, 1),
+        'cost_usd': round(cost_usd(model, prompt_tokens, completion_tokens, cached_tokens), 6),
+    }
+    entry.update({key: value for key, value in tags.items() if value is not None})
+
+    line = json.dumps(entry, ensure_ascii=False) + '\n'
+    with _lock, open(path or LEDGER_PATH, 'a', encoding='utf-8') as f:
+        f.write(line)
+    return entry
+
+
+def read_ledger(path=None):
+    """Yield ledger entries, skipping lines that aren't valid JSON (e.g. a torn last write)."""
+    try:
+        f = open(path or LEDGER_PATH, encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _new_totals():
+    return {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0,
+            'cost_usd': 0.0, 'latency_ms': 0.0, 'cache_hits': 0, 'hit_latency_ms': 0.0}
+
+
+def _add(totals, entry):
+    totals['calls'] += 1
+    for key in ('prompt_tokens', 'completion_tokens', 'cached_tokens', 'cost_usd', 'latency_ms'):
+        totals[key] += entry.get(key, 0)
+    if entry.get('cached_tokens'):
+        totals['cache_hits'] += 1
+        totals['hit_latency_ms'] += entry.get('latency_ms', 0)
+
+
+def _averages(totals):
+    """Replace latency sums with averages over all calls, cache hits and misses."""
+    latency, hit_latency = totals.pop('latency_ms'), totals.pop('hit_latency_ms')
+    hits, misses = totals['cache_hits'], totals['calls'] - totals['cache_hits']
+    totals['avg_latency_ms'] = round(latency / totals['calls'], 1)
+    totals['hit_latency_ms'] = round(hit_latency / hits, 1) if hits else None
+    totals['miss_latency_ms'] = round((latency - hit_latency) / misses, 1) if misses else None
+    return totals
+
+
+def report(by='day', path=None):
+    """
+    Aggregate the ledger by one dimension.
+
+    Returns:
+        list: One dict per group ({by, calls, tokens, cache_hits, cost_usd,
+            avg/hit/miss_latency_ms, ...}), sorted by group value
+    """
+    groups = defaultdict(_new_totals)
+    for entry in read_ledger(path):
+        _add(groups[entry.get(by) or '-'], entry)
+
+    rows = []
+    for value, totals in sorted(groups.items()):
+        rows.append(dict({by: value}, **_averages(totals)))
+    return rows
+
+
+def top_prompts(n=10, path=None):
+    """
+    The `n` prompt templates that cost the most in total.
+
+    Calls are grouped by endpoint and prefix_hash (the version of the static
+    prompt prefix), since every request's full prompt is different; entries
+    written without a prefix_hash fall back to their own prompt_hash.
+
+    Returns:
+        list: One dict per template (endpoint, prefix_hash, excerpt, calls,
+            distinct prompts, cost and token averages), most expensive first
+    """
+    groups = defaultdict(_new_totals)
+    examples, prompts = {}, defaultdict(set)
+    for entry in read_ledger(path):
+        key = (entry.get('endpoint', '-'), entry.get('prefix_hash') or entry.get('prompt_hash', '-'))
+        _add(groups[key], entry)
+        prompts[key].add(entry.get('prompt_hash'))
+        examples[key] = entry
+
+    rows = []
+    for (endpoint, prefix), totals in groups.items():
+        last = examples[endpoint, prefix]
+        rows.append({
+            'endpoint': endpoint,
+            'prefix_hash': prefix,
+            'excerpt': last.get('prompt_excerpt', ''),
+            'calls': totals['calls'],
+            'distinct_prompts': len(prompts[endpoint, prefix]),
+            'cost_usd': totals['cost_usd'],
+            'avg_prompt_tokens': round(totals['prompt_tokens'] / totals['calls']),
+            'avg_completion_tokens': round(totals['completion_tokens'] / totals['calls']),
+            'cached_share': totals['cached_tokens'] / totals['prompt_tokens'] if totals['prompt_tokens'] else 0.0,
+            'last_seen': last.get('ts'),
+        })
+    rows.sort(key=lambda row: row['cost_usd'], reverse=True)
+    return rows[:n]
+
+
+def _ms(value):
+    return '-' if value is None else f"{value:.0f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='LLM usage and cost reports')
+    parser.add_argument('--ledger', default=LEDGER_PATH, help='Ledger file (default: %(default)s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    report_cmd = commands.add_parser('report', help='Totals grouped by one dimension')
+    report_cmd.add_argument('--by', choices=REPORT_KEYS, default='day')
+    top_cmd = commands.add_parser('top', help='Most expensive prompt templates')
+    top_cmd.add_argument('-n', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == 'report':
+        rows = report(args.by, args.ledger)
+        print(f"{args.by:<28}{'calls':>7}{'prompt':>11}{'cached':>10}{'completion':>12}{'cost $':>11}"
+              f"{'avg ms':>9}{'hits':>7}{'hit ms':>9}{'miss ms':>9}")
+        for row in rows:
+            print(f"{str(row[args.by])[:27]:<28}{row['calls']:>7}{row['prompt_tokens']:>11,}"
+                  f"{row['cached_tokens']:>10,}{row['completion_tokens']:>12,}{row['cost_usd']:>11.4f}"
+                  f"{row['avg_latency_ms']:>9.0f}{row['cache_hits']:>7}{_ms(row['hit_latency_ms']):>9}"
+                  f"{_ms(row['miss_latency_ms']):>9}")
+    else:
+        rows = top_prompts(args.n, args.ledger)
+        print(f"{'endpoint':<12}{'prefix':<18}{'calls':>7}{'distinct':>9}{'cost $':>11}{'avg in':>9}{'avg out':>9}"
+              f"{'cached':>8}  last seen / prompt")
+        for row in rows:
+            print(f"{str(row['endpoint'])[:11]:<12}{row['prefix_hash']:<18}{row['calls']:>7}{row['distinct_prompts']:>9}"
+                  f"{row['cost_usd']:>11.4f}{row['avg_prompt_tokens']:>9,}{row['avg_completion_tokens']:>9,}"
+                  f"{row['cached_share']:>8.0%}  {row['last_seen']} / {row['excerpt'] or '-'}")
+    if not rows:
+        print('(ledger is empty)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
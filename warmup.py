@@ -0,0 +1,134 @@
+"""
+Warm-up
+Pays the first-request costs at boot instead: every template is rendered
+once with a synthetic resume (ReportLab imports, font metrics, color
+parsing, compiled template specs and page art, and the render pool's
+workers), the LLM client and tokenizer are initialized, and the local job
+matcher runs once.
+
+The app runs this in a background thread, started by the first request
+each web process serves (threads started at import wouldn't survive a
+gunicorn --preload fork); /readyz reports ready only once it has finished,
+along with how long each step took.
+"""
+
+import os
+import time
+from threading import Event, Lock, Thread
+
+
+WARMUP_RESUME = {
+    'summary': 'Engineer warming up the renderer with a representative resume.',
+    'skills': ['Python', 'SQL', 'Docker', 'AWS', 'React', 'Kubernetes'],
+    'experience': [
+        {'title': 'Senior Engineer', 'company': 'Example Co', 'period': '2021 - Present',
+         'achievements': ['Led a platform migration.', 'Cut deploy time by 60%.', 'Mentored four engineers.']},
+        {'title': 'Engineer', 'company': 'Startup', 'period': '2018 - 2021',
+         'achievements': ['Built the billing service.', 'Added end-to-end tests.']},
+    ],
+    'education': [{'degree': 'BS Computer Science', 'institution': 'State University', 'year': '2018'}],
+}
+WARMUP_USER = {'name': 'Warm Up', 'email': 'warm@example.com', 'phone': '(555) 123-4567', 'location': 'Remote'}
+WARMUP_JOB = 'Senior Python engineer with AWS, Docker and SQL experience to build data services.'
+
+
+class Warmup:
+    """Runs the warm-up steps once and reports readiness"""
+
+    def __init__(self):
+        self.state = 'pending'      # pending -> running -> ready | failed
+        self.steps = {}             # step name -> milliseconds
+        self.seconds = None
+        self.error = None
+        self._done = Event()
+        self._lock = Lock()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    def start(self, render_service=None, optimize=False):
+        """Run the warm-up in a background thread, once (the app keeps serving; /readyz says when it's done)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = Thread(target=self.run, args=(render_service, optimize), name='warmup', daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        """Block until the warm-up has finished; True if it succeeded."""
+        self._done.wait(timeout)
+        return self.ready
+
+    def run(self, render_service=None, optimize=False):
+        """
+        Run every warm-up step in this thread.
+
+        Args:
+            render_service (RenderService): Render through the pool (warming its
+                workers), or None to render in this process
+            optimize (bool): Render as the app does (PDF_OPTIMIZE)
+        """
+        with self._lock:
+            if self.state != 'pending':
+                return
+            self.state = 'running'
+
+        start = time.perf_counter()
+        try:
+            self._step('templates', _warm_templates, render_service, optimize)
+            self._step('llm_client', _warm_llm_client)
+            self._step('matcher', _warm_matcher)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.state = 'failed'
+            print(f"Warm-up failed: {self.error}")
+        else:
+            self.state = 'ready'
+        self.seconds = time.perf_counter() - start
+        if self.ready:
+            print(f"Warm-up finished in {self.seconds * 1000:.0f} ms "
+                  f"({', '.join(f'{name} {ms:.0f} ms' for name, ms in self.steps.items())})")
+        self._done.set()
+
+    def _step(self, name, func, *args):
+        start = time.perf_counter()
+        func(*args)
+        self.steps[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def status(self):
+        """JSON-friendly readiness report."""
+        return {
+            'status': self.state,
+            'warmup_ms': round(self.seconds * 1000, 1) if self.seconds is not None else None,
+            'steps': dict(self.steps),
+            'error': self.error,
+        }
+
+
+def _warm_templates(render_service, optimize):
+    from resume_templates_unique import TEMPLATES
+    from render_service import render_job
+
+    render = render_service.render if render_service else render_job
+    for template in TEMPLATES:
+        render({'resume_data': WARMUP_RESUME, 'user_info': WARMUP_USER, 'template': template,
+                'optimize': optimize})
+
+
+def _warm_llm_client():
+    from rate_limiter import estimate_tokens
+    from resume_generator import ResumeGenerator, get_client
+
+    # The server key's client (and its connection pool) is shared by every request that uses it
+    if os.getenv('OPENAI_API_KEY'):
+        get_client(os.getenv('OPENAI_API_KEY'))
+    # Loads the tokenizer the rate limiter estimates with
+    estimate_tokens(ResumeGenerator.build_messages(WARMUP_JOB, WARMUP_USER))
+
+
+def _warm_matcher():
+    from job_matcher import analyze_user_info
+
+    analyze_user_info(WARMUP_JOB, {'skills': 'Python, SQL', 'experience': 'Built data services on AWS.'})